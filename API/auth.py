@@ -1,25 +1,143 @@
-from fastapi import HTTPException, Query
+from fastapi import Depends, HTTPException, Query, Request
+from limits import parse_many
+from typing import NamedTuple, Optional
+import hashlib
+import hmac
 import json
 import os
+import secrets
+import time
 
-def load_api_keys():
-    """Load API keys from file"""
-    if os.path.exists('api_keys.json'):
-        with open('api_keys.json', 'r') as f:
-            data = json.load(f)
-            if isinstance(data, dict):
-                return set(data.values())
-            return set(data)
-    
-    print("WARNING: api_keys.json not found!")
-    print("Run: python generate_keys.py")
-    return set()
-
-VALID_API_KEYS = load_api_keys()
-
-def verify_api_key(key: str = Query(..., description="API key for authentication")):
-    """Verify the API key is valid"""
-    if not VALID_API_KEYS:
+# api_keys.json maps a key name to the SHA-256 of the key and its
+# metadata, so raw keys are never stored or held in memory:
+#
+#   {"demo_key": {"hash": "9f86d0...", "tier": "demo"},
+#    "admin_key": {"hash": "...", "tier": "admin", "rate_limit": "1000/minute"}}
+#
+# Files from before hashing ({"demo_key": "raw key"} or a list of raw
+# keys) still load; their keys are hashed on load with the default tier.
+# python auth.py add/revoke edits the file; running workers pick the
+# change up within RELOAD_INTERVAL seconds.
+
+API_KEYS_PATH = os.getenv("API_KEYS_PATH", "api_keys.json")
+RELOAD_INTERVAL = 5.0
+DEFAULT_TIER = "standard"
+ADMIN_TIER = "admin"
+
+
+class KeyInfo(NamedTuple):
+    name: str
+    key_hash: str
+    tier: str
+    rate_limit: Optional[str]  # overrides the tier's limit when set
+
+
+def hash_key(key: str) -> str:
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+class KeyStore:
+    """
+    Hashed API keys from a JSON file, reloaded when the file changes.
+
+    verify() hashes the presented key and looks it up in one dict, then
+    compares digests in constant time. The file is read on the first
+    verify() (or refresh(), as the API's startup does), then stat'ed at
+    most once per reload_interval, never read per request.
+    """
+
+    def __init__(self, path: str = API_KEYS_PATH, reload_interval: float = RELOAD_INTERVAL):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.keys = {}
+        self._mtime = None
+        self._next_check = 0.0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def refresh(self, now: float = None):
+        """Reload the file if its modification time changed"""
+        self._next_check = (time.monotonic() if now is None else now) + self.reload_interval
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            if self._mtime != 0:
+                print(f"WARNING: {self.path} not found!")
+                print("Run: python auth.py add <name>")
+            self.keys = {}
+            self._mtime = 0
+            return
+        if mtime == self._mtime:
+            return
+
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except ValueError:
+            # Caught mid-write; keep the current keys and retry next interval
+            return
+        try:
+            keys = parse_keys(data)
+        except ValueError as error:
+            # Keep serving the current keys; warn once per version of the file
+            print(f"WARNING: {self.path} not loaded, keeping the {len(self.keys)} keys loaded before: {error}")
+            self._mtime = mtime
+            return
+        self.keys = keys
+        self._mtime = mtime
+
+    def verify(self, key: str) -> Optional[KeyInfo]:
+        """KeyInfo for a valid key, or None"""
+        now = time.monotonic()
+        if now >= self._next_check:
+            self.refresh(now)
+
+        key_hash = hash_key(key)
+        info = self.keys.get(key_hash)
+        if info is None or not hmac.compare_digest(info.key_hash, key_hash):
+            return None
+        return info
+
+
+def parse_keys(data) -> dict:
+    """
+    {key hash: KeyInfo} from the contents of api_keys.json; ValueError
+    naming the first malformed entry, so a bad edit is never half loaded
+    """
+    if isinstance(data, list):
+        data = {f"key_{i}": key for i, key in enumerate(data)}
+    if not isinstance(data, dict):
+        raise ValueError("expected an object of keys by name")
+
+    keys = {}
+    for name, entry in data.items():
+        if isinstance(entry, str):
+            entry = {"hash": hash_key(entry)}
+        if not isinstance(entry, dict) or not isinstance(entry.get("hash"), str):
+            raise ValueError(f"{name}: expected a raw key or an object with a \"hash\"")
+        tier = entry.get("tier", DEFAULT_TIER)
+        rate_limit = entry.get("rate_limit")
+        if not isinstance(tier, str) or not (rate_limit is None or isinstance(rate_limit, str)):
+            raise ValueError(f"{name}: tier and rate_limit must be strings")
+        if rate_limit is not None:
+            # The limiter skips a limit it cannot parse, leaving the key unlimited
+            try:
+                parse_many(rate_limit)
+            except ValueError:
+                raise ValueError(f"{name}: rate_limit {rate_limit!r} is not a limit like \"100/minute\"") from None
+        info = KeyInfo(name, entry["hash"], tier, rate_limit)
+        keys[info.key_hash] = info
+    return keys
+
+
+KEY_STORE = KeyStore()
+
+def verify_api_key(request: Request, key: str = Query(..., description="API key for authentication")):
+    """Verify the API key is valid; its KeyInfo is left on request.state.api_key"""
+    info = KEY_STORE.verify(key)
+
+    if info is None and not KEY_STORE.keys:
         raise HTTPException(
             status_code=503,
             detail={
@@ -28,8 +146,8 @@ def verify_api_key(key: str = Query(..., description="API key for authentication
                 "responseType": "error"
             }
         )
-    
-    if key not in VALID_API_KEYS:
+
+    if info is None:
         raise HTTPException(
             status_code=403,
             detail={
@@ -38,5 +156,68 @@ def verify_api_key(key: str = Query(..., description="API key for authentication
                 "responseType": "error"
             }
         )
-    
-    return key
\ No newline at end of file
+
+    request.state.api_key = info
+    return key
+
+
+def require_admin(request: Request, key: str = Depends(verify_api_key)):
+    """verify_api_key, for keys of the admin tier only"""
+    if request.state.api_key.tier != ADMIN_TIER:
+        raise HTTPException(
+            status_code=403,
+            detail={
+                "success": False,
+                "message": "Admin API key required",
+                "responseType": "error"
+            }
+        )
+    return key
+
+
+def _write_keys(data: dict, path: str = API_KEYS_PATH):
+    # Replace the file in one step so workers never read half of it
+    tmp = path + '.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, path)
+
+
+if __name__ == '__main__':
+    # python auth.py add <name> [tier] [rate_limit]   prints the new key once
+    # python auth.py revoke <name>
+    # python auth.py hash                             hashes raw keys in place
+    import sys
+    command, *args = sys.argv[1:] or ['']
+
+    data = {}
+    if os.path.exists(API_KEYS_PATH):
+        with open(API_KEYS_PATH, 'r') as f:
+            for info in parse_keys(json.load(f)).values():
+                data[info.name] = {"hash": info.key_hash, "tier": info.tier}
+                if info.rate_limit:
+                    data[info.name]["rate_limit"] = info.rate_limit
+
+    if command == 'add':
+        name = args[0]
+        tier = args[1] if len(args) > 1 else DEFAULT_TIER
+        rate_limit = args[2] if len(args) > 2 else None
+        key = secrets.token_urlsafe(32)
+        data[name] = {"hash": hash_key(key), "tier": tier}
+        if rate_limit:
+            data[name]["rate_limit"] = rate_limit
+        try:
+            parse_keys({name: data[name]})
+        except ValueError as error:
+            raise SystemExit(str(error))
+        _write_keys(data)
+        print(f"{name}: {key}")
+    elif command == 'revoke':
+        data.pop(args[0], None)
+        _write_keys(data)
+        print(f"Revoked {args[0]}")
+    elif command == 'hash':
+        _write_keys(data)
+        print(f"Hashed {len(data)} keys in {API_KEYS_PATH}")
+    else:
+        print("Usage: python auth.py add <name> [tier] [rate_limit] | revoke <name> | hash")
@@ -0,0 +1,121 @@
+"""
+Fill the columns derived from the transcript text (text_start/text_end,
+the bill context and any missing sentiment label) on existing
+transcript_segments rows, the bill number of their activity rows, each
+date's table of contents and its debate threads, by re-segmenting each
+transcript. Run migrate.py first to add the columns and tables.
+
+Usage: python backfill_segments.py [--drop-text]
+
+--drop-text sets transcript_segments.text to NULL once a segment has
+offsets, so the speech is kept only once, in transcripts.text. The API
+rebuilds it with clean_speech_text on read. A segment whose stored text
+differs from what its offsets rebuild (an edited transcript, or speeches
+that no longer line up by sequence number) keeps its text, and is
+counted and reported instead.
+"""
+import os
+import sys
+
+# Run as a script from API/, like main.py under uvicorn; the chunking
+# code lives at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import SessionLocal, mark_written
+from model import Activity, DebateThread, Transcript, TranscriptSegment, TranscriptToc
+from roster import Roster
+from transcript_store import get_store
+
+from analytics import analyze_sentiments
+from chunk_scripts import (
+    build_member_index, build_threads, extract_interactions, segment_transcript, table_of_contents, toc_bytes,
+)
+
+
+def backfill(db, drop_text: bool = False) -> tuple[int, int]:
+    """(segments updated, segments whose text was kept because it did not match its offsets)"""
+    updated = 0
+    mismatched = 0
+    store = get_store()
+    roster = Roster.from_db(db)
+    for (date,) in db.query(Transcript.date).all():
+        transcript_text = db.query(Transcript.text).filter(Transcript.date == date).scalar()
+        if transcript_text is None and store is not None:
+            transcript_text = store.text(date)
+        if transcript_text is None:
+            continue
+        
+        # Sequence numbers were assigned in speaker order, same as here
+        parsed_segments = segment_transcript(transcript_text, date, roster)
+        parsed = {seg.sequence: seg for seg in parsed_segments}
+        segments = db.query(TranscriptSegment).filter(TranscriptSegment.date == date)
+        bills = {}
+        segment_ids = {}
+        unlabelled = []
+        date_mismatched = 0
+        for segment in segments:
+            segment_ids[segment.sequence_number] = segment.segment_id
+            seg = parsed.get(segment.sequence_number)
+            if seg is None:
+                continue
+            segment.text_start, segment.text_end = seg.start, seg.end
+            segment.bill_number = seg.bill_number
+            segment.calendar_number = seg.calendar_number
+            segment.rules_report_number = seg.rules_report_number
+            bills[segment.segment_id] = seg.bill_number
+            if segment.sentiment is None:
+                unlabelled.append((segment, seg.text))
+            if drop_text and segment.text is not None:
+                # seg.text is clean_speech_text(transcript_text[seg.start:seg.end]),
+                # what the API would serve once the text is gone
+                if segment.text == seg.text:
+                    segment.text = None
+                else:
+                    date_mismatched += 1
+            updated += 1
+        
+        # Labelled here once, so /stats/sentiment only counts stored labels
+        labels = analyze_sentiments([text for _, text in unlabelled])
+        for (segment, _), label in zip(unlabelled, labels):
+            segment.sentiment = str(label)
+        
+        for activity in db.query(Activity).filter(Activity.date == date):
+            activity.bill_number = bills.get(activity.segment_id)
+        db.merge(TranscriptToc(date=date, toc=toc_bytes(table_of_contents(transcript_text, parsed_segments))))
+        
+        interactions = extract_interactions(parsed_segments, build_member_index(roster.speakers(date)))
+        db.query(DebateThread).filter(DebateThread.date == date).delete()
+        for thread in build_threads(parsed_segments, interactions):
+            if thread.first_sequence not in segment_ids or thread.last_sequence not in segment_ids:
+                continue
+            db.add(DebateThread(
+                date=date,
+                bill_number=thread.bill_number,
+                sponsor_id=thread.sponsor_id,
+                questioner_id=thread.questioner_id,
+                first_segment_id=segment_ids[thread.first_sequence],
+                last_segment_id=segment_ids[thread.last_sequence],
+                questions=thread.questions,
+                answers=thread.answers
+            ))
+        db.commit()
+        mismatched += date_mismatched
+        print(f"{date}: {len(parsed)} segments"
+              + (f", {date_mismatched} kept their text (does not match the transcript)" if date_mismatched else ""))
+    return updated, mismatched
+
+
+def main(*args):
+    db = SessionLocal()
+    try:
+        updated, mismatched = backfill(db, drop_text='--drop-text' in args)
+    finally:
+        db.close()
+    mark_written()
+    print(f"Backfilled {updated} segments")
+    if mismatched:
+        print(f"Kept the text of {mismatched} segments that does not match their transcript offsets")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
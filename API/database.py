@@ -1,23 +1,149 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from typing import NamedTuple
+import itertools
 import os
+import tempfile
+import threading
+import time
 from dotenv import load_dotenv
 load_dotenv()
 
 # Use environment variable
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
+# Read-only replicas for the API endpoints, comma separated. Unset, reads
+# go to DATABASE_URL like everything else. Ingest, migrations and any
+# endpoint that writes use the primary.
+DATABASE_READ_URLS = [url.strip() for url in os.getenv("DATABASE_READ_URLS", "").split(",") if url.strip()]
+# round_robin, or least_connections (fewest connections checked out of each pool)
+DATABASE_READ_ROUTING = os.getenv("DATABASE_READ_ROUTING", "round_robin")
+
+# Ingest touches this file after committing (mark_written); for
+# DATABASE_REPLICA_LAG seconds after that, reads go to the primary, and
+# the roster (roster.get_roster) reloads from the primary so it sees
+# the ingested rows.
+DATABASE_WRITE_MARKER = os.getenv("DATABASE_WRITE_MARKER", os.path.join(tempfile.gettempdir(), "ny-assembly-db-write"))
+DATABASE_REPLICA_LAG = float(os.getenv("DATABASE_REPLICA_LAG", "30"))
+
+
+def _create_engine(url):
+    return create_engine(
+        url,
+        connect_args={"check_same_thread": False} if "sqlite" in url else {}
+    )
+
+
+PrimarySession = sessionmaker(autocommit=False, autoflush=False)
+ReadSession = sessionmaker(autocommit=False, autoflush=False)
+
+
+class ReadRouter:
+    """Picks the engine for each read session"""
+
+    def __init__(self, primary, replicas, routing: str = DATABASE_READ_ROUTING,
+                 marker: str = DATABASE_WRITE_MARKER, lag: float = DATABASE_REPLICA_LAG):
+        self.primary = primary
+        self.replicas = replicas
+        self.routing = routing
+        self.marker = marker
+        self.lag = lag
+        self._cycle = itertools.cycle(replicas)
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._next_check = 0.0
+
+    def last_write(self, now: float) -> float:
+        """Time of the last mark_written(), from the marker's mtime, stat'ed at most once a second"""
+        if now >= self._next_check:
+            self._next_check = now + 1.0
+            try:
+                self._last_write = max(self._last_write, os.stat(self.marker).st_mtime)
+            except FileNotFoundError:
+                pass
+        return self._last_write
+
+    def mark_written(self, now: float = None):
+        self._last_write = time.time() if now is None else now
+
+    def exclude(self, replica):
+        """Stop routing reads to replica; with none left, reads go to the primary"""
+        with self._lock:
+            self.replicas = [engine for engine in self.replicas if engine is not replica]
+            self._cycle = itertools.cycle(self.replicas)
+
+    def engine(self):
+        if not self.replicas:
+            return self.primary
+        now = time.time()
+        if now - self.last_write(now) < self.lag:
+            return self.primary
+        if self.routing == "least_connections":
+            return min(self.replicas, key=lambda replica: replica.pool.checkedout())
+        with self._lock:
+            return next(self._cycle)
+
+
+class Engines(NamedTuple):
+    primary: object
+    replicas: list
+    router: ReadRouter
+
+
+_engines = None
+_engines_lock = threading.Lock()
+
+
+def get_engines() -> Engines:
+    """
+    The primary and replica engines, created on first use: importing this
+    module creates no engine and loads no database driver. Connections
+    are opened when a session first needs one (or by queries.warm_up).
+    """
+    global _engines
+    if _engines is None:
+        with _engines_lock:
+            if _engines is None:
+                primary = _create_engine(DATABASE_URL)
+                replicas = [_create_engine(url) for url in DATABASE_READ_URLS]
+                _engines = Engines(primary, replicas, ReadRouter(primary, replicas))
+    return _engines
+
+
+def dispose_engines():
+    """Close the pooled connections of every engine created so far"""
+    if _engines is not None:
+        for engine in [_engines.primary, *_engines.replicas]:
+            engine.dispose()
+
+
+def SessionLocal():
+    """Session on the primary, for ingest and migrations"""
+    return PrimarySession(bind=get_engines().primary)
+
+
+def mark_written():
+    """
+    Call after committing ingest writes: sends this process's reads, and
+    those of every API worker on the host, to the primary until the
+    replicas have had DATABASE_REPLICA_LAG seconds to catch up.
+    """
+    get_engines().router.mark_written()
+    with open(DATABASE_WRITE_MARKER, 'a'):
+        pass
+    os.utime(DATABASE_WRITE_MARKER)
+
+
+def last_written() -> float:
+    """Time of the last mark_written() in any process on the host, or 0"""
+    return get_engines().router.last_write(time.time())
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Dependency for FastAPI
 def get_db():
-    db = SessionLocal()
+    """Session on a read replica, or the primary when there are none or ingest just wrote"""
+    db = ReadSession(bind=get_engines().router.engine())
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
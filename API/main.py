@@ -1,21 +1,95 @@
-from fastapi import FastAPI, HTTPException, Query, Depends, Request
+from fastapi import FastAPI, Query, Depends, Request
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from typing import List, Optional
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from typing import Optional
+import json
+import os
+import sys
+import zlib
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from database import * 
-from model import *
-from auth import verify_api_key
+# The API runs from API/ and imports its modules by bare name; the
+# chunking code they share with the ingest notebook (chunk_scripts,
+# analytics) lives at the repo root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Initialize rate limiter 
-limiter = Limiter(key_func=get_remote_address)
-app = FastAPI(title="NY Assembly API")
+from database import ReadSession, SessionLocal, dispose_engines, get_db, get_engines
+from model import Activity, Transcript, TranscriptSegment, TranscriptToc
+from auth import KEY_STORE, require_admin, verify_api_key
+from profiling import ProfilingMiddleware, profiled
+from metrics import MetricsMiddleware, RATE_LIMITED, instrument_engine, record_cache, render, route_of
+from ratelimit import limiter, tier_limit
+from roster import get_roster
+from schemas import (
+    ActivityList, ActivityResponse, BillSegmentList, DebateThreadList, MemberList, MemberResponse, RootResponse,
+    SegmentContextResponse, SegmentList, SegmentResponse, SentimentList, TranscriptList, TranscriptResponse,
+    TranscriptTocResponse,
+)
+from queries import (
+    ACTIVITY_COLUMNS, SEGMENT_COLUMNS, bill_segment_page, interaction_page, segment_context, segment_page,
+    thread_page, thread_segments, warm_up,
+)
+from segment_text import raw_text_column, segment_text
+from transcript_store import get_store, stream_json
+from stats import sentiment_items
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Everything importing this module leaves out, before the first request:
+    create the engines, load the API keys and the member roster, and run
+    each list query once on every engine so the first requests find a
+    pooled connection and a compiled statement.
+
+    A database error here is logged rather than raised, so the API still
+    starts: the roster loads on the first request that needs it, and a
+    replica that fails its warm-up gets no reads.
+    """
+    engines = get_engines()
+    KEY_STORE.refresh()
+    # From the primary, which has the members an ingest just wrote
+    db = SessionLocal()
+    try:
+        get_roster(db)
+    except SQLAlchemyError as error:
+        print(f"WARNING: member roster not loaded at startup: {error}")
+    finally:
+        db.close()
+    for engine in [engines.primary, *engines.replicas]:
+        db = ReadSession(bind=engine)
+        try:
+            warm_up(db)
+        except SQLAlchemyError as error:
+            if engine is engines.primary:
+                print(f"WARNING: warm-up failed on the primary: {error}")
+            else:
+                print(f"WARNING: warm-up failed on replica {engine.url!r}, leaving it out of read routing: {error}")
+                engines.router.exclude(engine)
+        finally:
+            db.close()
+    yield
+    dispose_engines()
+
+
+app = FastAPI(title="NY Assembly API", lifespan=lifespan)
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+def rate_limit_exceeded(request: Request, exc: RateLimitExceeded):
+    RATE_LIMITED.labels(route_of(request.scope)).inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded)
+# Every engine, including those database.get_engines() creates later
+instrument_engine(Engine)
+# Added first so it runs inside MetricsMiddleware
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -25,8 +99,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/")
-@limiter.limit("100/minute")
+@app.get("/", response_model=RootResponse)
+@limiter.limit(tier_limit("100/minute"))
+@profiled
 def root(request: Request):
     return {
         "success": True,
@@ -36,44 +111,44 @@ def root(request: Request):
         "endpoints": {
             "members": "/members?key=YOUR_KEY",
             "transcripts": "/transcripts?key=YOUR_KEY",
+            "toc": "/transcripts/{date}/toc?key=YOUR_KEY",
             "segments": "/segments?key=YOUR_KEY",
-            "interactions": "/interactions?key=YOUR_KEY"
+            "context": "/segments/{id}/context?key=YOUR_KEY",
+            "interactions": "/interactions?key=YOUR_KEY",
+            "bills": "/bills/{number}/segments?key=YOUR_KEY",
+            "threads": "/threads?key=YOUR_KEY",
+            "sentiment": "/stats/sentiment?key=YOUR_KEY"
         }
     }
 
 # MEMBERS
-@app.get("/members")
-@limiter.limit("60/minute")
+@app.get("/members", response_model=MemberList)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_members(
     request: Request,
     key: str = Depends(verify_api_key),  
     session_year: Optional[int] = None,
     district: Optional[int] = None,
     limit: int = Query(400, le=1000),
-    offset: int = 0,
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """Get all members, optionally filtered by session year or district"""
-    query = db.query(Member)
-    
-    if session_year:
-        query = query.filter(Member.session_year == session_year)
+    # Served from the in-process roster, already sorted by name
+    members = get_roster(db).members(session_year or None, district or None)
     
-    if district:
-        query = query.filter(Member.district == district)
-    
-    total = query.count()
-    members = query.order_by(Member.name).limit(limit).offset(offset).all()
+    total = len(members)
     
     items = []
-    for m in members:
+    for member_id, name, member_district, member_session_year in members[offset:offset + limit]:
         items.append({
-            "sessionMemberId": m.member_id,
-            "shortName": m.name,
-            "sessionYear": m.session_year,
-            "districtCode": m.district,
+            "sessionMemberId": member_id,
+            "shortName": name,
+            "sessionYear": member_session_year,
+            "districtCode": member_district,
             "alternate": False,
-            "memberId": m.member_id
+            "memberId": member_id
         })
     
     return {
@@ -89,8 +164,9 @@ def get_members(
         }
     }
 
-@app.get("/members/{member_id}")
-@limiter.limit("60/minute")
+@app.get("/members/{member_id}", response_model=MemberResponse)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_member(
     request: Request,
     member_id: int,
@@ -98,7 +174,7 @@ def get_member(
     db: Session = Depends(get_db)
 ):
     """Get a specific member by ID"""
-    member = db.query(Member).filter(Member.member_id == member_id).first()
+    member = get_roster(db).get(member_id)
     
     if member is None:
         return {
@@ -112,6 +188,8 @@ def get_member(
             "result": {}
         }
     
+    member_id, name, district, session_year = member
+    
     return {
         "success": True,
         "message": "",
@@ -121,23 +199,24 @@ def get_member(
         "offsetEnd": 1,
         "limit": 1,
         "result": {
-            "sessionMemberId": member.member_id,
-            "shortName": member.name,
-            "sessionYear": member.session_year,
-            "districtCode": member.district,
+            "sessionMemberId": member_id,
+            "shortName": name,
+            "sessionYear": session_year,
+            "districtCode": district,
             "alternate": False,
-            "memberId": member.member_id
+            "memberId": member_id
         }
     }
 
 # TRANSCRIPTS
-@app.get("/transcripts")
-@limiter.limit("60/minute")
+@app.get("/transcripts", response_model=TranscriptList)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_all_transcripts(
     request: Request,
     key: str = Depends(verify_api_key),  
     limit: int = Query(400, le=1000),
-    offset: int = 0,
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """Get list of all available transcript dates"""
@@ -160,18 +239,25 @@ def get_all_transcripts(
         }
     }
 
-@app.get("/transcripts/{date}")
-@limiter.limit("30/minute")
+@app.get("/transcripts/{date}", response_model=TranscriptResponse)
+@limiter.limit(tier_limit("30/minute"))
+@profiled
 def get_transcript(
     request: Request,
     date: str,
     key: str = Depends(verify_api_key),  
+    start: Optional[int] = Query(None, ge=0),
+    end: Optional[int] = Query(None, ge=0),
+    format: str = Query("json", pattern="^(json|text)$"),
     db: Session = Depends(get_db)
 ):
-    """Get full transcript for a specific date"""
-    transcript = db.query(Transcript).filter(Transcript.date == date).first()
+    """
+    Get full transcript for a specific date, or the characters start:end
+    of it. format=text returns the bare text instead of the JSON envelope.
+    """
+    found = db.query(Transcript.date).filter(Transcript.date == date).first()
     
-    if transcript is None:
+    if found is None:
         return {
             "success": False,
             "message": "Transcript not found",
@@ -183,7 +269,7 @@ def get_transcript(
             "result": {}
         }
     
-    return {
+    envelope = {
         "success": True,
         "message": "",
         "responseType": "transcript",
@@ -192,46 +278,108 @@ def get_transcript(
         "offsetEnd": 1,
         "limit": 1,
         "result": {
-            "date": transcript.date,
-            "text": transcript.text
+            "date": date,
+            "text": None
         }
     }
+    
+    # Stream straight from the mapped store file when the date is in it
+    store = get_store()
+    in_store = store is not None and date in store
+    if store is not None:
+        record_cache("transcript_store", in_store)
+    if in_store:
+        if format == "text":
+            return StreamingResponse(store.iter_bytes(date, start, end), media_type="text/plain; charset=utf-8")
+        return StreamingResponse(stream_json(envelope, store.view(date, start, end)), media_type="application/json")
+    
+    text = db.query(Transcript.text).filter(Transcript.date == date).scalar()
+    if text is not None and (start is not None or end is not None):
+        text = text[start:end]
+    if format == "text":
+        return PlainTextResponse(text or "")
+    
+    envelope["result"]["text"] = text
+    return envelope
+
+@app.get("/transcripts/{date}/toc", response_model=TranscriptTocResponse)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
+def get_transcript_toc(
+    request: Request,
+    date: str,
+    key: str = Depends(verify_api_key),  
+    db: Session = Depends(get_db)
+):
+    """
+    Table of contents for a transcript: speaker turns, bill sections and
+    pages as segment sequence ranges, precomputed at ingest
+    """
+    toc = db.query(TranscriptToc.toc).filter(TranscriptToc.date == date).scalar()
+    
+    if toc is None:
+        return {
+            "success": False,
+            "message": "Table of contents not found",
+            "responseType": "transcript toc",
+            "total": 0,
+            "offsetStart": 0,
+            "offsetEnd": 0,
+            "limit": 1,
+            "result": {}
+        }
+    
+    envelope = {
+        "success": True,
+        "message": "",
+        "responseType": "transcript toc",
+        "total": 1,
+        "offsetStart": 1,
+        "offsetEnd": 1,
+        "limit": 1,
+        "result": {
+            "date": date,
+            "toc": None
+        }
+    }
+    
+    # The stored bytes are already the toc's JSON; splice them in unparsed
+    marker = '\x00toc\x00'
+    envelope["result"]["toc"] = marker
+    prefix, suffix = json.dumps(envelope, ensure_ascii=False, separators=(',', ':')).split(json.dumps(marker))
+    return Response(prefix.encode('utf-8') + zlib.decompress(toc) + suffix.encode('utf-8'), media_type="application/json")
 
 # SEGMENTS
-@app.get("/segments")
-@limiter.limit("60/minute")
+@app.get("/segments", response_model=SegmentList)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_segments(
     request: Request,
     key: str = Depends(verify_api_key),  
     date: Optional[str] = None,
     member_id: Optional[int] = None,
+    from_seq: Optional[int] = None,
+    to_seq: Optional[int] = None,
     limit: int = Query(100, le=1000),
-    offset: int = 0,
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
-    """Get transcript segments with optional filters"""
-    query = db.query(TranscriptSegment, Member.name.label('member_name'))\
-        .outerjoin(Member, TranscriptSegment.member_id == Member.member_id)
-    
-    if date:
-        query = query.filter(TranscriptSegment.date == date)
-    
-    if member_id:
-        query = query.filter(TranscriptSegment.member_id == member_id)
+    """Get transcript segments with optional filters; from_seq/to_seq bound the sequence numbers (inclusive)"""
+    total, results = segment_page(db, date, member_id, from_seq, to_seq, limit, offset)
     
-    total = query.count()
-    query = query.order_by(TranscriptSegment.date, TranscriptSegment.sequence_number)
-    results = query.limit(limit).offset(offset).all()
+    # Member names come from the in-process roster, not a join
+    roster = get_roster(db)
     
     items = []
-    for segment, member_name in results:
+    for segment in results:
         items.append({
             "segmentId": segment.segment_id,
             "date": segment.date,
             "sequenceNumber": segment.sequence_number,
             "memberId": segment.member_id,
-            "text": segment.text,
-            "memberName": member_name
+            "text": segment_text(segment, segment.raw_text),
+            "memberName": roster.name_of(segment.member_id),
+            "billNumber": segment.bill_number
         })
     
     return {
@@ -247,8 +395,9 @@ def get_segments(
         }
     }
 
-@app.get("/segments/{segment_id}")
-@limiter.limit("60/minute")
+@app.get("/segments/{segment_id}", response_model=SegmentResponse)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_segment(
     request: Request,
     segment_id: int,
@@ -256,11 +405,11 @@ def get_segment(
     db: Session = Depends(get_db)
 ):
     """Get a specific segment by ID"""
-    result = db.query(TranscriptSegment, Member.name.label('member_name'))\
-        .outerjoin(Member, TranscriptSegment.member_id == Member.member_id)\
+    segment = db.query(*SEGMENT_COLUMNS, raw_text_column())\
+        .outerjoin(Transcript, TranscriptSegment.date == Transcript.date)\
         .filter(TranscriptSegment.segment_id == segment_id).first()
     
-    if result is None:
+    if segment is None:
         return {
             "success": False,
             "message": "Segment not found",
@@ -272,7 +421,7 @@ def get_segment(
             "result": {}
         }
     
-    segment, member_name = result
+    member_name = get_roster(db).name_of(segment.member_id)
     
     return {
         "success": True,
@@ -287,14 +436,114 @@ def get_segment(
             "date": segment.date,
             "sequenceNumber": segment.sequence_number,
             "memberId": segment.member_id,
-            "text": segment.text,
-            "memberName": member_name
+            "text": segment_text(segment, segment.raw_text),
+            "memberName": member_name,
+            "billNumber": segment.bill_number
+        }
+    }
+
+@app.get("/segments/{segment_id}/context", response_model=SegmentContextResponse)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
+def get_segment_context(
+    request: Request,
+    segment_id: int,
+    key: str = Depends(verify_api_key),  
+    before: int = Query(2, ge=0, le=50),
+    after: int = Query(2, ge=0, le=50),
+    db: Session = Depends(get_db)
+):
+    """Get a segment with the segments spoken just before and after it, in floor order"""
+    results = segment_context(db, segment_id, before, after)
+    
+    if not results:
+        return {
+            "success": False,
+            "message": "Segment not found",
+            "responseType": "segment context",
+            "total": 0,
+            "offsetStart": 0,
+            "offsetEnd": 0,
+            "limit": before + after + 1,
+            "result": {}
+        }
+    
+    roster = get_roster(db)
+    
+    items = []
+    for segment in results:
+        items.append({
+            "segmentId": segment.segment_id,
+            "date": segment.date,
+            "sequenceNumber": segment.sequence_number,
+            "memberId": segment.member_id,
+            "text": segment_text(segment, segment.raw_text),
+            "memberName": roster.name_of(segment.member_id),
+            "billNumber": segment.bill_number
+        })
+    
+    return {
+        "success": True,
+        "message": "",
+        "responseType": "segment context",
+        "total": len(items),
+        "offsetStart": 1,
+        "offsetEnd": len(items),
+        "limit": before + after + 1,
+        "result": {
+            "segmentId": segment_id,
+            "items": items
+        }
+    }
+
+# BILLS
+@app.get("/bills/{bill_number}/segments", response_model=BillSegmentList)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
+def get_bill_segments(
+    request: Request,
+    bill_number: str,
+    key: str = Depends(verify_api_key),  
+    limit: int = Query(100, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Get the segments of a bill's debate, in floor order"""
+    total, results = bill_segment_page(db, bill_number.upper(), limit, offset)
+    
+    roster = get_roster(db)
+    
+    items = []
+    for segment in results:
+        items.append({
+            "segmentId": segment.segment_id,
+            "date": segment.date,
+            "sequenceNumber": segment.sequence_number,
+            "memberId": segment.member_id,
+            "text": segment_text(segment, segment.raw_text),
+            "memberName": roster.name_of(segment.member_id),
+            "billNumber": segment.bill_number,
+            "calendarNumber": segment.calendar_number,
+            "rulesReportNumber": segment.rules_report_number
+        })
+    
+    return {
+        "success": True,
+        "message": "",
+        "responseType": "bill segment list",
+        "total": total,
+        "offsetStart": offset + 1 if total > 0 else 0,
+        "offsetEnd": min(offset + len(items), total),
+        "limit": limit,
+        "result": {
+            "items": items
         }
     }
 
 # INTERACTIONS
-@app.get("/interactions")
-@limiter.limit("60/minute")
+@app.get("/interactions", response_model=ActivityList)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_interactions(
     request: Request,
     key: str = Depends(verify_api_key),  
@@ -302,32 +551,19 @@ def get_interactions(
     date: Optional[str] = None,
     interaction_type: Optional[str] = None,
     limit: int = Query(100, le=1000),
-    offset: int = 0,
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """Get interactions with optional filters"""
-    query = db.query(Activity, Member.name.label('from_member_name'))\
-        .outerjoin(Member, Activity.member_from == Member.member_id)
-    
-    if member_id:
-        query = query.filter(
-            or_(Activity.member_from == member_id, Activity.member_to == member_id)
-        )
-    
-    if date:
-        query = query.filter(Activity.date == date)
-    
-    if interaction_type:
-        query = query.filter(Activity.interaction == interaction_type)
+    total, results = interaction_page(db, member_id, date, interaction_type, limit, offset)
     
-    total = query.count()
-    query = query.order_by(Activity.date, Activity.segment_id)
-    results = query.limit(limit).offset(offset).all()
+    # Member names come from the in-process roster, not a join or a query per row
+    roster = get_roster(db)
     
     items = []
-    for activity, from_name in results:
-        to_member = db.query(Member).filter(Member.member_id == activity.member_to).first()
-        to_name = to_member.name if to_member else None
+    for activity in results:
+        from_name = roster.name_of(activity.member_from)
+        to_name = roster.name_of(activity.member_to)
         
         items.append({
             "activityId": activity.activity_id,
@@ -338,7 +574,8 @@ def get_interactions(
             "interactionType": activity.interaction,
             "fromMemberName": from_name,
             "toMemberName": to_name,
-            "sentiment": activity.sentiment
+            "sentiment": activity.sentiment,
+            "billNumber": activity.bill_number
         })
     
     return {
@@ -354,8 +591,9 @@ def get_interactions(
         }
     }
 
-@app.get("/interactions/{activity_id}")
-@limiter.limit("60/minute")
+@app.get("/interactions/{activity_id}", response_model=ActivityResponse)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
 def get_interaction(
     request: Request,
     activity_id: int,
@@ -363,11 +601,9 @@ def get_interaction(
     db: Session = Depends(get_db)
 ):
     """Get a specific interaction by ID"""
-    result = db.query(Activity, Member.name.label('from_member_name'))\
-        .outerjoin(Member, Activity.member_from == Member.member_id)\
-        .filter(Activity.activity_id == activity_id).first()
+    activity = db.query(*ACTIVITY_COLUMNS).filter(Activity.activity_id == activity_id).first()
     
-    if result is None:
+    if activity is None:
         return {
             "success": False,
             "message": "Interaction not found",
@@ -379,9 +615,9 @@ def get_interaction(
             "result": {}
         }
     
-    activity, from_name = result
-    to_member = db.query(Member).filter(Member.member_id == activity.member_to).first()
-    to_name = to_member.name if to_member else None
+    roster = get_roster(db)
+    from_name = roster.name_of(activity.member_from)
+    to_name = roster.name_of(activity.member_to)
     
     return {
         "success": True,
@@ -400,6 +636,111 @@ def get_interaction(
             "interactionType": activity.interaction,
             "fromMemberName": from_name,
             "toMemberName": to_name,
-            "sentiment": activity.sentiment
+            "sentiment": activity.sentiment,
+            "billNumber": activity.bill_number
         }
-    }
\ No newline at end of file
+    }
+
+# THREADS
+@app.get("/threads", response_model=DebateThreadList)
+@limiter.limit(tier_limit("60/minute"))
+@profiled
+def get_threads(
+    request: Request,
+    key: str = Depends(verify_api_key),  
+    date: Optional[str] = None,
+    member_id: Optional[int] = None,
+    limit: int = Query(20, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Get debate threads with their segments; member_id matches the sponsor or the questioner"""
+    total, threads = thread_page(db, date, member_id, limit, offset)
+    
+    segments = {}
+    for segment in thread_segments(db, threads):
+        segments[segment.date, segment.sequence_number] = segment
+    
+    roster = get_roster(db)
+    
+    items = []
+    for thread in threads:
+        items.append({
+            "threadId": thread.thread_id,
+            "date": thread.date,
+            "billNumber": thread.bill_number,
+            "sponsorId": thread.sponsor_id,
+            "sponsorName": roster.name_of(thread.sponsor_id),
+            "questionerId": thread.questioner_id,
+            "questionerName": roster.name_of(thread.questioner_id),
+            "firstSegmentId": thread.first_segment_id,
+            "lastSegmentId": thread.last_segment_id,
+            "questions": thread.questions,
+            "answers": thread.answers,
+            "segments": [
+                {
+                    "segmentId": segment.segment_id,
+                    "sequenceNumber": segment.sequence_number,
+                    "memberId": segment.member_id,
+                    "memberName": roster.name_of(segment.member_id),
+                    "text": segment_text(segment, segment.raw_text)
+                }
+                for segment in (
+                    segments[thread.date, sequence]
+                    for sequence in range(thread.first_sequence, thread.last_sequence + 1)
+                    if (thread.date, sequence) in segments
+                )
+            ]
+        })
+    
+    return {
+        "success": True,
+        "message": "",
+        "responseType": "thread list",
+        "total": total,
+        "offsetStart": offset + 1 if total > 0 else 0,
+        "offsetEnd": min(offset + len(items), total),
+        "limit": limit,
+        "result": {
+            "items": items
+        }
+    }
+
+# STATS
+@app.get("/stats/sentiment", response_model=SentimentList)
+@limiter.limit(tier_limit("30/minute"))
+@profiled
+def get_sentiment_stats(
+    request: Request,
+    key: str = Depends(verify_api_key),  
+    by: str = Query("member", pattern="^(member|date)$"),
+    date: Optional[str] = None,
+    member_id: Optional[int] = None,
+    limit: int = Query(400, le=1000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Segment sentiment counts per member or per transcript date"""
+    all_items = sentiment_items(db, by, date=date, member_id=member_id)
+    total = len(all_items)
+    items = all_items[offset:offset + limit]
+    
+    return {
+        "success": True,
+        "message": "",
+        "responseType": "sentiment stats",
+        "total": total,
+        "offsetStart": offset + 1 if total > 0 else 0,
+        "offsetEnd": min(offset + len(items), total),
+        "limit": limit,
+        "result": {
+            "items": items
+        }
+    }
+
+# METRICS
+@app.get("/metrics")
+def get_metrics(key: str = Depends(require_admin)):
+    """Request, SQL, cache and rate limit metrics in Prometheus text format"""
+    body, media_type = render()
+    return Response(body, media_type=media_type)
@@ -0,0 +1,166 @@
+from contextvars import ContextVar
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+from sqlalchemy import event
+import os
+import time
+
+# Request metrics for /metrics, in Prometheus text format.
+#
+# MetricsMiddleware times every request by route template (not raw
+# path, so /segments/{segment_id} is one series) and counts its response
+# bytes; SQLAlchemy engine events add the statements each request ran.
+# Under several uvicorn workers, set PROMETHEUS_MULTIPROC_DIR to an
+# empty directory so /metrics reports all workers, not whichever one
+# answered the scrape.
+#
+# SERVER_TIMING=1, or ?timing=1 on a single request, adds a Server-Timing
+# header with the time and SQL spent before the response started.
+
+SERVER_TIMING = os.getenv("SERVER_TIMING", "") not in ("", "0")
+MAX_STATEMENTS = 200  # kept per captured request
+
+REQUEST_LATENCY = Histogram(
+    "api_request_duration_seconds", "Time from request to last response byte",
+    ["route", "method", "status"]
+)
+RESPONSE_SIZE = Histogram(
+    "api_response_size_bytes", "Response body size",
+    ["route"], buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+)
+SQL_STATEMENTS = Histogram(
+    "api_sql_statements_per_request", "SQL statements executed per request",
+    ["route"], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100)
+)
+SQL_DURATION = Histogram(
+    "api_sql_duration_seconds_per_request", "Time spent in SQL statements per request",
+    ["route"]
+)
+CACHE_LOOKUPS = Counter(
+    "api_cache_lookups_total", "Cache lookups by cache and result (hit or miss)",
+    ["cache", "result"]
+)
+RATE_LIMITED = Counter(
+    "api_rate_limited_total", "Requests rejected by the rate limiter",
+    ["route"]
+)
+
+
+class RequestMetrics:
+    """
+    What one request has spent so far; SQL time is in seconds.
+
+    The remaining fields stay None unless profiling.py is capturing the
+    request: statements (sql, params, rowcount, seconds), the IDs of the
+    threads that ran it, their sampled stacks and a cProfile profiler.
+    """
+    __slots__ = ("start", "sql_count", "sql_time", "statements", "thread_ids", "samples", "profiler")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements = None
+        self.thread_ids = None
+        self.samples = None
+        self.profiler = None
+
+
+# Set by the middleware; FastAPI copies it into the threadpool running sync endpoints
+_current: ContextVar = ContextVar("request_metrics", default=None)
+
+
+def current() -> RequestMetrics:
+    """Metrics of the request being served, or None outside one"""
+    return _current.get()
+
+
+def route_of(scope) -> str:
+    """Route template the request matched, e.g. '/segments/{segment_id}'"""
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+def record_cache(cache: str, hit: bool, count: int = 1):
+    """Count lookups in transcript_store, roster or a pipeline_<stage> artifact cache"""
+    if count:
+        CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc(count)
+
+
+def instrument_engine(engine):
+    """Count and time every statement engine runs against the current request"""
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.sql_count += 1
+            metrics.sql_time += elapsed
+            if metrics.statements is not None and len(metrics.statements) < MAX_STATEMENTS:
+                metrics.statements.append((statement, parameters, cursor.rowcount, elapsed))
+
+
+def server_timing(metrics: RequestMetrics) -> bytes:
+    app_ms = (time.perf_counter() - metrics.start) * 1000
+    return (f'app;dur={app_ms:.1f}, '
+            f'sql;dur={metrics.sql_time * 1000:.1f};desc="{metrics.sql_count} statements"').encode('latin-1')
+
+
+def wants_timing(scope) -> bool:
+    return SERVER_TIMING or b"timing=1" in scope.get("query_string", b"").split(b"&")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording REQUEST_LATENCY, RESPONSE_SIZE and the SQL
+    histograms. Written against raw ASGI rather than BaseHTTPMiddleware
+    so streamed responses are measured to their last byte and nothing
+    is buffered.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        timing = wants_timing(scope)
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timing:
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", server_timing(metrics))]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = route_of(scope)
+            REQUEST_LATENCY.labels(route, scope["method"], str(status)).observe(time.perf_counter() - metrics.start)
+            RESPONSE_SIZE.labels(route).observe(size)
+            SQL_STATEMENTS.labels(route).observe(metrics.sql_count)
+            SQL_DURATION.labels(route).observe(metrics.sql_time)
+
+
+def render() -> tuple[bytes, str]:
+    """(body, content type) of the /metrics response"""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
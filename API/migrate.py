@@ -0,0 +1,42 @@
+"""
+Bring an existing database up to model.py: create missing tables, then
+add the columns and indexes added to existing tables since they were
+created. New columns are nullable and left empty; the backfill scripts
+fill them.
+
+Usage: python migrate.py
+"""
+from sqlalchemy import inspect, text
+
+from database import get_engines
+from model import Base
+
+
+def migrate(engine=None) -> list[str]:
+    """Apply the missing DDL (to the primary by default) and return what was added"""
+    engine = engine or get_engines().primary
+    Base.metadata.create_all(engine)
+    inspector = inspect(engine)
+    added = []
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c['name'] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    added.append(f"{table.name}.{column.name}")
+
+            indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(conn)
+                    added.append(index.name)
+
+    return added
+
+
+if __name__ == '__main__':
+    added = migrate()
+    print("Added: " + ", ".join(added) if added else "Up to date")
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -18,6 +18,13 @@ class Transcript(Base):
     date = Column(String, primary_key=True)
     text = Column(Text)
 
+class TranscriptToc(Base):
+    __tablename__ = 'transcript_tocs'
+    
+    date = Column(String, ForeignKey('transcripts.date'), primary_key=True)
+    # chunk_scripts.toc_bytes(table_of_contents(...)), written at ingest
+    toc = Column(LargeBinary)
+
 class TranscriptSegment(Base):
     __tablename__ = 'transcript_segments'
     
@@ -25,11 +32,29 @@ class TranscriptSegment(Base):
     date = Column(String, ForeignKey('transcripts.date'))
     sequence_number = Column(Integer)
     member_id = Column(Integer, ForeignKey('members.member_id'))
-    text = Column(Text)
+    text = Column(Text)  # NULL when only the offsets below are stored
+    # Raw speech is transcripts.text[text_start:text_end], before cleaning
+    text_start = Column(Integer)
+    text_end = Column(Integer)
+    sentiment = Column(String)  # analyze_sentiment label of the text
+    # Bill under debate, from chunk_scripts.attach_bill_context
+    bill_number = Column(String)
+    calendar_number = Column(String)
+    rules_report_number = Column(String)
     
     # Relationships for easier joins
     member = relationship("Member")
     transcript = relationship("Transcript")
+    
+    # /bills/{number}/segments reads a debate in order from the index alone;
+    # sequence ranges and /segments/{id}/context are one range scan of the second.
+    # /stats/sentiment groups by member or date from the last two alone
+    __table_args__ = (
+        Index('ix_transcript_segments_bill', 'bill_number', 'date', 'sequence_number'),
+        Index('ix_transcript_segments_date_sequence', 'date', 'sequence_number'),
+        Index('ix_transcript_segments_member_sentiment', 'member_id', 'sentiment'),
+        Index('ix_transcript_segments_date_sentiment', 'date', 'sentiment'),
+    )
 
 class Activity(Base):
     __tablename__ = 'activity'
@@ -42,8 +67,28 @@ class Activity(Base):
     interaction = Column(String)
     sentiment = Column(String, default='neutral')
     text_snippet = Column(Text)
+    bill_number = Column(String, index=True)
     
     # Relationships
     from_member = relationship("Member", foreign_keys=[member_from])
     to_member = relationship("Member", foreign_keys=[member_to])
-    segment = relationship("TranscriptSegment")
\ No newline at end of file
+    segment = relationship("TranscriptSegment")
+
+class DebateThread(Base):
+    __tablename__ = 'debate_threads'
+    
+    thread_id = Column(Integer, primary_key=True, autoincrement=True)
+    date = Column(String, ForeignKey('transcripts.date'), index=True)
+    bill_number = Column(String)
+    sponsor_id = Column(Integer, ForeignKey('members.member_id'), index=True)
+    questioner_id = Column(Integer, ForeignKey('members.member_id'), index=True)
+    # The thread is every segment of the date from the first to the last
+    first_segment_id = Column(Integer, ForeignKey('transcript_segments.segment_id'))
+    last_segment_id = Column(Integer, ForeignKey('transcript_segments.segment_id'))
+    # Turns taken by the questioner and by the sponsor
+    questions = Column(Integer)
+    answers = Column(Integer)
+    
+    # Relationships
+    sponsor = relationship("Member", foreign_keys=[sponsor_id])
+    questioner = relationship("Member", foreign_keys=[questioner_id])
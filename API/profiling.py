@@ -0,0 +1,240 @@
+from anyio import to_thread
+from collections import Counter
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode
+import asyncio
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+from auth import ADMIN_TIER, KEY_STORE
+from metrics import current
+
+# Slow request log and ?profile=1.
+#
+# With SLOW_REQUEST_MS set, every request records its SQL statements and
+# a sampler thread collects the stacks of the threads running it; those
+# over the threshold are appended to SLOW_REQUEST_LOG as one JSON line
+# each. Unset (the default), requests pay one comparison.
+#
+# ?profile=1 with an admin key runs the request under cProfile and
+# returns the report in place of the response. The event loop thread is
+# profiled too, since JSON encoding happens there, so concurrent
+# requests can show up in the report; profiled requests run one at a
+# time, as Python 3.12+ allows a single active profiler per process.
+#
+# Endpoints opt in with @profiled, under @limiter.limit, so the work
+# FastAPI runs in its threadpool is sampled and profiled.
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))  # 0 disables the log
+SLOW_REQUEST_LOG = os.getenv("SLOW_REQUEST_LOG", "slow_requests.log")
+SAMPLE_INTERVAL = 0.005
+PROFILE_LINES = 40
+
+
+def collapse(frame, depth: int = 64) -> str:
+    """'file:function;...' from the outermost frame in to frame, the folded stack format flame graphs read"""
+    names = []
+    while frame is not None and len(names) < depth:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Sampler:
+    """Background thread adding the stacks of registered requests' threads to their samples"""
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self.active = {}
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def add(self, metrics):
+        with self._lock:
+            self.active[id(metrics)] = metrics
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-sampler", daemon=True)
+                self._thread.start()
+        self._wake.set()
+
+    def discard(self, metrics):
+        with self._lock:
+            self.active.pop(id(metrics), None)
+            if not self.active:
+                self._wake.clear()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            # Under the lock, so a request's samples are final once discard() returns
+            with self._lock:
+                for metrics in self.active.values():
+                    for ident in list(metrics.thread_ids):
+                        frame = frames.get(ident)
+                        if frame is not None:
+                            metrics.samples[collapse(frame)] += 1
+            del frames
+
+
+SAMPLER = Sampler()
+_profile_lock = None
+
+
+def profiled(func):
+    """Let slow request sampling and ?profile=1 see a sync endpoint's threadpool thread"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        metrics = current()
+        if metrics is None or (metrics.thread_ids is None and metrics.profiler is None):
+            return func(*args, **kwargs)
+
+        if metrics.thread_ids is not None:
+            metrics.thread_ids.add(threading.get_ident())
+        profiler = metrics.profiler
+        if profiler is not None:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Python 3.12+: the loop's profiler already covers every thread
+                profiler = None
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+
+    return wrapper
+
+
+def is_admin_profile(scope) -> bool:
+    """?profile=1 with an admin API key"""
+    query = scope.get("query_string", b"")
+    if b"profile=1" not in query.split(b"&"):
+        return False
+    key = dict(parse_qsl(query.decode('latin-1'))).get("key", "")
+    info = KEY_STORE.verify(key)
+    return info is not None and info.tier == ADMIN_TIER
+
+
+def profile_report(*profilers) -> str:
+    stats = None
+    for profiler in profilers:
+        profiler.create_stats()
+        if not profiler.stats:
+            continue
+        if stats is None:
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+        else:
+            stats.add(profiler)
+    if stats is None:
+        return "No profile data\n"
+    stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+    return stats.stream.getvalue()
+
+
+def slow_request_entry(scope, status: int, elapsed: float, metrics) -> dict:
+    # The API key is in the query string; it stays out of the log
+    query = [(name, value) for name, value in parse_qsl(scope.get("query_string", b"").decode('latin-1'))
+             if name != "key"]
+    return {
+        "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "method": scope["method"],
+        "path": scope["path"],
+        "query": urlencode(query),
+        "status": status,
+        "ms": round(elapsed * 1000, 1),
+        "sqlMs": round(metrics.sql_time * 1000, 1),
+        "statements": [
+            {"sql": sql, "params": params, "rows": rows if rows >= 0 else None, "ms": round(seconds * 1000, 2)}
+            for sql, params, rows, seconds in metrics.statements
+        ],
+        "profile": metrics.samples.most_common(20),
+    }
+
+
+def write_slow_request(entry: dict, path: str = SLOW_REQUEST_LOG):
+    line = json.dumps(entry, default=str) + '\n'
+    # One write per line, so entries from several workers never interleave
+    with open(path, 'a') as f:
+        f.write(line)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware for the slow request log and ?profile=1. Add it
+    before MetricsMiddleware, which must wrap it to set up the request's
+    RequestMetrics.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        if b"profile=1" in scope.get("query_string", b"") and is_admin_profile(scope):
+            return await self.profile(scope, receive, send)
+        if not SLOW_REQUEST_MS:
+            return await self.app(scope, receive, send)
+
+        metrics = current()
+        metrics.statements = []
+        metrics.thread_ids = set()
+        metrics.samples = Counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        SAMPLER.add(metrics)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            SAMPLER.discard(metrics)
+            elapsed = time.perf_counter() - metrics.start
+            if elapsed * 1000 >= SLOW_REQUEST_MS:
+                # In a worker thread: a disk that is slow to append to
+                # would otherwise stall every request on this event loop
+                entry = slow_request_entry(scope, status, elapsed, metrics)
+                await to_thread.run_sync(write_slow_request, entry)
+
+    async def profile(self, scope, receive, send):
+        global _profile_lock
+        if _profile_lock is None:
+            _profile_lock = asyncio.Lock()
+
+        async def discard(message):
+            pass
+
+        async with _profile_lock:
+            metrics = current()
+            metrics.profiler = cProfile.Profile()
+            loop_profiler = cProfile.Profile()
+            loop_profiler.enable()
+            try:
+                await self.app(scope, receive, discard)
+            finally:
+                loop_profiler.disable()
+            report = profile_report(loop_profiler, metrics.profiler)
+
+        body = report.encode('utf-8')
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"text/plain; charset=utf-8"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
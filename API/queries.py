@@ -0,0 +1,171 @@
+"""
+Core queries for the list endpoints.
+
+Each is a select() of explicit table columns run on the session's
+connection, so a page comes back as plain Row tuples (readable by
+attribute, row.segment_id) without ORM entities, identity map entries or
+the ORM's result processing. The page functions return (total, rows).
+benchmarks/bench_queries.py measures what this saves per page.
+"""
+from sqlalchemy import and_, func, or_, select
+
+from model import Activity, DebateThread, Transcript, TranscriptSegment
+from segment_text import raw_text_column
+
+segments = TranscriptSegment.__table__
+transcripts = Transcript.__table__
+activity = Activity.__table__
+threads = DebateThread.__table__
+
+# What segment responses read, including the columns segment_text needs,
+# so their rows can stand in for a segment
+SEGMENT_COLUMNS = (
+    segments.c.segment_id,
+    segments.c.date,
+    segments.c.sequence_number,
+    segments.c.member_id,
+    segments.c.bill_number,
+    segments.c.text,
+    segments.c.text_start,
+    segments.c.text_end,
+)
+
+ACTIVITY_COLUMNS = (
+    activity.c.activity_id,
+    activity.c.date,
+    activity.c.segment_id,
+    activity.c.member_from,
+    activity.c.member_to,
+    activity.c.interaction,
+    activity.c.sentiment,
+    activity.c.bill_number,
+)
+
+THREAD_COLUMNS = (
+    threads.c.thread_id,
+    threads.c.date,
+    threads.c.bill_number,
+    threads.c.sponsor_id,
+    threads.c.questioner_id,
+    threads.c.first_segment_id,
+    threads.c.last_segment_id,
+    threads.c.questions,
+    threads.c.answers,
+)
+
+# Segments with the raw_text_column() slice of their transcript
+SEGMENTS_WITH_TEXT = segments.outerjoin(transcripts, segments.c.date == transcripts.c.date)
+
+
+def _page(db, table, conditions: list, statement, limit: int, offset: int) -> tuple:
+    """(count of table rows matching conditions, rows of statement for the page)"""
+    conn = db.connection()
+    total = conn.execute(select(func.count()).select_from(table).where(*conditions)).scalar()
+    rows = conn.execute(statement.where(*conditions).limit(limit).offset(offset)).all()
+    return total, rows
+
+
+def _segment_page(db, conditions: list, limit: int, offset: int, extra_columns: tuple = ()) -> tuple:
+    statement = select(*SEGMENT_COLUMNS, *extra_columns, raw_text_column())\
+        .select_from(SEGMENTS_WITH_TEXT)\
+        .order_by(segments.c.date, segments.c.sequence_number)
+    return _page(db, segments, conditions, statement, limit, offset)
+
+
+def segment_page(db, date: str = None, member_id: int = None, from_seq: int = None, to_seq: int = None,
+                 limit: int = 100, offset: int = 0) -> tuple:
+    """Segments in floor order: SEGMENT_COLUMNS and raw_text"""
+    conditions = []
+    if date:
+        conditions.append(segments.c.date == date)
+    if member_id:
+        conditions.append(segments.c.member_id == member_id)
+    # With date, a range scan of ix_transcript_segments_date_sequence
+    if from_seq is not None:
+        conditions.append(segments.c.sequence_number >= from_seq)
+    if to_seq is not None:
+        conditions.append(segments.c.sequence_number <= to_seq)
+    return _segment_page(db, conditions, limit, offset)
+
+
+def bill_segment_page(db, bill_number: str, limit: int = 100, offset: int = 0) -> tuple:
+    """A bill's segments in floor order: SEGMENT_COLUMNS, calendar and rules report numbers, and raw_text"""
+    return _segment_page(db, [segments.c.bill_number == bill_number], limit, offset,
+                         (segments.c.calendar_number, segments.c.rules_report_number))
+
+
+def segment_context(db, segment_id: int, before: int, after: int) -> list:
+    """
+    The segment and its neighbours in floor order, in one statement: the
+    anchor by primary key, then a range scan of (date, sequence_number)
+    """
+    anchor = segments.alias('anchor')
+    statement = select(*SEGMENT_COLUMNS, raw_text_column())\
+        .select_from(SEGMENTS_WITH_TEXT.join(anchor, and_(
+            anchor.c.segment_id == segment_id,
+            segments.c.date == anchor.c.date,
+            segments.c.sequence_number.between(anchor.c.sequence_number - before,
+                                               anchor.c.sequence_number + after)
+        )))\
+        .order_by(segments.c.sequence_number)
+    return db.connection().execute(statement).all()
+
+
+def interaction_page(db, member_id: int = None, date: str = None, interaction_type: str = None,
+                     limit: int = 100, offset: int = 0) -> tuple:
+    """Interactions by date and segment: ACTIVITY_COLUMNS"""
+    conditions = []
+    if member_id:
+        conditions.append(or_(activity.c.member_from == member_id, activity.c.member_to == member_id))
+    if date:
+        conditions.append(activity.c.date == date)
+    if interaction_type:
+        conditions.append(activity.c.interaction == interaction_type)
+
+    statement = select(*ACTIVITY_COLUMNS).order_by(activity.c.date, activity.c.segment_id)
+    return _page(db, activity, conditions, statement, limit, offset)
+
+
+def thread_page(db, date: str = None, member_id: int = None, limit: int = 20, offset: int = 0) -> tuple:
+    """Debate threads in floor order: THREAD_COLUMNS, first_sequence and last_sequence"""
+    conditions = []
+    if date:
+        conditions.append(threads.c.date == date)
+    if member_id:
+        conditions.append(or_(threads.c.sponsor_id == member_id, threads.c.questioner_id == member_id))
+
+    first = segments.alias('first_segment')
+    last = segments.alias('last_segment')
+    statement = select(*THREAD_COLUMNS,
+                       first.c.sequence_number.label('first_sequence'),
+                       last.c.sequence_number.label('last_sequence'))\
+        .select_from(threads
+                     .join(first, first.c.segment_id == threads.c.first_segment_id)
+                     .join(last, last.c.segment_id == threads.c.last_segment_id))\
+        .order_by(threads.c.date, first.c.sequence_number)
+    return _page(db, threads, conditions, statement, limit, offset)
+
+
+def thread_segments(db, thread_rows: list) -> list:
+    """Segments of every thread_page row, in one query of a (date, sequence_number) range scan each"""
+    if not thread_rows:
+        return []
+    statement = select(*SEGMENT_COLUMNS, raw_text_column())\
+        .select_from(SEGMENTS_WITH_TEXT)\
+        .where(or_(*[
+            and_(segments.c.date == thread.date,
+                 segments.c.sequence_number.between(thread.first_sequence, thread.last_sequence))
+            for thread in thread_rows
+        ]))
+    return db.connection().execute(statement).all()
+
+
+def warm_up(db):
+    """
+    Run each page query once for a single row: opens the engine's first
+    pooled connection and puts the statements in its compiled cache,
+    which the first requests would otherwise pay for
+    """
+    segment_page(db, limit=1)
+    interaction_page(db, limit=1)
+    thread_segments(db, thread_page(db, limit=1)[1])
@@ -0,0 +1,153 @@
+from limits.storage import Storage
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from starlette.requests import Request
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from auth import KEY_STORE
+
+# Limits are counted per API key (by its hash), so clients behind the
+# same proxy no longer share one counter, and in a SQLite file every
+# uvicorn worker on the host increments, so 4 workers enforce the
+# configured limit rather than 4x it. RATE_LIMIT_STORAGE takes any
+# limits storage URI (memory://, redis://...); the default is a file
+# in /dev/shm where that exists, so counters never touch disk.
+#
+# Route decorators give the standard tier's quota; other tiers scale
+# it, and a key's own rate_limit in api_keys.json replaces it.
+
+_SHM = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+RATE_LIMIT_STORAGE = os.getenv("RATE_LIMIT_STORAGE", f"sqlite:///{_SHM}/ny-assembly-ratelimit.db")
+
+TIER_MULTIPLIERS = {
+    "demo": 0.5,
+    "standard": 1,
+    "partner": 5,
+    "admin": 10,
+}
+
+
+class SQLiteStorage(Storage):
+    """
+    Fixed-window counters in a SQLite file shared between processes.
+
+    incr() is a single upsert, which SQLite runs atomically under its
+    write lock, so concurrent workers never lose a hit. The URI follows
+    SQLAlchemy's: sqlite:///relative.db or sqlite:////absolute.db. The
+    file and table are created on the first hit, not when the limiter
+    is built at import.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str = None, wrap_exceptions: bool = False, **options):
+        self.path = uri.split('://', 1)[1][1:] if uri else ':memory:'
+        self._local = threading.local()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; FastAPI runs sync endpoints in a pool
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # Counters are disposable; a crash losing the last hits is fine
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS counters (key TEXT PRIMARY KEY, count INTEGER NOT NULL, expiry REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        """Count amount hits on key, starting a new window if the last one expired"""
+        now = time.time()
+        return self._connection().execute(
+            "INSERT INTO counters (key, count, expiry) VALUES (?1, ?2, ?3) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "count = CASE WHEN expiry <= ?4 THEN ?2 ELSE count + ?2 END, "
+            "expiry = CASE WHEN expiry <= ?4 THEN ?3 ELSE expiry END "
+            "RETURNING count",
+            (key, amount, now + expiry, now)
+        ).fetchone()[0]
+
+    def get(self, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT count FROM counters WHERE key = ? AND expiry > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._connection().execute(
+            "SELECT expiry FROM counters WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._connection().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        return self._connection().execute("DELETE FROM counters").rowcount
+
+    def clear(self, key: str) -> None:
+        self._connection().execute("DELETE FROM counters WHERE key = ?", (key,))
+
+    def expire(self) -> int:
+        """Drop expired windows; rows are otherwise only reused, never removed"""
+        return self._connection().execute(
+            "DELETE FROM counters WHERE expiry <= ?", (time.time(),)
+        ).rowcount
+
+
+def rate_limit_key(request: Request) -> str:
+    """The caller's API key hash, or its address on routes without a key"""
+    info = getattr(request.state, 'api_key', None)
+    if info is not None:
+        return f"key:{info.key_hash}"
+    return f"ip:{get_remote_address(request)}"
+
+
+def tier_limit(limit: str):
+    """
+    Limit provider for @limiter.limit: the standard-tier limit string
+    scaled for the caller's tier, or the key's own rate_limit.
+    """
+    count, period = limit.split('/', 1)
+    count = int(count)
+
+    def provider(key: str) -> str:
+        info = KEY_STORE.keys.get(key[4:]) if key.startswith('key:') else None
+        if info is None:
+            return limit
+        if info.rate_limit:
+            return info.rate_limit
+        multiplier = TIER_MULTIPLIERS.get(info.tier, 1)
+        return f"{max(1, int(count * multiplier))}/{period}"
+
+    return provider
+
+
+limiter = Limiter(key_func=rate_limit_key, storage_uri=RATE_LIMIT_STORAGE)
+
+
+if __name__ == '__main__':
+    # python ratelimit.py expire   drops expired counters from the shared file
+    import sys
+    from limits.storage import storage_from_string
+    storage = storage_from_string(RATE_LIMIT_STORAGE)
+    if sys.argv[1:] == ['expire'] and isinstance(storage, SQLiteStorage):
+        print(f"Removed {storage.expire()} expired counters from {storage.path}")
+    else:
+        print("Usage: python ratelimit.py expire   (with a sqlite:// RATE_LIMIT_STORAGE)")
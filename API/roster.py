@@ -0,0 +1,275 @@
+import json
+import os
+from collections import Counter
+
+# Session years start on odd years (2019, 2021, ...)
+def session_year_of(date: str) -> int:
+    """Session year for a transcript date like '6-16-25'"""
+    year = int(date.split('-')[-1])
+    if year < 100:
+        year += 2000
+    return year if year % 2 else year - 1
+
+
+def spoken_surname(name: str) -> str:
+    """
+    The surname of a roster name as it is spoken and printed on the floor.
+
+    'CARROLL R' -> 'CARROLL', "D'Urso" -> "D'URSO", 'De La Rosa' -> 'DE LA ROSA'
+    """
+    parts = name.upper().split()
+    # Trailing initials only disambiguate members with the same surname
+    while len(parts) > 1 and len(parts[-1]) <= 2:
+        parts.pop()
+    return ' '.join(parts)
+
+
+def surname_key(name: str) -> str:
+    """
+    Lookup key for a surname, so spellings with and without apostrophes
+    find the same member: "D'URSO" and 'DURSO' -> 'DURSO'.
+    """
+    return spoken_surname(name).replace("'", '')
+
+
+def initials_of(name: str) -> str:
+    """Trailing initials of a roster name ('MILLER MG' -> 'MG'), or ''"""
+    parts = name.upper().split()
+    return parts[-1] if len(parts) > 1 and len(parts[-1]) <= 2 else ''
+
+
+class Roster:
+    """
+    Immutable member roster with O(1) name resolution.
+
+    Rows are (member_id, name, district, session_year), as stored in the
+    members table. Name lookups are keyed by (surname, session_year);
+    members sharing a surname in a session are told apart by district or
+    initials when the caller has them, and otherwise resolve to None
+    rather than to whichever was loaded last.
+
+    Also serves the member listings: rows sorted by name, overall and
+    per session year and district, so /members never queries the table.
+    """
+
+    def __init__(self, rows):
+        self.rows = tuple(tuple(row) for row in rows)
+        self.by_id = {}
+        self.by_key = {}
+        self.sessions_by_surname = {}
+        self.spoken_names = {}
+
+        for row in self.rows:
+            member_id, name, district, session_year = row
+            self.by_id[member_id] = row
+            surname = surname_key(name)
+            self.by_key.setdefault((surname, session_year), []).append(row)
+            self.sessions_by_surname.setdefault(surname, set()).add(session_year)
+            self.spoken_names.setdefault(surname, spoken_surname(name))
+
+        # Latest session first, for members only listed under an earlier one
+        self.sessions_by_surname = {
+            surname: sorted(years, reverse=True)
+            for surname, years in self.sessions_by_surname.items()
+        }
+
+        # Listings in ORDER BY name order, ties by member ID
+        self.sorted_rows = tuple(sorted(self.rows, key=lambda row: (row[1] or '', row[0])))
+        by_session_year = {}
+        by_district = {}
+        for row in self.sorted_rows:
+            by_session_year.setdefault(row[3], []).append(row)
+            by_district.setdefault(row[2], []).append(row)
+        self.by_session_year = {year: tuple(rows) for year, rows in by_session_year.items()}
+        self.by_district = {district: tuple(rows) for district, rows in by_district.items()}
+
+    def __len__(self):
+        return len(self.rows)
+
+    # Loading and saving
+
+    @classmethod
+    def from_members_json(cls, path: str = 'members.json') -> 'Roster':
+        """Load from the legislation API dump written by download.ipynb"""
+        with open(path, 'r') as f:
+            members = json.load(f)
+
+        seen = {}
+        for m in members:
+            seen.setdefault(m['memberId'], (m['memberId'], m['shortName'], m['districtCode'], m['sessionYear']))
+        return cls(seen.values())
+
+    @classmethod
+    def from_db(cls, db) -> 'Roster':
+        """Load from the members table through a SQLAlchemy session or connection"""
+        from sqlalchemy import text
+        result = db.execute(text("SELECT member_id, name, district, session_year FROM members"))
+        return cls(result.all())
+
+    @classmethod
+    def load(cls, path: str) -> 'Roster':
+        """Load a roster written by save()"""
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def save(self, path: str):
+        """
+        Write the rows as compact JSON for fast startup. The file is
+        replaced in one step, so API processes watching it never read
+        half of it.
+        """
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.rows, f, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    # Lookups
+
+    def name_of(self, member_id) -> str:
+        row = self.by_id.get(member_id)
+        return row[1] if row else None
+
+    def get(self, member_id):
+        """Row for a member ID, or None"""
+        return self.by_id.get(member_id)
+
+    def members(self, session_year: int = None, district: int = None) -> tuple:
+        """Rows sorted by name, optionally only one session year and/or district"""
+        if session_year is None and district is None:
+            return self.sorted_rows
+        if district is None:
+            return self.by_session_year.get(session_year, ())
+        rows = self.by_district.get(district, ())
+        if session_year is None:
+            return rows
+        return tuple(row for row in rows if row[3] == session_year)
+
+    def candidates(self, name: str, session_year: int) -> list[tuple]:
+        """Members with this surname in the session, or in the latest earlier one"""
+        surname = surname_key(name)
+        rows = self.by_key.get((surname, session_year))
+        if rows:
+            return rows
+
+        for year in self.sessions_by_surname.get(surname, ()):
+            if year <= session_year:
+                return self.by_key[(surname, year)]
+        return []
+
+    def resolve(self, name: str, date: str, title: str = None, district: int = None, initials: str = None):
+        """
+        Member ID for a name as spoken on the floor, or None.
+
+        Args:
+            name: surname from a speaker header or address ('CARROLL')
+            date: transcript date ('6-16-25')
+            title: 'MR.', 'ACTING SPEAKER', ...; the clerk is never a member
+            district, initials: used only to pick between namesakes
+        """
+        if title == 'THE CLERK':
+            return None
+
+        rows = self.candidates(name, session_year_of(date))
+        if len(rows) > 1 and district is not None:
+            rows = [row for row in rows if row[2] == district]
+        if len(rows) > 1 and initials:
+            rows = [row for row in rows if initials_of(row[1]) == initials.upper()]
+
+        return rows[0][0] if len(rows) == 1 else None
+
+    def speakers(self, date: str) -> list[dict]:
+        """
+        Every member of the transcript's session as speaker entries
+        ({'name': "MR. O'DONNELL", 'member_id': ...} for each title), for
+        chunk_scripts.build_member_index. Names are spelled as in the
+        speeches, which print them with and without the apostrophe
+        ("Mr. O'Pharrow", "MR. DURSO"), so both spellings are listed.
+        Namesakes that cannot be told apart are left out.
+
+        The interaction patterns read one word after the title, so a
+        multi-word surname is also listed under its first word ("Ms.
+        Pheffer Amato" -> MS. PHEFFER) unless another member's name
+        starts with it (DE LA ROSA and DE LOS SANTOS).
+        """
+        names = {}
+        for surname in self.sessions_by_surname:
+            member_id = self.resolve(surname, date)
+            if member_id is not None:
+                names[self.spoken_names[surname]] = member_id
+
+        first_words = Counter(name.split()[0] for name in names)
+        for name, member_id in list(names.items()):
+            first = name.split()[0]
+            if first != name and first_words[first] == 1:
+                names[first] = member_id
+        for name, member_id in list(names.items()):
+            names.setdefault(name.replace("'", ''), member_id)
+
+        return [
+            {'name': f"{title} {name}", 'member_id': member_id}
+            for name, member_id in names.items()
+            for title in ('MR.', 'MRS.', 'MS.')
+        ]
+
+
+_roster = None
+_roster_mtime = None
+_roster_written = 0.0
+
+def get_roster(db=None) -> Roster:
+    """
+    Process-wide roster, loaded once.
+
+    Reads ROSTER_PATH when it points at a saved roster, otherwise the
+    members table through db. The ingest notebook rewrites ROSTER_PATH
+    after loading members; a changed modification time loads the new
+    roster on the next call. Without ROSTER_PATH, an ingest's
+    mark_written() reloads the roster from the primary, which has the
+    new rows before the replicas do.
+    """
+    from metrics import record_cache
+    global _roster, _roster_mtime, _roster_written
+    cached = _roster
+    path = os.getenv("ROSTER_PATH")
+    if path:
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime is not None and mtime != _roster_mtime:
+            _roster = Roster.load(path)
+            _roster_mtime = mtime
+    elif db is not None:
+        from database import SessionLocal, last_written
+        written = last_written()
+        if _roster is not None and written > _roster_written:
+            primary = SessionLocal()
+            try:
+                _roster = Roster.from_db(primary)
+            finally:
+                primary.close()
+        _roster_written = written
+
+    if _roster is None:
+        if db is None:
+            return Roster([])
+        _roster = Roster.from_db(db)
+    record_cache("roster", _roster is cached)
+    return _roster
+
+
+def reset_roster():
+    """Drop the process-wide roster so the next get_roster() reloads it"""
+    global _roster, _roster_mtime, _roster_written
+    _roster = None
+    _roster_mtime = None
+    _roster_written = 0.0
+
+
+if __name__ == '__main__':
+    # python roster.py members.json roster.json -> file for ROSTER_PATH
+    import sys
+    source, target = sys.argv[1:3]
+    roster = Roster.from_members_json(source)
+    roster.save(target)
+    print(f"Saved {len(roster)} members to {target}")
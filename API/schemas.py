@@ -1,65 +1,177 @@
 # schemas.py
-from pydantic import BaseModel
-from typing import List, Any, Optional, Generic, TypeVar
+"""
+Response models for the routes in main.py.
+
+Fields are snake_case here and camelCase in the JSON, through the alias
+generator. Routes declare these as response_model and return plain
+dicts keyed by the camelCase names, built from query row tuples: FastAPI
+validates the whole envelope in one pass in pydantic-core and writes the
+JSON with the model's compiled serializer, instead of walking the dicts
+with jsonable_encoder and json.dumps.
+"""
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+from typing import Annotated, Any, Generic, List, Optional, TypeVar, Union
 
 T = TypeVar('T')
 
-class APIResponse(BaseModel, Generic[T]):
+
+class APIModel(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+
+class NotFound(APIModel):
+    """The empty result of a lookup that found nothing"""
+    model_config = ConfigDict(extra='forbid')
+
+
+class APIResponse(APIModel, Generic[T]):
     success: bool
     message: str = ""
-    responseType: str
+    response_type: str
     total: int
-    offsetStart: int
-    offsetEnd: int
+    offset_start: int
+    offset_end: int
     limit: int
-    result: dict
-
-    class Config:
-        from_attributes = True
+    # Tried in order, so a found result is validated once
+    result: Annotated[Union[T, NotFound], Field(union_mode='left_to_right')]
 
 
-class ResultItems(BaseModel, Generic[T]):
+class ResultItems(APIModel, Generic[T]):
     items: List[T]
 
-    class Config:
-        from_attributes = True
 
-class MemberSchema(BaseModel):
-    member_id: int
-    name: str
-    district: Optional[int] = None
+# Members
+
+class MemberSchema(APIModel):
+    session_member_id: int
+    short_name: Optional[str] = None
     session_year: Optional[int] = None
-    
-    class Config:
-        from_attributes = True
+    district_code: Optional[int] = None
+    alternate: bool = False
+    member_id: int
+
 
-class TranscriptSchema(BaseModel):
+# Transcripts
+
+class TranscriptDateSchema(APIModel):
     date: str
-    text: str
-    
-    class Config:
-        from_attributes = True
 
-class TranscriptSegmentSchema(BaseModel):
+
+class TranscriptSchema(APIModel):
+    date: str
+    text: Optional[str] = None
+
+
+class TranscriptTocSchema(APIModel):
+    date: str
+    # chunk_scripts.table_of_contents
+    toc: dict[str, Any]
+
+
+# Segments
+
+class TranscriptSegmentSchema(APIModel):
     segment_id: int
     date: str
     sequence_number: int
     member_id: Optional[int] = None
-    text: str
+    text: Optional[str] = None
     member_name: Optional[str] = None
-    
-    class Config:
-        from_attributes = True
+    bill_number: Optional[str] = None
+
+
+class BillSegmentSchema(TranscriptSegmentSchema):
+    calendar_number: Optional[str] = None
+    rules_report_number: Optional[str] = None
+
+
+class SegmentContextSchema(APIModel):
+    segment_id: int
+    items: List[TranscriptSegmentSchema]
+
+
+# Interactions
 
-class ActivitySchema(BaseModel):
+class ActivitySchema(APIModel):
     activity_id: int
     date: str
-    segment_id: int
+    segment_id: Optional[int] = None
     member_from: Optional[int] = None
     member_to: Optional[int] = None
-    interaction: str
+    interaction_type: Optional[str] = None
     from_member_name: Optional[str] = None
     to_member_name: Optional[str] = None
-    
-    class Config:
-        from_attributes = True
\ No newline at end of file
+    sentiment: Optional[str] = None
+    bill_number: Optional[str] = None
+
+
+# Threads
+
+class ThreadSegmentSchema(APIModel):
+    segment_id: int
+    sequence_number: int
+    member_id: Optional[int] = None
+    member_name: Optional[str] = None
+    text: Optional[str] = None
+
+
+class DebateThreadSchema(APIModel):
+    thread_id: int
+    date: str
+    bill_number: Optional[str] = None
+    sponsor_id: int
+    sponsor_name: Optional[str] = None
+    questioner_id: int
+    questioner_name: Optional[str] = None
+    first_segment_id: int
+    last_segment_id: int
+    questions: int
+    answers: int
+    segments: List[ThreadSegmentSchema]
+
+
+# Stats
+
+class MemberSentimentSchema(APIModel):
+    """Counts per analytics.SENTIMENTS label, keyed by the label itself"""
+    member_id: int
+    neutral: int
+    agreement: int
+    disagreement: int
+    amendment_offer: int = Field(alias='amendment_offer')
+    total: int
+
+
+class DateSentimentSchema(APIModel):
+    date: str
+    neutral: int
+    agreement: int
+    disagreement: int
+    amendment_offer: int = Field(alias='amendment_offer')
+    total: int
+
+
+# Root
+
+class RootResponse(APIModel):
+    success: bool
+    message: str
+    version: str
+    authentication: str
+    endpoints: dict[str, str]
+
+
+MemberList = APIResponse[ResultItems[MemberSchema]]
+MemberResponse = APIResponse[MemberSchema]
+TranscriptList = APIResponse[ResultItems[TranscriptDateSchema]]
+TranscriptResponse = APIResponse[TranscriptSchema]
+TranscriptTocResponse = APIResponse[TranscriptTocSchema]
+SegmentList = APIResponse[ResultItems[TranscriptSegmentSchema]]
+SegmentResponse = APIResponse[TranscriptSegmentSchema]
+SegmentContextResponse = APIResponse[SegmentContextSchema]
+BillSegmentList = APIResponse[ResultItems[BillSegmentSchema]]
+ActivityList = APIResponse[ResultItems[ActivitySchema]]
+ActivityResponse = APIResponse[ActivitySchema]
+DebateThreadList = APIResponse[ResultItems[DebateThreadSchema]]
+SentimentList = APIResponse[Union[ResultItems[MemberSentimentSchema], ResultItems[DateSentimentSchema]]]
@@ -0,0 +1,52 @@
+from sqlalchemy import case, func
+
+from model import Transcript, TranscriptSegment
+from transcript_store import get_store
+
+from chunk_scripts import clean_speech_text
+
+# Segments ingested with STORE_SEGMENT_TEXT off keep only (text_start,
+# text_end), character offsets of the raw speech in transcripts.text.
+# Their text is sliced out by the database, or out of the transcript
+# store when transcripts.text has moved there, and cleaned when served.
+#
+# On PostgreSQL, substr() on a compressed TOAST value has to decompress
+# the whole transcript. Storing it uncompressed lets it fetch only the
+# slice:
+#   ALTER TABLE transcripts ALTER COLUMN text SET STORAGE EXTERNAL;
+
+
+def raw_text_column():
+    """
+    Raw speech for segments stored as offsets, NULL for those with text.
+
+    Needs Transcript joined on TranscriptSegment.date.
+    """
+    return case(
+        (
+            TranscriptSegment.text.is_(None),
+            func.substr(
+                Transcript.text,
+                TranscriptSegment.text_start + 1,
+                TranscriptSegment.text_end - TranscriptSegment.text_start
+            )
+        ),
+        else_=None
+    ).label('raw_text')
+
+
+def segment_text(segment, raw_text):
+    """
+    Stored segment text, or the cleaned slice when only offsets are
+    stored. segment is a TranscriptSegment or a row of queries.SEGMENT_COLUMNS.
+    """
+    if segment.text is not None:
+        return segment.text
+    if raw_text is None:
+        store = get_store()
+        if store is None or segment.text_start is None:
+            return None
+        raw_text = store.text(segment.date, segment.text_start, segment.text_end)
+        if raw_text is None:
+            return None
+    return clean_speech_text(raw_text)
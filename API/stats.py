@@ -0,0 +1,43 @@
+from sqlalchemy import func, select
+
+from model import TranscriptSegment
+
+from chunk_scripts import SENTIMENTS
+
+segments = TranscriptSegment.__table__
+
+
+def sentiment_counts(db, by: str, date: str = None, member_id: int = None) -> dict:
+    """
+    {member ID or date: {label: count}} of the stored segment labels, in
+    one GROUP BY. Segments are labelled at ingest, and older ones by
+    backfill_segments.py; any still without a label are left out.
+    """
+    key = segments.c.date if by == "date" else segments.c.member_id
+    conditions = [segments.c.sentiment.in_(SENTIMENTS), key.isnot(None)]
+    if date:
+        conditions.append(segments.c.date == date)
+    if member_id:
+        conditions.append(segments.c.member_id == member_id)
+
+    statement = select(key, segments.c.sentiment, func.count())\
+        .where(*conditions)\
+        .group_by(key, segments.c.sentiment)
+    counts = {}
+    for value, label, count in db.connection().execute(statement):
+        counts.setdefault(value, dict.fromkeys(SENTIMENTS, 0))[label] = count
+    return counts
+
+
+def sentiment_items(db, by: str, date: str = None, member_id: int = None) -> list[dict]:
+    """Sentiment counts per member or per date, in key order"""
+    key_name = "date" if by == "date" else "memberId"
+    counts = sentiment_counts(db, by, date, member_id)
+
+    items = []
+    for value in sorted(counts):
+        item = {key_name: value}
+        item.update(counts[value])
+        item["total"] = sum(counts[value].values())
+        items.append(item)
+    return items
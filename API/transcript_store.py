@@ -0,0 +1,227 @@
+import codecs
+import json
+import mmap
+import os
+import threading
+
+# Transcripts as one append-only file of UTF-8 text plus an index of
+# where each date's text starts. The transcripts table stays the catalog
+# of dates; with the store configured its text column can be left NULL
+# and readers share one page-cached mmap instead of pulling every
+# transcript through the database driver.
+#
+#   transcripts.dat  text of every transcript, back to back
+#   transcripts.idx  one JSON line per append: [date, offset, length, chars]
+#
+# offset and length are in bytes, chars is the length in characters.
+# Appending a date again supersedes the earlier copy; the old bytes stay
+# in the data file until it is rewritten.
+
+CHUNK_SIZE = 64 * 1024
+
+
+class TranscriptStore:
+    """
+    Append-only transcript file, read through mmap.
+
+    Readers pick up appends from other processes (the ingest notebook)
+    on their next lookup, at the cost of a stat() of the index file.
+    Refreshes are serialized, and each one maps the data file before it
+    publishes the index entries that point into it, so a thread that
+    finds an entry also finds a mapping that holds its bytes.
+    """
+
+    def __init__(self, path: str):
+        self.data_path = path + '.dat'
+        self.index_path = path + '.idx'
+        self.index = {}
+        self._index_size = 0
+        self._map = None
+        self._map_size = 0
+        self._lock = threading.Lock()
+
+    def __contains__(self, date: str) -> bool:
+        return self.entry(date) is not None
+
+    def __len__(self):
+        self.refresh()
+        return len(self.index)
+
+    # Writing
+
+    def append(self, date: str, text: str) -> tuple:
+        """Write a transcript to the end of the store and index it"""
+        data = text.encode('utf-8')
+        with open(self.data_path, 'ab') as f:
+            offset = f.tell()
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Index after the data is on disk, so readers never see a
+        # partial transcript
+        entry = (offset, len(data), len(text))
+        with open(self.index_path, 'a') as f:
+            f.write(json.dumps([date, *entry]) + '\n')
+        self.refresh()
+        return entry
+
+    # Reading
+
+    def refresh(self):
+        """Read index lines and data appended since the last refresh"""
+        try:
+            size = os.path.getsize(self.index_path)
+        except FileNotFoundError:
+            return
+        if size == self._index_size:
+            return
+        with self._lock:
+            self._refresh()
+
+    def _refresh(self):
+        try:
+            size = os.path.getsize(self.index_path)
+            data_size = os.path.getsize(self.data_path)
+        except FileNotFoundError:
+            return
+        if size == self._index_size:
+            return  # another thread got here first
+
+        index, index_size = dict(self.index), self._index_size
+        if size < index_size:
+            # Store rewritten; read it from the start
+            index, index_size = {}, 0
+            self._map_size = 0
+        with open(self.index_path, 'r') as f:
+            f.seek(index_size)
+            for line in f:
+                if not line.endswith('\n'):
+                    break  # an append still being written
+                date, *entry = json.loads(line)
+                if entry[0] + entry[1] > data_size:
+                    break  # data written after the size was read; next refresh
+                index[date] = tuple(entry)
+                index_size += len(line.encode('utf-8'))
+
+        # Map first, then publish the entries; views already handed out
+        # keep the old mapping alive
+        if data_size and data_size != self._map_size:
+            with open(self.data_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._map_size = data_size
+        self.index = index
+        self._index_size = index_size
+
+    def entry(self, date: str):
+        """(offset, length, chars) for a date, or None"""
+        self.refresh()
+        return self.index.get(date)
+
+    def view(self, date: str, start: int = None, end: int = None) -> memoryview:
+        """
+        Zero-copy view of a transcript's UTF-8 bytes, or None.
+
+        start and end are character offsets, like the segment offsets
+        stored by the ingest notebook.
+        """
+        entry = self.entry(date)
+        # Read after the entry, so it is the mapping the entry was published with
+        data = self._map
+        if entry is None or data is None:
+            return None
+        offset, length, chars = entry
+        if offset + length > len(data):
+            return None
+        view = memoryview(data)[offset:offset + length]
+        if start is None and end is None:
+            return view
+
+        start = 0 if start is None else start
+        end = chars if end is None else end
+        if length == chars:
+            # ASCII, so characters and bytes line up
+            return view[start:end]
+        text = str(view, 'utf-8')
+        return memoryview(text[start:end].encode('utf-8'))
+
+    def text(self, date: str, start: int = None, end: int = None) -> str:
+        """Transcript text, or the characters start:end of it, or None"""
+        view = self.view(date, start, end)
+        return None if view is None else str(view, 'utf-8')
+
+    def iter_bytes(self, date: str, start: int = None, end: int = None, chunk_size: int = CHUNK_SIZE):
+        """Yield a transcript's bytes in chunks, as slices of the mapping"""
+        view = self.view(date, start, end)
+        if view is None:
+            return
+        for i in range(0, len(view), chunk_size):
+            yield view[i:i + chunk_size]
+
+
+def stream_json(envelope: dict, view: memoryview, chunk_size: int = CHUNK_SIZE):
+    """
+    Yield envelope as JSON, with its result text read from view.
+
+    envelope['result']['text'] is a placeholder; the bytes are the same
+    as the JSONResponse for the envelope holding the full text, without
+    building that string.
+    """
+    marker = '\x00transcript\x00'
+    envelope['result']['text'] = marker
+    encoded = json.dumps(envelope, ensure_ascii=False, separators=(',', ':'))
+    prefix, suffix = encoded.split(json.dumps(marker))
+
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    yield (prefix + '"').encode('utf-8')
+    for i in range(0, len(view), chunk_size):
+        text = decoder.decode(view[i:i + chunk_size])
+        yield json.dumps(text, ensure_ascii=False)[1:-1].encode('utf-8')
+    yield ('"' + suffix).encode('utf-8')
+
+
+_store = None
+
+def get_store():
+    """
+    Process-wide transcript store, or None when TRANSCRIPT_STORE is not
+    set. TRANSCRIPT_STORE is the path without the .dat/.idx suffix.
+    """
+    global _store
+    if _store is None:
+        path = os.getenv("TRANSCRIPT_STORE")
+        if not path:
+            return None
+        _store = TranscriptStore(path)
+    return _store
+
+
+if __name__ == '__main__':
+    # python transcript_store.py transcripts [--drop-text]
+    #   copies transcripts.text into the store for TRANSCRIPT_STORE, and
+    #   with --drop-text clears the column once a date is stored
+    import sys
+    from database import SessionLocal, mark_written
+    from model import Transcript
+
+    path = sys.argv[1]
+    drop_text = '--drop-text' in sys.argv[2:]
+    store = TranscriptStore(path)
+    store.refresh()
+
+    db = SessionLocal()
+    try:
+        dates = [date for (date,) in db.query(Transcript.date).filter(Transcript.text.isnot(None))]
+        for date in dates:
+            transcript = db.get(Transcript, date)
+            if date not in store.index:
+                store.append(date, transcript.text)
+            if drop_text:
+                transcript.text = None
+            db.commit()
+            db.expunge(transcript)
+    finally:
+        db.close()
+    if drop_text:
+        mark_written()
+    print(f"Stored {len(store)} transcripts in {store.data_path}")
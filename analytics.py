@@ -0,0 +1,61 @@
+import numpy as np
+
+from chunk_scripts import PATTERNS, SCAN_KINDS, SENTIMENT_KINDS, SENTIMENTS
+
+# Batch versions of the per-speech pattern checks, for whole sessions of
+# segments at a time. Texts go through the regex engine once each, with
+# one of the combined scans from chunk_scripts; everything after that is
+# array arithmetic over the hit counts.
+
+# Codes of the chunk_scripts.SENTIMENTS labels, as stored in the label arrays
+SENTIMENT_CODES = {label: code for code, label in enumerate(SENTIMENTS)}
+
+
+def pattern_counts(texts, kinds: tuple = SCAN_KINDS) -> np.ndarray:
+    """
+    Hits of each pattern in every text.
+
+    Args:
+        kinds: SCAN_KINDS (every interaction and sentiment pattern) or
+            SENTIMENT_KINDS, which skips the address scan
+
+    Returns:
+        int32 array of shape (len(texts), len(kinds)); column j of row i
+        is len(PATTERNS[kinds[j]].findall(texts[i]))
+    """
+    scan = PATTERNS['sentiment_scan' if kinds == SENTIMENT_KINDS else 'interaction_scan']
+    columns = {kind: j for j, kind in enumerate(kinds)}
+    counts = np.zeros((len(texts), len(kinds)), dtype=np.int32)
+
+    for i, text in enumerate(texts):
+        row = [0] * len(kinds)
+        # findall on one pattern never returns overlapping matches
+        ends = [0] * len(kinds)
+        for match in scan.finditer(text):
+            kind = match.lastgroup
+            j = columns[kind]
+            if match.start() >= ends[j]:
+                row[j] += 1
+                ends[j] = match.end(kind)
+        counts[i] = row
+
+    return counts
+
+
+def sentiment_codes(counts: np.ndarray, kinds: tuple = SCAN_KINDS) -> np.ndarray:
+    """uint8 SENTIMENTS code per row of pattern_counts, in analyze_sentiment's priority order"""
+    def hit(kind):
+        return counts[:, kinds.index(kind)] > 0
+
+    return np.select(
+        [hit('amendment_offer'), hit('disagreement'), hit('agreement')],
+        [SENTIMENT_CODES['amendment_offer'], SENTIMENT_CODES['disagreement'], SENTIMENT_CODES['agreement']],
+        default=SENTIMENT_CODES['neutral']
+    ).astype(np.uint8)
+
+
+def analyze_sentiments(texts) -> np.ndarray:
+    """analyze_sentiment for every text, as an array of labels"""
+    codes = sentiment_codes(pattern_counts(texts, SENTIMENT_KINDS), SENTIMENT_KINDS)
+    return np.array(SENTIMENTS, dtype=object)[codes]
+
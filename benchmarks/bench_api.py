@@ -0,0 +1,131 @@
+"""
+API load test.
+
+Generates a synthetic database (see synthetic.py), then sends requests
+to every endpoint in API/main.py through the ASGI app in process and
+reports latency percentiles per endpoint. Rate limiting stays on, with
+a key whose own limit is high enough never to trip, so its cost is
+included.
+
+Usage: python benchmarks/bench_api.py [requests per endpoint]
+"""
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+
+from common import ROOT
+from synthetic import generate
+
+BENCH_KEY = 'bench'
+
+
+def endpoints(data: dict) -> list[tuple[str, str, dict]]:
+    """(label, path, params) for every route, with keys taken from the generated data"""
+    date = data['dates'][len(data['dates']) // 2]
+    member_id = data['member_ids'][len(data['member_ids']) // 2]
+    middle = data['segments'] // 2 or 1
+    return [
+        ('root', '/', {}),
+        ('members', '/members', {}),
+        ('members session', '/members', {'session_year': 2025}),
+        ('member', f'/members/{member_id}', {}),
+        ('transcripts', '/transcripts', {}),
+        ('transcript', f'/transcripts/{date}', {}),
+        ('transcript text range', f'/transcripts/{date}', {'start': 1000, 'end': 5000, 'format': 'text'}),
+        ('transcript toc', f'/transcripts/{date}/toc', {}),
+        ('segments', '/segments', {}),
+        ('segments by date', '/segments', {'date': date}),
+        ('segments by member', '/segments', {'member_id': member_id}),
+        ('segments by sequence', '/segments', {'date': date, 'from_seq': 100, 'to_seq': 150}),
+        ('segment', f'/segments/{middle}', {}),
+        ('segment context', f'/segments/{middle}/context', {'before': 5, 'after': 5}),
+        ('interactions', '/interactions', {}),
+        ('interactions by member', '/interactions', {'member_id': member_id}),
+        ('interaction', '/interactions/1', {}),
+        ('bill segments', f"/bills/{data['bills'][0]}/segments", {}),
+        ('threads', '/threads', {}),
+        ('threads by date', '/threads', {'date': date}),
+        ('threads by member', '/threads', {'member_id': member_id}),
+        ('sentiment by member', '/stats/sentiment', {}),
+        ('sentiment by date', '/stats/sentiment', {'by': 'date'}),
+        ('metrics', '/metrics', {}),
+    ]
+
+
+def client(db_path: str, directory: str):
+    """TestClient for main.app on db_path; main reads its settings from the environment on import"""
+    keys_path = os.path.join(directory, 'api_keys.json')
+    with open(keys_path, 'w') as f:
+        json.dump({BENCH_KEY: {"hash": hashlib.sha256(BENCH_KEY.encode()).hexdigest(),
+                               "tier": "admin", "rate_limit": "1000000/minute"}}, f)
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{db_path}",
+        API_KEYS_PATH=keys_path,
+        RATE_LIMIT_STORAGE=f"sqlite:///{os.path.join(directory, 'ratelimit.db')}",
+    )
+    for name in ('ROSTER_PATH', 'TRANSCRIPT_STORE', 'SLOW_REQUEST_MS', 'SERVER_TIMING', 'PROMETHEUS_MULTIPROC_DIR'):
+        os.environ.pop(name, None)
+
+    sys.path.insert(0, os.path.join(ROOT, 'API'))
+    from fastapi.testclient import TestClient
+    import main
+    return TestClient(main.app)
+
+
+def percentile(ordered: list[float], fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def load_test(data: dict, db_path: str, directory: str, requests: int = 50, rounds: int = 5) -> dict:
+    """
+    {label: {p50_ms, p95_ms, mean_ms, bytes}} for every endpoint. The
+    requests are sent in rounds over all endpoints rather than one
+    endpoint at a time, so a machine slowing down mid-run does not land
+    on whichever endpoints came last.
+    """
+    cases = endpoints(data)
+    timings = {label: [] for label, _, _ in cases}
+    sizes = {}
+    with client(db_path, directory) as api:
+        for label, path, params in cases:
+            response = api.get(path, params=dict(params, key=BENCH_KEY))  # warm up
+            if response.status_code != 200:
+                raise SystemExit(f"{label}: {path} returned {response.status_code} {response.text[:200]}")
+            sizes[label] = len(response.content)
+
+        for round_number in range(rounds):
+            count = requests // rounds + (round_number < requests % rounds)
+            for label, path, params in cases:
+                params = dict(params, key=BENCH_KEY)
+                for _ in range(count):
+                    start = time.perf_counter()
+                    api.get(path, params=params)
+                    timings[label].append(time.perf_counter() - start)
+
+    results = {}
+    for label, values in timings.items():
+        values.sort()
+        results[label] = {
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'mean_ms': sum(values) / len(values) * 1000,
+            'bytes': sizes[label],
+        }
+    return results
+
+
+def main(requests: str = '50'):
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'synthetic.db')
+        data = generate(db_path)
+        print(f"{data['sessions']} sessions, {data['segments']} segments, {data['interactions']} interactions")
+        for label, result in load_test(data, db_path, directory, int(requests)).items():
+            print(f"{label:>22}: p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms"
+                  f"  {result['bytes']:9,d} bytes")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
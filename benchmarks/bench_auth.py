@@ -0,0 +1,65 @@
+"""
+API key verification benchmark.
+
+Checks that KeyStore accepts the keys in a hashed api_keys.json, rejects
+others, and picks up added and revoked keys after the reload interval
+without a restart, then compares the per-request cost of verify()
+against the raw-key set lookup auth.py used before.
+
+Usage: python benchmarks/bench_auth.py [keys]
+"""
+import json
+import os
+import secrets
+import sys
+import tempfile
+import timeit
+
+from common import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'API'))
+os.environ.setdefault('API_KEYS_PATH', os.devnull)
+from auth import KeyStore, hash_key
+
+
+def write_keys(path, keys):
+    data = {f"key_{i}": {"hash": hash_key(key), "tier": "standard"} for i, key in enumerate(keys)}
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def main(count: str = '1000', repeat: int = 5, number: int = 100000):
+    keys = [secrets.token_urlsafe(32) for _ in range(int(count))]
+    unknown = secrets.token_urlsafe(32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'api_keys.json')
+        write_keys(path, keys)
+        store = KeyStore(path, reload_interval=0.0)
+
+        if not all(store.verify(key) for key in keys) or store.verify(unknown):
+            raise SystemExit("Wrong keys accepted")
+
+        # Add one key and revoke another; the next check reloads the file
+        write_keys(path, keys[1:] + [unknown])
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+        if not store.verify(unknown) or store.verify(keys[0]):
+            raise SystemExit("Key file change not picked up")
+        print(f"{count} keys - verified, reload ok")
+
+        # Per-request cost at the default interval: no stat, one hash
+        store = KeyStore(path)
+        raw_keys = set(keys)
+        key = keys[len(keys) // 2]
+        cases = [
+            ('raw set', lambda: key in raw_keys),
+            ('KeyStore', lambda: store.verify(key)),
+            ('stat only', lambda: os.stat(path)),  # what checking the file per request would add
+        ]
+        for label, func in cases:
+            best = min(timeit.repeat(func, repeat=repeat, number=number)) / number
+            print(f"{label:>9}: {best * 1e9:8.0f} ns/request")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,65 @@
+"""
+clean_speech_text micro-benchmark.
+
+Compares clean_speech_text() with the original five-pass version on
+random strings built from the characters the passes react to (a seeded
+property check) and on every fixture segment, then times both.
+
+Usage: python benchmarks/bench_clean.py [transcripts.json] [cases]
+"""
+import random
+import re
+import sys
+import timeit
+
+from common import FIXTURE, load_transcripts
+from chunk_scripts import clean_speech_text, split_speakers
+
+# Fragments that exercise every pass and the interactions between them
+FRAGMENTS = [
+    '\n', '\n', '\n', '1', '23', '4567', '8', 'a', 'to', 'X', ' ', '  ', '   ', '\t',
+    'NYS ASSEMBLY', 'JUNE', ' 11,', ' 2025',
+]
+
+
+def reference_clean(text: str) -> str:
+    """clean_speech_text as originally written, one re.sub per step"""
+    text = re.sub(
+        r'\n?NYS ASSEMBLY\s+[A-Z]+\s+\d{1,2},\s+\d{4}\s*\n?',
+        '\n',
+        text
+    )
+    text = re.sub(r'\n\d{1,4}\n', '\n', text)
+    text = re.sub(r'\n\d{1,3}([a-z])', r'\n\1', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+    return text.strip()
+
+
+def check_random(cases: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(cases):
+        text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 20)))
+        if clean_speech_text(text) != reference_clean(text):
+            raise SystemExit(f"Mismatch on {text!r}")
+    print(f"{cases} random strings - identical")
+
+
+def main(path: str = FIXTURE, cases: str = '200000', repeat: int = 5, number: int = 3):
+    check_random(int(cases))
+    
+    transcripts = load_transcripts(path)
+    
+    segments = [content for text in transcripts.values() for _, _, content in split_speakers(text)]
+    for content in segments:
+        if clean_speech_text(content) != reference_clean(content):
+            raise SystemExit(f"Mismatch on fixture segment {content[:60]!r}")
+    print(f"{len(segments)} fixture segments - identical")
+    
+    for label, func in [('five-pass', reference_clean), ('clean_speech_text', clean_speech_text)]:
+        best = min(timeit.repeat(lambda: [func(s) for s in segments], repeat=repeat, number=number)) / number
+        print(f"{label:>18}: {best * 1000:8.2f} ms/pass  {best / len(segments) * 1e6:6.2f} us/segment")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:3])
@@ -0,0 +1,164 @@
+"""
+extract_interactions benchmark.
+
+Runs extract_interactions over one long synthetic session made by
+concatenating the fixture transcripts (repeated to reach thousands of
+speeches) and compares it with the original implementation, which
+scanned the member set per yield question and the whole interaction
+list per match.
+
+Usage: python benchmarks/bench_interactions.py [max speeches]
+"""
+import re
+import sys
+import time
+
+from common import fixture_speaker_data
+from chunk_scripts import PATTERNS, analyze_sentiment, build_member_index, extract_interactions
+
+
+def find_sponsor_from_context(speaker_data: list[dict], current_idx: int) -> tuple:
+    """
+    The original "the sponsor" lookup: walk back up to five speeches per
+    question. It stops short of the first speech of a session, which
+    extract_interactions does not (test/test_interactions.py covers that
+    change); the sessions here open with the presiding officer, so the
+    results still match.
+    """
+    for i in range(current_idx - 1, max(0, current_idx - 6), -1):
+        entry = speaker_data[i]
+        name = entry['name'].upper().strip()
+        if entry.get('member_id') is None or 'ACTING SPEAKER' in name or 'CLERK' in name:
+            continue
+        return (name, entry['member_id'])
+    return (None, None)
+
+
+def reference_extract_interactions(speaker_data: list[dict]) -> list[dict]:
+    """extract_interactions before the member index, de-duplication set and sponsor tracking"""
+    interactions = []
+    member_name_set = set()
+    member_name_to_id = {}
+    for entry in speaker_data:
+        name = entry['name'].upper().strip()
+        if entry.get('member_id') is not None:
+            member_name_set.add(name)
+            member_name_to_id[name] = entry['member_id']
+    
+    def matching_member(last_name):
+        for full_name in member_name_set:
+            if full_name.endswith(last_name):
+                return full_name
+        return None
+    
+    def add(from_id, from_name, to_id, to_name, kind, sentiment, snippet, entry):
+        interactions.append({
+            'from_member_id': from_id, 'from_member_name': from_name,
+            'to_member_id': to_id, 'to_member_name': to_name,
+            'interaction_type': kind, 'sentiment': sentiment, 'text_snippet': snippet,
+            'date': entry['date'], 'sequence': entry['sequence']
+        })
+    
+    def duplicate(from_id, to_id, sequence):
+        return any(
+            i['from_member_id'] == from_id and i['to_member_id'] == to_id and i['sequence'] == sequence
+            for i in interactions
+        )
+    
+    for idx, entry in enumerate(speaker_data):
+        from_name = entry['name'].upper().strip()
+        from_id = entry.get('member_id')
+        text = entry['text']
+        if from_id is None or 'ACTING SPEAKER' in from_name or 'CLERK' in from_name:
+            continue
+        sentiment = analyze_sentiment(text)
+        
+        m = PATTERNS['yield_question'].search(text)
+        if m:
+            if m.group(1):
+                to_name = matching_member(m.group(1).upper())
+                to_id = member_name_to_id.get(to_name)
+            else:
+                to_name, to_id = find_sponsor_from_context(speaker_data, idx)
+            if to_name and to_id and to_id != from_id:
+                add(from_id, from_name, to_id, to_name, 'question', sentiment, m.group(0), entry)
+        
+        for m in PATTERNS['direct_address'].finditer(text):
+            to_name = re.sub(r'\s+', ' ', m.group(1).upper().strip())
+            to_id = member_name_to_id.get(to_name)
+            if to_name in member_name_set and to_id and to_id != from_id:
+                if not duplicate(from_id, to_id, entry['sequence']):
+                    add(from_id, from_name, to_id, to_name, 'address', sentiment, m.group(0), entry)
+                break
+        
+        m = PATTERNS['thank_response'].search(text)
+        if m:
+            to_name = re.sub(r'\s+', ' ', m.group(1).upper().strip())
+            to_id = member_name_to_id.get(to_name)
+            if to_name in member_name_set and to_id and to_id != from_id:
+                if not duplicate(from_id, to_id, entry['sequence']):
+                    add(from_id, from_name, to_id, to_name, 'response', sentiment, m.group(0), entry)
+    
+    return interactions
+
+
+def session_of(speaker_data: list[dict], size: int) -> list[dict]:
+    """One session of `size` speeches, cycling through the fixture speeches"""
+    return [
+        dict(speaker_data[i % len(speaker_data)], date='bench', sequence=i)
+        for i in range(size)
+    ]
+
+
+def dense_session(size: int, roster: int = 150) -> list[dict]:
+    """Short debate speeches that all question and thank other members"""
+    names = [''.join(chr(ord('A') + int(d)) for d in f"{i:03d}") for i in range(roster)]
+    return [
+        {
+            'name': f"MR. {names[i % roster]}",
+            'member_id': i % roster + 1,
+            'text': f"Will Mr. {names[(i + 1) % roster]} yield? Thank you, Mr. {names[(i + 2) % roster]}.",
+            'date': 'bench',
+            'sequence': i
+        }
+        for i in range(size)
+    ]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(max_speeches: str = '8000'):
+    speaker_data = fixture_speaker_data()
+    
+    for label, make_session in [
+        ('fixture speeches', lambda size: session_of(speaker_data, size)),
+        ('dense debate', dense_session),
+    ]:
+        print(label)
+        size = 1000
+        while size <= int(max_speeches):
+            session = make_session(size)
+            
+            expected, reference_time = timed(reference_extract_interactions, session)
+            actual, indexed_time = timed(extract_interactions, session)
+            # The reference predates bill_number
+            if expected != [{k: v for k, v in i.items() if k != 'bill_number'} for i in actual]:
+                raise SystemExit(f"Mismatch at {size} speeches: {len(expected)} vs {len(actual)} interactions")
+            
+            # The index is reusable, so repeated runs skip building it
+            mem_table = build_member_index(session)
+            _, reused_time = timed(extract_interactions, session, mem_table)
+            
+            print(f"{size:>6} speeches, {len(actual):>5} interactions: "
+                  f"original {reference_time * 1000:8.1f} ms  "
+                  f"indexed {indexed_time * 1000:7.1f} ms  "
+                  f"prebuilt index {reused_time * 1000:7.1f} ms")
+            size *= 2
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
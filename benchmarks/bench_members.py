@@ -0,0 +1,98 @@
+"""
+Member lookup benchmark.
+
+Loads members.json into a temporary SQLite members table, checks that
+the roster listings match the ORDER BY name queries /members used to
+run (with and without session year and district filters) and that a
+rewritten ROSTER_PATH file is picked up, then compares latency per
+lookup.
+
+Usage: python benchmarks/bench_members.py [repeat]
+"""
+import os
+import sys
+import tempfile
+import timeit
+
+from common import MEMBERS, ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'API'))
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import roster as roster_module
+from model import Base, Member
+from roster import Roster
+
+FILTERS = [(None, None), (2025, None), (None, 59), (2023, 113), (2019, None)]
+
+
+def query_members(db, session_year=None, district=None, limit=400, offset=0):
+    """What /members ran before the roster"""
+    query = db.query(Member)
+    if session_year:
+        query = query.filter(Member.session_year == session_year)
+    if district:
+        query = query.filter(Member.district == district)
+    total = query.count()
+    members = query.order_by(Member.name, Member.member_id).limit(limit).offset(offset).all()
+    return total, [(m.member_id, m.name, m.district, m.session_year) for m in members]
+
+
+def roster_members(roster, session_year=None, district=None, limit=400, offset=0):
+    members = roster.members(session_year, district)
+    return len(members), list(members[offset:offset + limit])
+
+
+def check_reload(roster, directory):
+    path = os.path.join(directory, 'roster.json')
+    os.environ['ROSTER_PATH'] = path
+    roster_module.reset_roster()
+
+    Roster(roster.rows[:10]).save(path)
+    if len(roster_module.get_roster()) != 10:
+        raise SystemExit("Saved roster not loaded")
+
+    # Ingest rewrites the file; the next call sees the new one
+    roster.save(path)
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 1))
+    if len(roster_module.get_roster()) != len(roster):
+        raise SystemExit("Rewritten roster not reloaded")
+
+    del os.environ['ROSTER_PATH']
+    roster_module.reset_roster()
+
+
+def main(repeat: str = '5', number: int = 200):
+    roster = Roster.from_members_json(MEMBERS)
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'members.db')}")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        db.add_all(Member(member_id=row[0], name=row[1], district=row[2], session_year=row[3]) for row in roster.rows)
+        db.commit()
+
+        for session_year, district in FILTERS:
+            if query_members(db, session_year, district) != roster_members(roster, session_year, district):
+                raise SystemExit(f"Mismatch for session_year={session_year} district={district}")
+        print(f"{len(FILTERS)} member listings - identical")
+
+        check_reload(roster, directory)
+        print("roster file reload - ok")
+
+        cases = [
+            ('list all', lambda: query_members(db), lambda: roster_members(roster)),
+            ('list 2025', lambda: query_members(db, 2025), lambda: roster_members(roster, 2025)),
+            ('by id', lambda: db.query(Member).filter(Member.member_id == 1105).first(), lambda: roster.get(1105)),
+        ]
+        for label, query, cached in cases:
+            db_time = min(timeit.repeat(query, repeat=int(repeat), number=number)) / number
+            roster_time = min(timeit.repeat(cached, repeat=int(repeat), number=number)) / number
+            print(f"{label:>10}: database {db_time * 1e6:9.1f} us  roster {roster_time * 1e6:7.1f} us"
+                  f"  ({db_time / roster_time:,.0f}x)")
+        db.close()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
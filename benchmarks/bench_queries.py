@@ -0,0 +1,131 @@
+"""
+List endpoint query benchmark.
+
+Fetches a page of /segments and of /interactions from a synthetic
+database (see synthetic.py) three ways:
+
+  entities     db.query(TranscriptSegment), as the routes first did
+  orm columns  db.query(*SEGMENT_COLUMNS), still through the ORM Query
+  core         queries.segment_page: a Core select() on the connection
+
+Checks that all three give the same values, then reports CPU time per
+page (count and page queries, as the routes run them) and the memory
+allocated while fetching it and still held by the rows.
+
+Usage: python benchmarks/bench_queries.py [rows per page]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import ROOT
+from synthetic import generate
+
+sys.path.insert(0, os.path.join(ROOT, 'API'))
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+import queries
+from model import Activity, Transcript, TranscriptSegment
+from segment_text import raw_text_column
+
+
+def segment_entities(db, rows: int):
+    query = db.query(TranscriptSegment)
+    total = query.count()
+    page = query.outerjoin(Transcript, TranscriptSegment.date == Transcript.date)\
+        .add_columns(raw_text_column())\
+        .order_by(TranscriptSegment.date, TranscriptSegment.sequence_number).limit(rows).all()
+    return total, page
+
+
+def segment_orm_columns(db, rows: int):
+    query = db.query(*queries.SEGMENT_COLUMNS)
+    total = query.count()
+    page = query.outerjoin(Transcript, TranscriptSegment.date == Transcript.date)\
+        .add_columns(raw_text_column())\
+        .order_by(TranscriptSegment.date, TranscriptSegment.sequence_number).limit(rows).all()
+    return total, page
+
+
+def segment_core(db, rows: int):
+    return queries.segment_page(db, limit=rows)
+
+
+def interaction_entities(db, rows: int):
+    query = db.query(Activity)
+    return query.count(), query.order_by(Activity.date, Activity.segment_id).limit(rows).all()
+
+
+def interaction_orm_columns(db, rows: int):
+    query = db.query(*queries.ACTIVITY_COLUMNS)
+    return query.count(), query.order_by(Activity.date, Activity.segment_id).limit(rows).all()
+
+
+def interaction_core(db, rows: int):
+    return queries.interaction_page(db, limit=rows)
+
+
+def segment_values(page) -> list:
+    # Entity pages are (segment, raw_text) rows
+    return [
+        (row[0].segment_id, row[0].sequence_number, row[0].text, row[1]) if isinstance(row[0], TranscriptSegment)
+        else (row.segment_id, row.sequence_number, row.text, row.raw_text)
+        for row in page
+    ]
+
+
+def interaction_values(page) -> list:
+    return [(row.activity_id, row.member_from, row.member_to, row.sentiment) for row in page]
+
+
+def measure(db, fetch, rows: int, number: int = 20) -> tuple:
+    """(best CPU ms per page, KiB allocated while fetching, KiB still held by the page)"""
+    best = float('inf')
+    for _ in range(number):
+        start = time.process_time()
+        fetch(db, rows)
+        best = min(best, time.process_time() - start)
+        db.expunge_all()
+
+    tracemalloc.start()
+    page = fetch(db, rows)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del page
+    db.expunge_all()
+    return best * 1000, peak / 1024, held / 1024
+
+
+def main(rows: str = '1000'):
+    rows = int(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'synthetic.db')
+        generate(db_path, sessions=10, segments=max(300, rows // 5), interactions=max(100, rows // 5))
+        engine = create_engine(f"sqlite:///{db_path}")
+        db = Session(engine)
+
+        for label, paths, values in [
+            ('segments', (segment_entities, segment_orm_columns, segment_core), segment_values),
+            ('interactions', (interaction_entities, interaction_orm_columns, interaction_core), interaction_values),
+        ]:
+            results = [fetch(db, rows) for fetch in paths]
+            expected = (results[0][0], values(results[0][1]))
+            if any((total, values(page)) != expected for total, page in results[1:]):
+                raise SystemExit(f"{label}: the query paths return different rows")
+            db.expunge_all()
+
+            print(f"{label} ({len(results[0][1])} rows per page)")
+            for fetch in paths:
+                cpu_ms, peak_kib, held_kib = measure(db, fetch, rows)
+                name = fetch.__name__.split('_', 1)[1].replace('_', ' ')
+                print(f"  {name:>11}: {cpu_ms:6.2f} ms CPU  {peak_kib:7.0f} KiB allocated  {held_kib:7.0f} KiB held")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
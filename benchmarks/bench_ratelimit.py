@@ -0,0 +1,65 @@
+"""
+Rate limiter benchmark.
+
+Checks that SQLiteStorage counts every hit when several processes share
+one counter file, so that a limit holds across uvicorn workers rather
+than per worker, then compares the per-request cost of a limit check
+against the in-memory storage slowapi used before.
+
+Usage: python benchmarks/bench_ratelimit.py [workers]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import timeit
+
+from common import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'API'))
+os.environ.setdefault('API_KEYS_PATH', os.devnull)
+from limits import parse
+from limits.storage import MemoryStorage
+from limits.strategies import FixedWindowRateLimiter
+
+from ratelimit import SQLiteStorage
+
+LIMIT = parse("60/minute")
+
+
+def worker(uri, hits, allowed):
+    limiter = FixedWindowRateLimiter(SQLiteStorage(uri))
+    allowed.put(sum(limiter.hit(LIMIT, 'key:shared') for _ in range(hits)))
+
+
+def check_shared(uri, workers, hits=500):
+    allowed = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=worker, args=(uri, hits, allowed)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    total = sum(allowed.get() for _ in processes)
+    for process in processes:
+        process.join()
+
+    count = SQLiteStorage(uri).get(LIMIT.key_for('key:shared'))
+    if total != LIMIT.amount or count != workers * hits:
+        raise SystemExit(f"{total} hits allowed, {count} counted; expected {LIMIT.amount}, {workers * hits}")
+
+
+def main(workers: str = '4', repeat: int = 5, number: int = 20000):
+    with tempfile.TemporaryDirectory() as directory:
+        uri = f"sqlite:///{os.path.join(directory, 'ratelimit.db')}"
+        check_shared(uri, int(workers))
+        print(f"{workers} processes - {LIMIT.amount} hits allowed, every hit counted")
+
+        storages = [('memory', MemoryStorage()), ('sqlite', SQLiteStorage(uri))]
+        for label, storage in storages:
+            limiter = FixedWindowRateLimiter(storage)
+            keys = [f"key:{i}" for i in range(1000)]
+            hits = iter(keys * (repeat * number // len(keys) + 1))
+            best = min(timeit.repeat(lambda: limiter.hit(LIMIT, next(hits)), repeat=repeat, number=number)) / number
+            print(f"{label:>7}: {best * 1e6:8.1f} us/request")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
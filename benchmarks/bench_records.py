@@ -0,0 +1,55 @@
+"""
+Record type memory benchmark.
+
+Segments and extracts interactions for a corpus made of every fixture
+transcript repeated (one date per copy, as a multi-year run would have),
+and compares the memory retained by Segment/Interaction records with the
+plain dicts the pipeline used to build.
+
+Usage: python benchmarks/bench_records.py [copies]
+"""
+import sys
+import tracemalloc
+
+from common import load_transcripts
+from chunk_scripts import extract_interactions, segment_transcript
+
+
+def as_dicts(records: list) -> list[dict]:
+    return [dict(record) for record in records]
+
+
+def run(transcripts: dict, copies: int, convert) -> tuple:
+    """Retained bytes for segmenting and extracting every copy"""
+    corpus = []
+    tracemalloc.start()
+    
+    for copy in range(copies):
+        for date, text in transcripts.items():
+            # Fresh date strings per copy, like distinct sessions
+            date = f"{date}-{copy}"
+            segments = convert(segment_transcript(text, date))
+            interactions = convert(extract_interactions(segments))
+            corpus.append((segments, interactions))
+    
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    count = sum(len(s) + len(i) for s, i in corpus)
+    text_bytes = sum(len(seg['text']) + 49 for s, _ in corpus for seg in s)
+    return retained, count, text_bytes
+
+
+def main(copies: str = '10'):
+    transcripts = load_transcripts()
+    
+    for label, convert in [('dicts', as_dicts), ('records', list)]:
+        retained, count, text_bytes = run(transcripts, int(copies), convert)
+        overhead = retained - text_bytes
+        print(f"{label:>8}: {count} records  {retained / 1e6:7.1f} MB retained  "
+              f"{overhead / 1e6:6.1f} MB excluding speech text  "
+              f"{overhead / count:6.0f} B/record")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
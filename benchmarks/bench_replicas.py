@@ -0,0 +1,90 @@
+"""
+Read replica routing check and benchmark.
+
+Builds a primary and two replica SQLite databases from the synthetic
+generator, with one transcript written only to the primary (a replica
+that has not caught up). Checks through the API that reads go to the
+replicas in turn, that least_connections avoids a busy replica, and
+that after mark_written() reads see the primary until the lag window
+ends. Then times the routing decision per request.
+
+Usage: python benchmarks/bench_replicas.py [lag seconds]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+
+from common import ROOT
+from bench_api import BENCH_KEY, client
+from synthetic import generate
+
+NEW_DATE = '12-31-25'
+
+
+def served_by(db_path_of, engine) -> str:
+    return db_path_of[engine.url.database]
+
+
+def main(lag: str = '1.0', number: int = 100000):
+    with tempfile.TemporaryDirectory() as directory:
+        primary = os.path.join(directory, 'primary.db')
+        replicas = [os.path.join(directory, f'replica{i}.db') for i in (1, 2)]
+        generate(primary, sessions=3, members=20, segments=50, interactions=10)
+        for replica in replicas:
+            shutil.copy(primary, replica)
+
+        os.environ['DATABASE_READ_URLS'] = ','.join(f"sqlite:///{replica}" for replica in replicas)
+        os.environ['DATABASE_WRITE_MARKER'] = os.path.join(directory, 'write.marker')
+        os.environ['DATABASE_REPLICA_LAG'] = lag
+        api = client(primary, directory)
+        import database
+        from model import Transcript
+        engines = database.get_engines()
+        names = {primary: 'primary', replicas[0]: 'replica1', replicas[1]: 'replica2'}
+
+        # Ingest writes to the primary only
+        db = database.SessionLocal()
+        db.add(Transcript(date=NEW_DATE, text='THE CLERK:  New session.\n'))
+        db.commit()
+        db.close()
+
+        def found():
+            return api.get(f'/transcripts/{NEW_DATE}', params={'key': BENCH_KEY}).json()['success']
+
+        picked = [served_by(names, engines.router.engine()) for _ in range(4)]
+        if picked != ['replica1', 'replica2', 'replica1', 'replica2'] or found():
+            raise SystemExit(f"Reads not round-robin over the replicas: {picked}")
+        print(f"round_robin - {', '.join(picked)}")
+
+        engines.router.routing = 'least_connections'
+        busy = engines.replicas[0].connect()
+        picked = {served_by(names, engines.router.engine()) for _ in range(4)}
+        busy.close()
+        if picked != {'replica2'}:
+            raise SystemExit(f"least_connections picked {picked}")
+        print("least_connections - skips the replica with a connection checked out")
+
+        # Another process marks the write; the router sees the marker file
+        with open(database.DATABASE_WRITE_MARKER, 'w'):
+            pass
+        engines.router._next_check = 0.0
+        if not found() or served_by(names, engines.router.engine()) != 'primary':
+            raise SystemExit("Reads after mark_written() did not go to the primary")
+        time.sleep(float(lag) + 1.1)
+        if found():
+            raise SystemExit("Reads still on the primary after the lag window")
+        print(f"read-your-writes - primary for {lag}s after the write, then replicas again")
+
+        for routing in ('round_robin', 'least_connections'):
+            engines.router.routing = routing
+            best = min(timeit.repeat(engines.router.engine, repeat=5, number=number)) / number
+            print(f"{routing:>17}: {best * 1e9:6.0f} ns/request")
+
+        database.dispose_engines()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,59 @@
+"""
+Interaction scanner benchmark.
+
+Checks that scan_speech() finds the same sentiment, yield question,
+addresses and thank-you response as running each pattern separately,
+on every fixture speech and on seeded random strings, then compares
+throughput.
+
+Usage: python benchmarks/bench_scanner.py [cases]
+"""
+import random
+import sys
+import timeit
+
+from common import fixture_speaker_data
+from chunk_scripts import PATTERNS, analyze_sentiment, scan_speech
+
+FRAGMENTS = [
+    'Will ', 'the sponsor', ' yield', 'Mr. ', 'Mrs. ', 'Ms.', ' ', '\n', 'SMITH', "O'HARA", 'Lee',
+    'Thank you', ', ', 'I agree', 'yes', 'absolutely', 'I disagree', "that's right", "that's wrong",
+    'I offer the following amendment', 'amendment to', 'respectfully disagree', 'x', '.', '?',
+]
+
+
+def separate_scans(text: str) -> dict:
+    """What extract_interactions used to compute with one scan per pattern"""
+    question = PATTERNS['yield_question'].search(text)
+    response = PATTERNS['thank_response'].search(text)
+    return {
+        'sentiment': analyze_sentiment(text),
+        'question': (question.group(0), question.group(1)) if question else None,
+        'addresses': [(m.group(0), m.group(1)) for m in PATTERNS['direct_address'].finditer(text)],
+        'response': (response.group(0), response.group(1)) if response else None,
+    }
+
+
+def check(texts):
+    for text in texts:
+        if scan_speech(text) != separate_scans(text):
+            raise SystemExit(f"Mismatch on {text[:80]!r}")
+
+
+def main(cases: str = '100000', repeat: int = 5, number: int = 3):
+    rng = random.Random(0)
+    check(''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12))) for _ in range(int(cases)))
+    print(f"{cases} random strings - identical")
+    
+    texts = [entry['text'] for entry in fixture_speaker_data()]
+    check(texts)
+    print(f"{len(texts)} fixture speeches - identical")
+    
+    total_chars = sum(len(t) for t in texts)
+    for label, func in [('separate scans', separate_scans), ('scan_speech', scan_speech)]:
+        best = min(timeit.repeat(lambda: [func(t) for t in texts], repeat=repeat, number=number)) / number
+        print(f"{label:>15}: {best * 1000:8.2f} ms/pass  {total_chars / best / 1e6:6.2f} M chars/s")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
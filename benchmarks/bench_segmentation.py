@@ -0,0 +1,40 @@
+"""
+Speaker segmentation benchmark.
+
+Checks that split_speakers() returns exactly what PATTERNS['speaker']
+produces on every fixture transcript, then times both.
+
+Usage: python benchmarks/bench_segmentation.py [transcripts.json]
+"""
+import sys
+import timeit
+
+from common import FIXTURE, load_transcripts
+from chunk_scripts import PATTERNS, split_speakers
+
+
+def regex_segments(text: str) -> list[tuple]:
+    return [m.groups() for m in PATTERNS['speaker'].finditer(text)]
+
+
+def main(path: str = FIXTURE, repeat: int = 5, number: int = 10):
+    transcripts = load_transcripts(path)
+    
+    # Differential check against the original pattern
+    for date, text in transcripts.items():
+        expected = regex_segments(text)
+        actual = split_speakers(text)
+        if expected != actual:
+            raise SystemExit(f"Mismatch on {date}: {len(expected)} vs {len(actual)} segments")
+        print(f"{date}: {len(text)} chars, {len(actual)} segments - identical")
+    
+    texts = list(transcripts.values())
+    total_chars = sum(len(t) for t in texts)
+    
+    for label, func in [('regex', regex_segments), ('split_speakers', split_speakers)]:
+        best = min(timeit.repeat(lambda: [func(t) for t in texts], repeat=repeat, number=number)) / number
+        print(f"{label:>15}: {best * 1000:8.2f} ms/pass  {total_chars / best / 1e6:6.1f} M chars/s")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
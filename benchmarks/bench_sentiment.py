@@ -0,0 +1,72 @@
+"""
+Batch sentiment benchmark.
+
+Checks that analytics.pattern_counts() matches len(findall) of every
+scanned pattern and analyze_sentiments() matches analyze_sentiment() on
+every fixture speech and on seeded random strings, then compares
+labelling one speech at a time against the batch path that ingest and
+backfill_segments.py use, by the per-member counts /stats/sentiment
+reports.
+
+Usage: python benchmarks/bench_sentiment.py [cases]
+"""
+import random
+import sys
+import timeit
+from collections import Counter
+
+from common import fixture_speaker_data
+from bench_scanner import FRAGMENTS
+from chunk_scripts import PATTERNS, SCAN_KINDS, SENTIMENT_KINDS, analyze_sentiment
+from analytics import analyze_sentiments, pattern_counts
+
+
+def check(texts):
+    labels = analyze_sentiments(texts)
+    for kinds in (SCAN_KINDS, SENTIMENT_KINDS):
+        counts = pattern_counts(texts, kinds)
+        for i, text in enumerate(texts):
+            expected = [len(PATTERNS[kind].findall(text)) for kind in kinds]
+            if counts[i].tolist() != expected or labels[i] != analyze_sentiment(text):
+                raise SystemExit(f"Mismatch on {text[:80]!r}")
+
+
+def per_speech(speeches):
+    """Label each speech, then count (member, label) pairs"""
+    return Counter(
+        (entry['member_id'], analyze_sentiment(entry['text']))
+        for entry in speeches if entry['member_id'] is not None
+    )
+
+
+def batch(speeches):
+    """Label every speech in one call, then count (member, label) pairs"""
+    labels = analyze_sentiments([entry['text'] for entry in speeches])
+    return Counter(
+        (entry['member_id'], label)
+        for entry, label in zip(speeches, labels) if entry['member_id'] is not None
+    )
+
+
+def main(cases: str = '20000', repeat: int = 5, number: int = 3):
+    rng = random.Random(0)
+    check([''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12))) for _ in range(int(cases))])
+    print(f"{cases} random strings - identical")
+
+    speeches = fixture_speaker_data()
+    check([entry['text'] for entry in speeches])
+    print(f"{len(speeches)} fixture speeches - identical")
+
+    # Both paths give the same per-member counts
+    counts = batch(speeches)
+    if counts != per_speech(speeches):
+        raise SystemExit("Per-member counts differ")
+    print(f"{len({member for member, _ in counts})} member counts - identical")
+
+    for label, func in [('per speech', per_speech), ('batch', batch)]:
+        best = min(timeit.repeat(lambda: func(speeches), repeat=repeat, number=number)) / number
+        print(f"{label:>10}: {best * 1000:8.2f} ms/pass  {len(speeches) / best:10.0f} speeches/s")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
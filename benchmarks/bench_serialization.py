@@ -0,0 +1,140 @@
+"""
+Response serialization benchmark.
+
+Builds 1000-row pages of /segments and /interactions from a synthetic
+database (see synthetic.py) and compares, per item:
+
+  build      the ORM entity query the routes used to run with the column
+             query they run now (row tuples, no entities), both making
+             the item dicts
+  serialize  FastAPI's path for routes without a response_model
+             (jsonable_encoder, then json.dumps) with the route's
+             response_model, validated and written to JSON bytes by
+             pydantic-core
+
+Checks first that both give the same JSON.
+
+Usage: python benchmarks/bench_serialization.py [rows per page]
+"""
+import json
+import os
+import sys
+import tempfile
+import timeit
+
+from common import ROOT
+from synthetic import generate
+
+sys.path.insert(0, os.path.join(ROOT, 'API'))
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from model import Activity, Transcript, TranscriptSegment
+from queries import ACTIVITY_COLUMNS, SEGMENT_COLUMNS
+from roster import Roster
+from schemas import ActivityList, SegmentList
+from segment_text import raw_text_column, segment_text
+
+
+def envelope(response_type: str, items: list, total: int) -> dict:
+    return {
+        "success": True, "message": "", "responseType": response_type, "total": total,
+        "offsetStart": 1, "offsetEnd": len(items), "limit": len(items), "result": {"items": items},
+    }
+
+
+def segment_page(db, roster, rows: int, entities: bool) -> dict:
+    """/segments page, from TranscriptSegment entities or from SEGMENT_COLUMNS rows"""
+    query = db.query(TranscriptSegment) if entities else db.query(*SEGMENT_COLUMNS)
+    query = query.outerjoin(Transcript, TranscriptSegment.date == Transcript.date)\
+        .add_columns(raw_text_column())\
+        .order_by(TranscriptSegment.date, TranscriptSegment.sequence_number).limit(rows)
+    results = [(row[0], row[1]) for row in query] if entities else [(row, row.raw_text) for row in query]
+    items = [
+        {
+            "segmentId": segment.segment_id,
+            "date": segment.date,
+            "sequenceNumber": segment.sequence_number,
+            "memberId": segment.member_id,
+            "text": segment_text(segment, raw_text),
+            "memberName": roster.name_of(segment.member_id),
+            "billNumber": segment.bill_number
+        }
+        for segment, raw_text in results
+    ]
+    return envelope("segment list", items, len(items))
+
+
+def interaction_page(db, roster, rows: int, entities: bool) -> dict:
+    """/interactions page, from Activity entities or from ACTIVITY_COLUMNS rows"""
+    query = db.query(Activity) if entities else db.query(*ACTIVITY_COLUMNS)
+    query = query.order_by(Activity.date, Activity.segment_id).limit(rows)
+    items = [
+        {
+            "activityId": activity.activity_id,
+            "date": activity.date,
+            "segmentId": activity.segment_id,
+            "memberFrom": activity.member_from,
+            "memberTo": activity.member_to,
+            "interactionType": activity.interaction,
+            "fromMemberName": roster.name_of(activity.member_from),
+            "toMemberName": roster.name_of(activity.member_to),
+            "sentiment": activity.sentiment,
+            "billNumber": activity.bill_number
+        }
+        for activity in query
+    ]
+    return envelope("interaction list", items, len(items))
+
+
+def dicts_json(content: dict) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def per_item_us(func, items: int, number: int = 5) -> float:
+    seconds = min(timeit.repeat(func, repeat=5, number=number)) / number
+    return seconds / items * 1e6
+
+
+def main(rows: str = '1000'):
+    rows = int(rows)
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'synthetic.db')
+        generate(db_path, sessions=10, segments=max(300, rows // 5), interactions=max(100, rows // 5))
+        engine = create_engine(f"sqlite:///{db_path}")
+        db = Session(engine)
+        roster = Roster.from_db(db)
+
+        for label, build, model in [
+            ('segments', segment_page, SegmentList),
+            ('interactions', interaction_page, ActivityList),
+        ]:
+            adapter = TypeAdapter(model)
+
+            def models_json(content: dict) -> bytes:
+                return adapter.dump_json(adapter.validate_python(content), by_alias=True)
+
+            old_page = build(db, roster, rows, entities=True)
+            new_page = build(db, roster, rows, entities=False)
+            if json.loads(dicts_json(old_page)) != json.loads(models_json(new_page)):
+                raise SystemExit(f"{label}: the two paths give different JSON")
+            items = len(new_page['result']['items'])
+
+            build_old = per_item_us(lambda: build(db, roster, rows, entities=True), items)
+            build_new = per_item_us(lambda: build(db, roster, rows, entities=False), items)
+            serialize_old = per_item_us(lambda: dicts_json(old_page), items)
+            serialize_new = per_item_us(lambda: models_json(new_page), items)
+            print(f"{label} ({items} rows per page), microseconds per item")
+            print(f"  build      entities {build_old:7.2f}  rows   {build_new:7.2f}  ({build_old / build_new:.1f}x)")
+            print(f"  serialize  dicts    {serialize_old:7.2f}  models {serialize_new:7.2f}"
+                  f"  ({serialize_old / serialize_new:.1f}x)")
+
+        db.close()
+        engine.dispose()
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,163 @@
+"""
+API startup benchmark.
+
+Imports API/main.py in fresh interpreters under python -X importtime
+and checks that the import did no startup work: numpy not imported, no
+database engine created, api_keys.json not read. Reports the best run's
+total import time, the part spent in this repo's own modules (their
+self time, so the frameworks they import are not counted), the median
+of both over the runs, and the slowest imports main pulls in. Then starts the app on a synthetic
+database (see synthetic.py) and times the lifespan (engines, API keys,
+roster, warm-up queries) and the first requests after it.
+
+The median import is held to BUDGET_MS: MEDIAN_MS, the medians measured
+on baseline.json's machine, with a BUDGET_MARGIN on top, since single
+runs on that machine already vary by a fifth. Budgets are scaled like
+suite.py's timings by the calibration workload against baseline.json's,
+so a slower machine is not over budget; the exit status is 1 when
+either median is over. Update MEDIAN_MS in the same change as an import
+that is meant to cost more, so reviewers see it in the diff.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT
+from bench_api import BENCH_KEY, client
+from suite import BASELINE, calibration_ms
+from synthetic import generate
+
+API = os.path.join(ROOT, 'API')
+
+# Median of the runs, in ms at the speed of baseline.json's machine
+MEDIAN_MS = {'import main': 1000.0, 'repo modules': 155.0}
+BUDGET_MARGIN = 1.5
+BUDGET_MS = {label: median * BUDGET_MARGIN for label, median in MEDIAN_MS.items()}
+
+CHECK = """
+import json, sys
+import main, database
+print(json.dumps({
+    'numpy imported': 'numpy' in sys.modules,
+    'engines created': database._engines is not None,
+    'api keys read': main.KEY_STORE._mtime is not None,
+}))
+"""
+
+
+def local_modules() -> set:
+    """Top-level names of this repo's modules, which main imports from API/ and the root"""
+    return {name[:-3] for directory in (API, ROOT) for name in os.listdir(directory) if name.endswith('.py')}
+
+
+def parse_importtime(stderr: str) -> list[tuple]:
+    """(self us, cumulative us, depth, module) per -X importtime line, in the order printed"""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return imports
+
+
+def import_main(env: dict) -> tuple:
+    """(checks, the imports printed for main: its own line last)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHECK], cwd=API, env=env,
+                            capture_output=True, text=True)
+    if result.returncode:
+        raise SystemExit(f"import main failed:\n{result.stderr[-2000:]}")
+    imports = parse_importtime(result.stderr)
+    end = max(i for i, (_, _, depth, name) in enumerate(imports) if depth == 0 and name == 'main')
+    start = max((i + 1 for i, (_, _, depth, _) in enumerate(imports[:end]) if depth == 0), default=0)
+    return json.loads(result.stdout.strip().splitlines()[-1]), imports[start:end + 1]
+
+
+def first_requests(db_path: str, directory: str, paths: list[str]) -> tuple:
+    """(lifespan ms, [(path, first request ms, a later request ms)])"""
+    api = client(db_path, directory)
+    start = time.perf_counter()
+    api.__enter__()
+    startup = (time.perf_counter() - start) * 1000
+    timings = []
+    try:
+        for path in paths:
+            start = time.perf_counter()
+            api.get(path, params={'key': BENCH_KEY})
+            first = (time.perf_counter() - start) * 1000
+            later = min(timed_get(api, path) for _ in range(5))
+            timings.append((path, first, later))
+    finally:
+        api.__exit__(None, None, None)
+    return startup, timings
+
+
+def timed_get(api, path: str) -> float:
+    start = time.perf_counter()
+    api.get(path, params={'key': BENCH_KEY})
+    return (time.perf_counter() - start) * 1000
+
+
+def main(runs: str = '7'):
+    local = local_modules()
+    with open(BASELINE, 'r') as f:
+        baseline_calibration = json.load(f)['calibration_ms']
+    calibration = calibration_ms()
+    with tempfile.TemporaryDirectory() as directory:
+        keys_path = os.path.join(directory, 'api_keys.json')
+        with open(keys_path, 'w') as f:
+            json.dump({}, f)
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(directory, 'unused.db')}",
+                   API_KEYS_PATH=keys_path)
+
+        best, failed, timings = None, set(), {'import main': [], 'repo modules': []}
+        for _ in range(int(runs)):
+            checks, imports = import_main(env)
+            failed.update(name for name, happened in checks.items() if happened)
+            timings['import main'].append(imports[-1][1] / 1000)
+            timings['repo modules'].append(
+                sum(self_us for self_us, _, _, name in imports if name.split('.')[0] in local) / 1000
+            )
+            if best is None or imports[-1][1] < best[-1][1]:
+                best = imports
+        imports = best
+        speed = (calibration + calibration_ms()) / 2 / baseline_calibration
+
+        if failed:
+            print(f"import main did startup work: {', '.join(sorted(failed))}")
+
+        print(f"calibration speed ratio {speed:.2f} (budgets below are scaled by it)")
+        over = []
+        for label, values in timings.items():
+            median = statistics.median(values)
+            budget = BUDGET_MS[label] * speed
+            if median > budget:
+                over.append(label)
+            print(f"{label:>12}: median {median:7.1f} ms  best {min(values):7.1f} ms  "
+                  f"budget {budget:7.1f} ms{'  OVER' if median > budget else ''}")
+
+        print("slowest imports under main, best run (cumulative ms):")
+        children = sorted((cumulative, name) for _, cumulative, depth, name in imports if depth == 1)
+        for cumulative, name in children[::-1][:10]:
+            print(f"  {name:<24} {cumulative / 1000:7.1f}{'  (repo)' if name.split('.')[0] in local else ''}")
+
+        db_path = os.path.join(directory, 'synthetic.db')
+        generate(db_path, sessions=5, members=50, segments=200, interactions=50)
+        startup, timings = first_requests(db_path, directory, ['/segments', '/interactions', '/threads'])
+        print(f"lifespan startup: {startup:6.1f} ms")
+        for path, first, later in timings:
+            print(f"  {path:<14} first {first:6.1f} ms  later {later:6.1f} ms")
+
+    if failed or over:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
@@ -0,0 +1,55 @@
+"""
+Streaming segmenter memory benchmark.
+
+Feeds each fixture transcript to iter_segments() page by page and
+compares the peak memory held while segmenting (tracemalloc, the input
+text excluded) with segment_transcript() over the joined text. Segments
+are consumed one at a time, as an ingest loop writing rows would.
+
+Usage: python benchmarks/bench_streaming.py [copies per session]
+"""
+import sys
+import tracemalloc
+
+from common import load_transcripts
+from chunk_scripts import iter_segments, segment_transcript, split_speakers
+
+
+def pages_of(text: str) -> list[str]:
+    """Split on the per-page date line, keeping it with its page"""
+    pieces = text.split('NYS ASSEMBLY')
+    return [pieces[0]] + ['NYS ASSEMBLY' + piece for piece in pieces[1:]]
+
+
+def peak_of(func) -> int:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(copies: str = '4'):
+    for date, text in load_transcripts().items():
+        # A longer session made of several copies of this one
+        pages = pages_of(text) * int(copies)
+        joined = ''.join(pages)
+        
+        if list(iter_segments(pages, date)) != segment_transcript(joined, date):
+            raise SystemExit(f"Mismatch on {date}")
+        
+        longest = max(len(content) for _, _, content in split_speakers(joined))
+        
+        def consume(segments):
+            for _ in segments:
+                pass
+        
+        whole = peak_of(lambda: consume(segment_transcript(joined, date)))
+        streamed = peak_of(lambda: consume(iter_segments(iter(pages), date)))
+        
+        print(f"{date}: {len(joined) / 1e6:5.2f} M chars, longest speech {longest / 1e3:6.1f} K chars  "
+              f"peak whole-text {whole / 1e6:6.2f} MB  streamed {streamed / 1e6:6.2f} MB")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
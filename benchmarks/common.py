@@ -0,0 +1,36 @@
+"""Shared fixture loading for the benchmark scripts."""
+import json
+import os
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+FIXTURE = os.path.join(ROOT, 'test', 'test_transcipts.json')
+MEMBERS = os.path.join(ROOT, 'members.json')
+
+
+def load_transcripts(path: str = FIXTURE) -> dict:
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def fixture_speaker_data(path: str = FIXTURE) -> list[dict]:
+    """Segment dicts for every fixture transcript, as the ingest notebook builds them"""
+    from chunk_scripts import clean_speech_text, split_speakers
+    
+    with open(MEMBERS, 'r') as f:
+        members = json.load(f)
+    name_to_id = {m['shortName'].split()[-1]: m['memberId'] for m in members}
+    
+    speaker_data = []
+    for date, text in load_transcripts(path).items():
+        for seq, (title, name, content) in enumerate(split_speakers(text)):
+            speaker_data.append({
+                'name': f"{title} {name}",
+                'member_id': name_to_id.get(name),
+                'text': clean_speech_text(content),
+                'date': date,
+                'sequence': seq
+            })
+    return speaker_data
@@ -0,0 +1,163 @@
+"""
+Benchmark suite: ingest micro-benchmarks and API load tests.
+
+Times clean_speech_text, split_speakers and extract_interactions on
+the fixture transcripts, load tests every endpoint on a synthetic
+database, writes the results as JSON and compares them with a saved
+baseline. Timings are scaled by a fixed calibration workload timed in
+the same run, so a busier or slower machine is not a regression; any
+micro-benchmark or p50 still more than --tolerance slower than the
+baseline (and slower by more than --floor ms, so sub-millisecond noise
+does not count) is reported as a regression and the exit status is 1.
+
+Commit benchmarks/baseline.json from the same machine when a change is
+meant to move the numbers, changes the synthetic data or adds a case
+(a case missing from the baseline is shown but not gated); reviewers
+see the difference in the diff.
+
+Usage: python benchmarks/suite.py [--output results.json] [--baseline benchmarks/baseline.json]
+                                  [--save-baseline] [--requests 30] [--sessions 20] ...
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+
+from common import ROOT, fixture_speaker_data, load_transcripts
+from bench_api import load_test
+from synthetic import generate
+from chunk_scripts import clean_speech_text, extract_interactions, split_speakers
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def best_ms(func, repeat: int = 5, number: int = 3) -> float:
+    return min(timeit.repeat(func, repeat=repeat, number=number)) / number * 1000
+
+
+def calibration_ms(repeat: int = 9) -> float:
+    """
+    A fixed CPU-bound workload; timings are compared relative to it, so
+    a slower machine is not a regression. The median of runs long
+    enough to be throttled like the benchmarks, not the best burst.
+    """
+    words = ('MR. SMITH:  Will the sponsor yield? ' * 2000).split()
+    runs = sorted(timeit.repeat(lambda: sorted(w.lower() for w in words) and sum(i * i for i in range(100000)),
+                                repeat=repeat, number=10))
+    return runs[repeat // 2] / 10 * 1000
+
+
+def micro_benchmarks() -> dict:
+    """ms per pass over the fixture transcripts"""
+    transcripts = list(load_transcripts().values())
+    segments = [content for text in transcripts for _, _, content in split_speakers(text)]
+    speaker_data = fixture_speaker_data()
+    return {
+        'micro.clean_speech_text': best_ms(lambda: [clean_speech_text(s) for s in segments]),
+        'micro.split_speakers': best_ms(lambda: [split_speakers(t) for t in transcripts]),
+        'micro.extract_interactions': best_ms(lambda: extract_interactions(speaker_data)),
+    }
+
+
+def run(args) -> dict:
+    calibration = calibration_ms()
+    timings = micro_benchmarks()
+    sizes = {}
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, 'synthetic.db')
+        data = generate(db_path, args.sessions, args.members, args.segments, args.interactions)
+        for label, result in load_test(data, db_path, directory, args.requests).items():
+            timings[f'api.{label}.p50'] = result['p50_ms']
+            timings[f'api.{label}.p95'] = result['p95_ms']
+            sizes[f'api.{label}'] = result['bytes']
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'meta': {
+            'commit': commit,
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'config': {name: getattr(args, name) for name in ('sessions', 'members', 'segments', 'interactions', 'requests')},
+        },
+        # Measured again at the end, for a machine that changed speed during the run
+        'calibration_ms': (calibration + calibration_ms()) / 2,
+        'timings_ms': timings,
+        'sizes_bytes': sizes,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float, floor: float) -> list[str]:
+    """Print each timing against the baseline; returns the names that regressed"""
+    regressions = []
+    old_timings = baseline.get('timings_ms', {})
+    speed = results['calibration_ms'] / baseline['calibration_ms']
+    print(f"{'calibration':>38}: {results['calibration_ms']:9.2f} ms  baseline {baseline['calibration_ms']:9.2f} ms"
+          f"  (timings below are compared at this speed ratio, {speed:.2f})")
+    for name, value in results['timings_ms'].items():
+        old = old_timings.get(name)
+        if old is None:
+            print(f"{name:>38}: {value:9.2f} ms  (new)")
+            continue
+        old *= speed
+        change = value / old - 1 if old else 0.0
+        # p95 of a few dozen requests is too noisy to gate on; it is shown for review
+        regressed = not name.endswith('.p95') and change > tolerance and value - old > floor
+        print(f"{name:>38}: {value:9.2f} ms  baseline {old:9.2f} ms  {change:+7.1%}{'  REGRESSION' if regressed else ''}")
+        if regressed:
+            regressions.append(name)
+
+    old_sizes = baseline.get('sizes_bytes', {})
+    for name, size in results['sizes_bytes'].items():
+        if name in old_sizes and old_sizes[name] != size:
+            print(f"{name:>38}: response size {old_sizes[name]:,d} -> {size:,d} bytes")
+    if baseline.get('meta', {}).get('config') != results['meta']['config']:
+        print("Note: baseline was run with a different data config")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--output', help="write results JSON here")
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help="overwrite the baseline with these results")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown, as a fraction")
+    parser.add_argument('--floor', type=float, default=0.5, help="ignore slowdowns smaller than this many ms")
+    parser.add_argument('--requests', type=int, default=30, help="requests per endpoint")
+    parser.add_argument('--sessions', type=int, default=20)
+    parser.add_argument('--members', type=int, default=150)
+    parser.add_argument('--segments', type=int, default=300, help="per session")
+    parser.add_argument('--interactions', type=int, default=100, help="per session")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=1)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        raise SystemExit(f"No baseline at {args.baseline}; run with --save-baseline first")
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance, args.floor)
+    if regressions:
+        print(f"{len(regressions)} regressions against {baseline['meta'].get('commit')}")
+        sys.exit(1)
+    print(f"No regressions against {baseline['meta'].get('commit')}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Synthetic SQLite database for the API benchmarks.
+
+Writes the tables of API/model.py with a chosen number of sessions
+(transcript dates), members, segments per session and interactions per
+session, with a debate thread at the start of each bill. Transcripts are built as "MR. NAME:  speech" blocks in the
+floor transcript layout, so segment offsets, bill context, tables of
+contents and the speaker pattern behave as on real data. The same seed
+gives the same database.
+
+Usage: python benchmarks/synthetic.py out.db [sessions] [members] [segments] [interactions]
+"""
+import os
+import random
+import sys
+
+from common import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, 'API'))
+from sqlalchemy import create_engine
+
+from analytics import SENTIMENTS
+from chunk_scripts import segment_transcript, table_of_contents, toc_bytes
+from model import Activity, Base, DebateThread, Member, Transcript, TranscriptSegment, TranscriptToc
+
+SYLLABLES = ['AB', 'BA', 'CAR', 'DEL', 'FOR', 'GAL', 'HAR', 'KEL', 'LAN', 'MAR', 'NOR', 'O', 'PER',
+             'RO', 'SAN', 'TER', 'VAL', 'WIL', 'ZE', 'MAN', 'SON', 'TO', 'LI', 'NE']
+WORDS = ('the bill would require the department to report on funding for schools in my district and '
+         'I thank the sponsor for bringing this legislation to the floor because our constituents '
+         'have waited years for a change in how the state handles these costs').split()
+PHRASES = ['Will the sponsor yield?', 'I agree with my colleague.', 'I respectfully disagree.',
+           'I offer the following amendment.', 'Thank you, Mr. {name}.', 'Mr. {name}, how would this work?']
+INTERACTIONS = ['question', 'address', 'response']
+
+
+def member_rows(count: int, rng: random.Random) -> list[dict]:
+    names = set()
+    while len(names) < count:
+        names.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return [
+        {'member_id': i + 1, 'name': name, 'district': i % 150 + 1, 'session_year': rng.choice([2023, 2025])}
+        for i, name in enumerate(sorted(names))
+    ]
+
+
+def speech(rng: random.Random, names: list[str]) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 120))]
+    if rng.random() < 0.4:
+        words.append(rng.choice(PHRASES).format(name=rng.choice(names).title()))
+    # Wrap like the PDF text, about 70 characters a line
+    lines, line = [], []
+    for word in words:
+        line.append(word)
+        if sum(len(w) + 1 for w in line) > 70:
+            lines.append(' '.join(line) + ' ')
+            line = []
+    lines.append(' '.join(line))
+    return '\n'.join(lines)
+
+
+def session_rows(date: str, segments: int, interactions: int, members: list[dict], first_segment_id: int,
+                 rng: random.Random):
+    """(transcript, segments, activities, threads) rows for one session"""
+    names = [m['name'] for m in members]
+    parts = [f"NYS ASSEMBLY {date}\n"]
+    offset = len(parts[0])
+    segment_rows = []
+    bill = None
+    for sequence in range(segments):
+        if sequence % 25 == 0:
+            bill = f"A{rng.randint(1, 99999):05d}"
+            header = f"THE CLERK:  Assembly No. {bill}, Calendar No. {rng.randint(1, 900)}.\n"
+            parts.append(header)
+            offset += len(header)
+        member = rng.choice(members)
+        prefix = f"{rng.choice(['MR.', 'MS.', 'MRS.'])} {member['name']}:  "
+        content = speech(rng, names)
+        parts.append(prefix + content + '\n')
+        start = offset + len(prefix)
+        segment_rows.append({
+            'segment_id': first_segment_id + sequence,
+            'date': date,
+            'sequence_number': sequence,
+            'member_id': member['member_id'],
+            'text': content.strip(),
+            'text_start': start,
+            'text_end': start + len(content),
+            'sentiment': rng.choice(SENTIMENTS),
+            'bill_number': bill,
+        })
+        offset += len(prefix) + len(content) + 1
+
+    activity_rows = []
+    for _ in range(interactions if segments else 0):
+        segment = rng.choice(segment_rows)
+        activity_rows.append({
+            'date': date,
+            'segment_id': segment['segment_id'],
+            'member_from': segment['member_id'],
+            'member_to': rng.choice(members)['member_id'],
+            'interaction': rng.choice(INTERACTIONS),
+            'sentiment': segment['sentiment'],
+            'bill_number': segment['bill_number'],
+        })
+
+    thread_rows = []
+    for first in range(1, segments - 3, 25):
+        last = min(segments - 1, first + rng.randint(2, 12))
+        questioner, sponsor = segment_rows[first]['member_id'], segment_rows[first + 1]['member_id']
+        if questioner == sponsor:
+            continue
+        turns = [row['member_id'] for row in segment_rows[first:last + 1]]
+        thread_rows.append({
+            'date': date,
+            'bill_number': segment_rows[first]['bill_number'],
+            'sponsor_id': sponsor,
+            'questioner_id': questioner,
+            'first_segment_id': segment_rows[first]['segment_id'],
+            'last_segment_id': segment_rows[last]['segment_id'],
+            'questions': turns.count(questioner),
+            'answers': turns.count(sponsor),
+        })
+    return {'date': date, 'text': ''.join(parts)}, segment_rows, activity_rows, thread_rows
+
+
+def generate(path: str, sessions: int = 20, members: int = 150, segments: int = 300, interactions: int = 100,
+             seed: int = 0) -> dict:
+    """Create the database at path; returns the row counts and a few keys for requests"""
+    rng = random.Random(seed)
+    if os.path.exists(path):
+        os.remove(path)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    member_list = member_rows(members, rng)
+    dates = [f"{1 + i // 28 % 12}-{1 + i % 28}-{25 - i // 336}" for i in range(sessions)]
+    counts = {'sessions': sessions, 'members': members, 'segments': 0, 'interactions': 0, 'threads': 0}
+    bills = []
+
+    with engine.begin() as conn:
+        conn.execute(Member.__table__.insert(), member_list)
+        for date in dates:
+            transcript, segment_rows, activity_rows, thread_rows = session_rows(
+                date, segments, interactions, member_list, counts['segments'] + 1, rng
+            )
+            conn.execute(Transcript.__table__.insert(), [transcript])
+            toc = table_of_contents(transcript['text'], segment_transcript(transcript['text'], date))
+            conn.execute(TranscriptToc.__table__.insert(), [{'date': date, 'toc': toc_bytes(toc)}])
+            if segment_rows:
+                conn.execute(TranscriptSegment.__table__.insert(), segment_rows)
+                bills.append(segment_rows[-1]['bill_number'])
+            if activity_rows:
+                conn.execute(Activity.__table__.insert(), activity_rows)
+            if thread_rows:
+                conn.execute(DebateThread.__table__.insert(), thread_rows)
+            counts['segments'] += len(segment_rows)
+            counts['interactions'] += len(activity_rows)
+            counts['threads'] += len(thread_rows)
+    engine.dispose()
+
+    counts.update(dates=dates, member_ids=[m['member_id'] for m in member_list], bills=bills)
+    return counts
+
+
+def main(path: str, sessions: str = '20', members: str = '150', segments: str = '300', interactions: str = '100'):
+    counts = generate(path, int(sessions), int(members), int(segments), int(interactions))
+    print(f"{path}: {counts['sessions']} sessions, {counts['members']} members, "
+          f"{counts['segments']} segments, {counts['interactions']} interactions")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        raise SystemExit(__doc__.strip().splitlines()[-1])
+    main(*sys.argv[1:6])
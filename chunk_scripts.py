@@ -1,7 +1,9 @@
-import requests 
-import PyPDF2
-from io import BytesIO
+import json
 import re
+import zlib
+from bisect import bisect_right
+
+from records import Interaction, Segment, Thread, make_interaction, make_segment, make_thread
 
 PATTERNS = {
         #Member speaking 
@@ -10,14 +12,28 @@ PATTERNS = {
             re.MULTILINE | re.DOTALL
         ),
         
+        #Line-oriented pieces of 'speaker' used by iter_speaker_spans
+        'speaker_boundary': re.compile(r'\n(?=MR\.|MRS\.|MS\.|ACTING SPEAKER|THE CLERK|\(|\[)'),
+        'speaker_header': re.compile(r'(MR\.|MRS\.|MS\.|ACTING SPEAKER|THE CLERK)\s+([A-Z\-\']+):(\s+)'),
+        
         #Bill information
         'bill_number': re.compile(r'(?:Assembly|Senate) No\.\s+([AS]\d{5}(?:-[A-Z])?)', re.IGNORECASE),
-        'calendar_number': re.compile(r'Calendar No\.\s+(\d+)', re.IGNORECASE),
-        'rules_report': re.compile(r'Rules Report No\.\s+(\d+)', re.IGNORECASE),
+        # Transcript lines wrap inside these ("Rules \nReport No. 341")
+        'calendar_number': re.compile(r'Calendar\s+No\.\s+(\d+)', re.IGNORECASE),
+        'rules_report': re.compile(r'Rules\s+Report\s+No\.\s+(\d+)', re.IGNORECASE),
         
         #Session metadata
         'session_date': re.compile(r'^[\d]*([A-Z]+,\s+[A-Z]+\s+\d{1,2},\s+\d{4})', re.MULTILINE),
-        'page_number': re.compile(r'NYS ASSEMBLY\s+JUNE \d{1,2}, \d{4}\s*\n\s*(\d+)', re.MULTILINE),
+        # Page header; the page number is glued to the first line ("4of an")
+        'page_number': re.compile(r'NYS ASSEMBLY\s+[A-Z]+\s+\d{1,2},\s+\d{4}\s*\n\s*(\d+)', re.MULTILINE),
+        
+        #Speech cleanup (see clean_speech_text)
+        'date_line': re.compile(r'\n?NYS ASSEMBLY\s+[A-Z]+\s+\d{1,2},\s+\d{4}\s*\n?'),
+        # "\n12\n" and "\n2to" in one scan; a standalone number may be
+        # followed by a glued one ("\n12\n3to"), as after two passes
+        'line_page_number': re.compile(r'\n(?:\d{1,4}\n(?:\d{1,3}(?=[a-z]))?|\d{1,3}(?=[a-z]))'),
+        'extra_newlines': re.compile(r'\n{3,}'),
+        'extra_spaces': re.compile(r' {2,}'),
         
         #Interaction patterns
         'yield_question': re.compile(
@@ -60,6 +76,319 @@ PATTERNS = {
     }
 
 
+#Every interaction and sentiment pattern as one zero-width alternation, so
+#matches of different kinds can overlap as they do when run separately
+#(an address inside a yield question). No two kinds can start at the same
+#position, and the character class skips positions none of them can start at.
+SCAN_KINDS = ('yield_question', 'thank_response', 'direct_address',
+              'amendment_offer', 'disagreement', 'agreement')
+PATTERNS['interaction_scan'] = re.compile(
+    r'(?=[WTMIAPFRECY])(?=' + '|'.join(
+        f"(?P<{kind}>{PATTERNS[kind].pattern})" for kind in SCAN_KINDS
+    ) + ')',
+    re.IGNORECASE
+)
+
+#analyze_sentiment's labels; their order is analytics' label codes
+SENTIMENTS = ('neutral', 'agreement', 'disagreement', 'amendment_offer')
+
+#The sentiment patterns alone, for labelling without the address scan
+SENTIMENT_KINDS = ('amendment_offer', 'disagreement', 'agreement')
+PATTERNS['sentiment_scan'] = re.compile(
+    r'(?=[IAECTYRPF])(?=' + '|'.join(
+        f"(?P<{kind}>{PATTERNS[kind].pattern})" for kind in SENTIMENT_KINDS
+    ) + ')',
+    re.IGNORECASE
+)
+
+#Bill information in one scan, for BillContextScan
+BILL_KINDS = {'bill_number': 'bill_number', 'calendar_number': 'calendar_number',
+              'rules_report': 'rules_report_number'}
+PATTERNS['bill_context'] = re.compile(
+    '|'.join(f"(?P<{kind}>{PATTERNS[kind].pattern})" for kind in BILL_KINDS),
+    re.IGNORECASE
+)
+
+def iter_speaker_spans(text: str):
+    """
+    Yield (title, name, start, end) for every speech in a transcript.
+    
+    Produces the same speeches as PATTERNS['speaker'].finditer(text), but
+    finds the line starts that can end a speech once and slices between
+    them by offset instead of re-trying the lookahead at every character.
+    text[start:end] is the raw speech content.
+    """
+    spans, _ = _speaker_spans(text)
+    yield from spans
+
+
+def _speaker_spans(text: str, final: bool = True) -> tuple[list, int]:
+    """
+    Speeches in text, plus the offset where unfinished text starts.
+    
+    With final=False, text is a prefix of a longer transcript: a speech is
+    only returned once the boundary ending it is in text, and the offset
+    marks the line start to keep (the pending header, or the last line
+    that may still turn out to be one).
+    """
+    boundaries = [m.end() for m in PATTERNS['speaker_boundary'].finditer(text)]
+    if PATTERNS['speaker_boundary'].match('\n' + text[:16]):
+        boundaries.insert(0, 0)
+    
+    if not boundaries:
+        return [], len(text) if final else text.rfind('\n') + 1
+    
+    spans = []
+    count = len(boundaries)
+    i = 0
+    while i < count:
+        line_start = boundaries[i]
+        i += 1
+        
+        header = PATTERNS['speaker_header'].match(text, line_start)
+        if header is None:
+            continue
+        
+        # Speech runs to the next boundary after its first character
+        start = header.end()
+        j = bisect_right(boundaries, start, i)
+        if j < count:
+            end = boundaries[j]
+        elif not final:
+            # A later chunk may still hold the boundary ending this speech
+            return spans, line_start
+        elif boundaries[-1] == start and start - header.start(3) > 1:
+            # The regex backtracks into the whitespace and keeps one char
+            j = count - 1
+            start, end = start - 1, start
+        else:
+            # No boundary left, so no later header can match either
+            break
+        
+        spans.append((header.group(1), header.group(2), start, end))
+        
+        # Resume at the boundary that ended this speech; any headers
+        # inside it were swallowed, as with finditer
+        i = j
+    
+    return spans, len(text) if final else boundaries[-1]
+
+
+def split_speakers(text: str) -> list[tuple]:
+    """
+    Split a transcript into (title, name, content) tuples.
+    
+    Drop-in replacement for
+    [m.groups() for m in PATTERNS['speaker'].finditer(text)].
+    """
+    return [
+        (title, name, text[start:end])
+        for title, name, start, end in iter_speaker_spans(text)
+    ]
+
+
+def segment_transcript(text: str, date: str, roster=None) -> list[Segment]:
+    """
+    Split a transcript into cleaned segment dicts ready for
+    extract_interactions and the transcript_segments table.
+    
+    Args:
+        roster: resolves speakers to member IDs (API/roster.py Roster);
+            without one every member_id is None
+    
+    Returns:
+        [Segment(name, member_id, text, date, sequence, start, end), ...],
+        readable like the dicts they replace (segment['text']).
+        clean_speech_text(text[start:end]) is the segment's text.
+    """
+    return list(iter_segments((text,), date, roster))
+
+
+def iter_segments(chunks, date: str, roster=None):
+    """
+    Streaming segment_transcript: consume a transcript in pieces (pages,
+    PDF parts, file reads) and yield each segment dict as soon as the
+    boundary ending it has arrived.
+    
+    Only the unfinished speech, and the text since the last bill reading,
+    are carried between chunks, so memory is bounded by the longest
+    speech rather than the whole session. The segments, bill context
+    included, are the same as segment_transcript(''.join(chunks), ...);
+    start and end locate the raw speech in that joined text.
+    """
+    pending = ''
+    offset = 0  # position of pending in the whole transcript
+    sequence = 0
+    bills = BillContextScan()
+    final = False
+    chunks = iter(chunks)
+    
+    while not final:
+        chunk = next(chunks, None)
+        final = chunk is None
+        if not final:
+            pending += chunk
+            bills.feed(chunk)
+            # Speeches end at line starts, so wait for a line break
+            if '\n' not in chunk:
+                continue
+        
+        spans, rest = _speaker_spans(pending, final)
+        for segment in segments_from_spans(pending, spans, date, roster, offset, sequence):
+            yield segment._replace(**bills.before(segment.start))
+        sequence += len(spans)
+        
+        pending = pending[rest:]
+        offset += rest
+
+
+def segments_from_spans(text: str, spans, date: str, roster=None, offset: int = 0, sequence: int = 0):
+    """
+    Yield the cleaned segment for each (title, name, start, end) span of
+    text, numbering them from sequence. offset is the position of text in
+    the whole transcript.
+    """
+    for title, name, start, end in spans:
+        member_id = roster.resolve(name, date, title=title) if roster is not None else None
+        
+        yield make_segment(
+            name=f"{title} {name}",
+            member_id=member_id,
+            text=clean_speech_text(text[start:end]),
+            date=date,
+            sequence=sequence,
+            start=offset + start,
+            end=offset + end
+        )
+        sequence += 1
+
+
+class BillContextScan:
+    """
+    The bill, calendar and rules report numbers last read before an
+    offset into a transcript fed in order, in pieces or whole.
+    
+    Bills are announced in the Clerk's readings between speeches
+    ("Assembly No. A02278-A, Calendar No. 91"). Each call to before()
+    scans only the text since the previous one, and only that text is
+    kept, so streaming ingest carries the context across chunks without
+    holding the transcript.
+    """
+    
+    def __init__(self, text: str = ''):
+        self.text = text
+        self.offset = 0  # position of text in the whole transcript
+        self.pos = 0     # where the next match may start, in text
+        self.context = {'bill_number': None, 'calendar_number': None, 'rules_report_number': None}
+    
+    def feed(self, chunk: str):
+        self.text += chunk
+    
+    def before(self, start: int) -> dict:
+        """Context read before offset start; offsets must not decrease between calls"""
+        scan = PATTERNS['bill_context']
+        end = start - self.offset
+        match = scan.search(self.text, self.pos, end)
+        while match is not None:
+            kind = match.lastgroup
+            if kind == 'bill_number':
+                # A new bill clears the numbers that follow it in the reading
+                self.context = {'bill_number': None, 'calendar_number': None, 'rules_report_number': None}
+            self.context[BILL_KINDS[kind]] = match.group(scan.groupindex[kind] + 1).upper()
+            self.pos = match.end()
+            match = scan.search(self.text, self.pos, end)
+        
+        # Nothing more starts before end; keep one character before it
+        # for the patterns' word boundaries
+        self.pos = max(self.pos, end)
+        cut = self.pos - 1
+        if cut > 0:
+            self.text = self.text[cut:]
+            self.offset += cut
+            self.pos -= cut
+        return self.context
+
+
+def attach_bill_context(text: str, segments):
+    """
+    Yield each segment with the bill, calendar and rules report numbers
+    last read before it started: one pass over the matches in text and
+    the segments (in order, with their offsets into text) together.
+    """
+    scan = BillContextScan(text)
+    for segment in segments:
+        yield segment._replace(**scan.before(segment.start))
+
+
+def _runs(segments, key):
+    """(key value, first segment, last segment) for each run of consecutive segments sharing key(segment)"""
+    runs = []
+    for segment in segments:
+        value = key(segment)
+        if runs and runs[-1][0] == value:
+            runs[-1][2] = segment
+        else:
+            runs.append([value, segment, segment])
+    return runs
+
+
+def table_of_contents(text: str, segments: list[Segment]) -> dict:
+    """
+    Navigation for one session: speaker turns, bill sections and the
+    segments on each page, as sequence number ranges that
+    /segments?date=&from_seq=&to_seq= returns.
+    
+    Args:
+        segments: segment_transcript(text, ...), with offsets into text
+    
+    Returns:
+        {'segments': count,
+         'speakers': [{'name', 'memberId', 'fromSequence', 'toSequence'}, ...],
+         'bills': [{'billNumber', 'calendarNumber', 'rulesReportNumber', 'fromSequence', 'toSequence'}, ...],
+         'pages': [{'page', 'fromSequence', 'toSequence'}, ...]}
+    """
+    speakers = [
+        {'name': first.name, 'memberId': first.member_id,
+         'fromSequence': first.sequence, 'toSequence': last.sequence}
+        for _, first, last in _runs(segments, lambda segment: (segment.name, segment.member_id))
+    ]
+    bills = [
+        {'billNumber': first.bill_number, 'calendarNumber': first.calendar_number,
+         'rulesReportNumber': first.rules_report_number,
+         'fromSequence': first.sequence, 'toSequence': last.sequence}
+        for (bill_number, _), first, last in _runs(segments, lambda segment: (segment.bill_number, segment.calendar_number))
+        if bill_number is not None
+    ]
+    
+    # Page k starts after its header; the text before the first header is page 1
+    page_starts = [(1, 0)]
+    for match in PATTERNS['page_number'].finditer(text):
+        expected = str(page_starts[-1][0] + 1)
+        # The number may run into digits of the first line ("\n42025 budget")
+        number = match.group(1)
+        page = int(expected) if number.startswith(expected) else int(number)
+        page_starts.append((page, match.start(1) + len(str(page))))
+    
+    starts = [segment.start for segment in segments]
+    pages = []
+    for k, (page, begin) in enumerate(page_starts):
+        end = page_starts[k + 1][1] if k + 1 < len(page_starts) else len(text)
+        first = max(bisect_right(starts, begin) - 1, 0)
+        if first < len(segments) and segments[first].end <= begin:
+            first += 1  # begin falls between speeches
+        last = bisect_right(starts, end - 1) - 1
+        if first <= last:
+            pages.append({'page': page, 'fromSequence': segments[first].sequence,
+                          'toSequence': segments[last].sequence})
+    
+    return {'segments': len(segments), 'speakers': speakers, 'bills': bills, 'pages': pages}
+
+
+def toc_bytes(toc: dict) -> bytes:
+    """Stored form of a table_of_contents: zlib-compressed JSON, encoded as the API responds"""
+    return zlib.compress(json.dumps(toc, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+
 def clean_speech_text(text: str) -> str:
     """
     Clean up speech text by removing date artifacts and other noise.
@@ -70,31 +399,28 @@ def clean_speech_text(text: str) -> str:
     - Excessive whitespace
     - Leading/trailing newlines
     
+    Each pass is skipped when its trigger text is absent, and the two
+    page number passes share one pattern, so most segments are scanned
+    twice instead of five times.
     """
     # Remove the NYS ASSEMBLY date line pattern
     # Pattern: "NYS ASSEMBLY" followed by spaces and date
-    text = re.sub(
-        r'\n?NYS ASSEMBLY\s+[A-Z]+\s+\d{1,2},\s+\d{4}\s*\n?',
-        '\n',
-        text
-    )
-    
-    # Remove standalone page numbers (just digits on their own line)
-    text = re.sub(r'\n\d{1,4}\n', '\n', text)
+    if 'NYS ASSEMBLY' in text:
+        text = PATTERNS['date_line'].sub('\n', text)
     
-    # Remove page numbers at start of lines (like "2to dispense")
-    text = re.sub(r'\n\d{1,3}([a-z])', r'\n\1', text)
+    # Remove standalone page numbers and page numbers at start of lines
+    text = PATTERNS['line_page_number'].sub('\n', text)
     
     # Clean up multiple newlines to max 2
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    if '\n\n\n' in text:
+        text = PATTERNS['extra_newlines'].sub('\n\n', text)
     
     # Clean up multiple spaces
-    text = re.sub(r' {2,}', ' ', text)
+    if '  ' in text:
+        text = PATTERNS['extra_spaces'].sub(' ', text)
     
     # Strip leading/trailing whitespace
-    text = text.strip()
-    
-    return text
+    return text.strip()
 
 def extract_bill_context(text: str) -> dict:
         """Extract current bill context from text"""
@@ -118,6 +444,62 @@ def extract_bill_context(text: str) -> dict:
         return context
 
 
+def scan_speech(text: str) -> dict:
+    """
+    Run the interaction and sentiment patterns over a speech in one pass.
+    
+    Equivalent to analyze_sentiment(text) plus separate
+    yield_question.search, direct_address.finditer and
+    thank_response.search calls.
+    
+    Returns:
+        {'sentiment': analyze_sentiment label,
+         'question': (snippet, name or None for "the sponsor") or None,
+         'addresses': [(snippet, address), ...] in text order,
+         'response': (snippet, address) or None}
+    """
+    scan = PATTERNS['interaction_scan']
+    question_group = scan.groupindex['yield_question'] + 1
+    address_group = scan.groupindex['direct_address'] + 1
+    response_group = scan.groupindex['thank_response'] + 1
+    
+    found = set()
+    question = None
+    response = None
+    addresses = []
+    address_end = 0
+    
+    for match in scan.finditer(text):
+        kind = match.lastgroup
+        
+        if kind == 'direct_address':
+            # finditer on its own never returns overlapping addresses
+            if match.start() >= address_end:
+                address = match.group(address_group)
+                addresses.append((address, address))
+                address_end = match.start() + len(address)
+        elif kind not in found:
+            found.add(kind)
+            if kind == 'yield_question':
+                question = (match.group(kind), match.group(question_group))
+            elif kind == 'thank_response':
+                response = (match.group(kind), match.group(response_group))
+    
+    # Same priority order as analyze_sentiment
+    for sentiment in ('amendment_offer', 'disagreement', 'agreement'):
+        if sentiment in found:
+            break
+    else:
+        sentiment = 'neutral'
+    
+    return {
+        'sentiment': sentiment,
+        'question': question,
+        'addresses': addresses,
+        'response': response
+    }
+
+
 def analyze_sentiment(text: str) -> str:
     """
     Determine sentiment/tone of the text.
@@ -136,15 +518,18 @@ def analyze_sentiment(text: str) -> str:
         return 'neutral'
 
     
-def extract_interactions(
-    speaker_data: list[dict],
-    mem_table = None
-) -> list[dict]:
-    interactions = []
+def build_member_index(speaker_data: list[dict]) -> dict:
+    """
+    Build the name lookups used by extract_interactions.
     
-    # Extract all member names and create lookup
-    member_name_set = set()
-    member_name_to_id = {}
+    Build it once from a roster of segments (one transcript or many) and
+    pass it as mem_table to reuse it across transcripts.
+    
+    Returns:
+        {'name_to_id': {full name: member_id},
+         'suffix_to_name': {name suffix: full name}}
+    """
+    name_to_id = {}
     
     for entry in speaker_data:
         name = entry['name'].upper().strip()
@@ -152,8 +537,38 @@ def extract_interactions(
         
         # Only include actual members (not speakers/clerks without IDs)
         if member_id is not None:
-            member_name_set.add(name)
-            member_name_to_id[name] = member_id
+            name_to_id[name] = member_id
+    
+    # Every suffix of every name, so "Will Mr. Smith yield" is one lookup.
+    # Exact surnames go in first so they win over longer names ending
+    # the same way (SMITH before GOLDSMITH).
+    suffix_to_name = {}
+    for name in name_to_id:
+        suffix_to_name.setdefault(name.split()[-1], name)
+    for name in name_to_id:
+        for i in range(len(name)):
+            suffix_to_name.setdefault(name[i:], name)
+    
+    return {'name_to_id': name_to_id, 'suffix_to_name': suffix_to_name}
+
+
+def extract_interactions(
+    speaker_data: list[dict],
+    mem_table = None
+) -> list[Interaction]:
+    interactions = []
+    
+    # (from, to, sequence) of every interaction recorded so far
+    seen = set()
+    
+    # Member lookups, built from this transcript unless prebuilt
+    if mem_table is None:
+        mem_table = build_member_index(speaker_data)
+    member_name_to_id = mem_table['name_to_id']
+    suffix_to_name = mem_table['suffix_to_name']
+    
+    # (name, member_id, index) of the last member to speak, for "the sponsor"
+    previous = None
     
     # Process each speaker entry
     for idx, entry in enumerate(speaker_data):
@@ -162,128 +577,166 @@ def extract_interactions(
         speech_text = entry['text']
         date = entry['date']
         sequence = entry['sequence']
+        bill_number = entry.get('bill_number')
         
         # Skip if not a member OR if it's an acting speaker/clerk
         if from_member_id is None or 'ACTING SPEAKER' in from_member_name or 'CLERK' in from_member_name:
             continue
         
-        # Analyze sentiment for this speech
-        sentiment = analyze_sentiment(speech_text)
+        # Sentiment and every interaction pattern in one scan
+        scan = scan_speech(speech_text)
+        sentiment = scan['sentiment']
         
         # Check for yield/question pattern
-        yield_match = PATTERNS['yield_question'].search(speech_text)
-        if yield_match:
+        if scan['question']:
+            snippet, last_name = scan['question']
             # If named member, construct normalized name
-            if yield_match.group(1):
-                last_name = yield_match.group(1).upper()
-                to_member_name = _find_matching_member(last_name, member_name_set)
+            if last_name:
+                to_member_name = _find_matching_member(last_name.upper(), suffix_to_name)
                 to_member_id = member_name_to_id.get(to_member_name)
-            # If "the sponsor", try to find from context
+            # If "the sponsor", the last member to speak in the five speeches before
+            elif previous is not None and idx - previous[2] <= 5:
+                to_member_name, to_member_id = previous[0], previous[1]
             else:
-                to_member_name, to_member_id = _find_sponsor_from_context(speaker_data, idx, member_name_to_id)
+                to_member_name, to_member_id = None, None
             
             if to_member_name and to_member_id and to_member_id != from_member_id:
-                interactions.append({
-                    'from_member_id': from_member_id,
-                    'from_member_name': from_member_name,
-                    'to_member_id': to_member_id,
-                    'to_member_name': to_member_name,
-                    'interaction_type': 'question',
-                    'sentiment': sentiment,  # NEW
-                    'text_snippet': yield_match.group(0),
-                    'date': date,
-                    'sequence': sequence
-                })
+                seen.add((from_member_id, to_member_id, sequence))
+                interactions.append(make_interaction(
+                    from_member_id=from_member_id,
+                    from_member_name=from_member_name,
+                    to_member_id=to_member_id,
+                    to_member_name=to_member_name,
+                    interaction_type='question',
+                    sentiment=sentiment,
+                    text_snippet=snippet,
+                    date=date,
+                    sequence=sequence,
+                    bill_number=bill_number
+                ))
         
         # Check for direct address
-        address_matches = PATTERNS['direct_address'].finditer(speech_text)
-        
-        for match in address_matches:
+        for snippet, address in scan['addresses']:
             # Normalize the full address - REMOVE NEWLINES!
-            addressed_name = match.group(1).upper().strip()
+            addressed_name = address.upper().strip()
             addressed_name = re.sub(r'\s+', ' ', addressed_name)  # This replaces newlines with spaces
             
             to_member_id = member_name_to_id.get(addressed_name)
             
             # Only include if it's a known member and not self
-            if addressed_name in member_name_set and to_member_id and to_member_id != from_member_id:
+            if to_member_id and to_member_id != from_member_id:
                 # Avoid duplicates from yield pattern
-                if not any(
-                    i['from_member_id'] == from_member_id and 
-                    i['to_member_id'] == to_member_id and 
-                    i['sequence'] == sequence
-                    for i in interactions
-                ):
-                    interactions.append({
-                        'from_member_id': from_member_id,
-                        'from_member_name': from_member_name,
-                        'to_member_id': to_member_id,
-                        'to_member_name': addressed_name,
-                        'interaction_type': 'address',
-                        'sentiment': sentiment,  # NEW
-                        'text_snippet': match.group(0),
-                        'date': date,
-                        'sequence': sequence
-                    })
+                key = (from_member_id, to_member_id, sequence)
+                if key not in seen:
+                    seen.add(key)
+                    interactions.append(make_interaction(
+                        from_member_id=from_member_id,
+                        from_member_name=from_member_name,
+                        to_member_id=to_member_id,
+                        to_member_name=addressed_name,
+                        interaction_type='address',
+                        sentiment=sentiment,
+                        text_snippet=snippet,
+                        date=date,
+                        sequence=sequence,
+                        bill_number=bill_number
+                    ))
                 break  # Only record first address per speech
         
         # Check for thank you response
-        thank_match = PATTERNS['thank_response'].search(speech_text)
-        if thank_match:
-            addressed_name = thank_match.group(1).upper().strip()
+        if scan['response']:
+            snippet, address = scan['response']
+            addressed_name = address.upper().strip()
             addressed_name = re.sub(r'\s+', ' ', addressed_name)
             
             to_member_id = member_name_to_id.get(addressed_name)
             
-            if addressed_name in member_name_set and to_member_id and to_member_id != from_member_id:
-                if not any(
-                    i['from_member_id'] == from_member_id and 
-                    i['to_member_id'] == to_member_id and 
-                    i['sequence'] == sequence
-                    for i in interactions
-                ):
-                    interactions.append({
-                        'from_member_id': from_member_id,
-                        'from_member_name': from_member_name,
-                        'to_member_id': to_member_id,
-                        'to_member_name': addressed_name,
-                        'interaction_type': 'response',
-                        'sentiment': sentiment,  # NEW
-                        'text_snippet': thank_match.group(0),
-                        'date': date,
-                        'sequence': sequence
-                    })
+            if to_member_id and to_member_id != from_member_id:
+                key = (from_member_id, to_member_id, sequence)
+                if key not in seen:
+                    seen.add(key)
+                    interactions.append(make_interaction(
+                        from_member_id=from_member_id,
+                        from_member_name=from_member_name,
+                        to_member_id=to_member_id,
+                        to_member_name=addressed_name,
+                        interaction_type='response',
+                        sentiment=sentiment,
+                        text_snippet=snippet,
+                        date=date,
+                        sequence=sequence,
+                        bill_number=bill_number
+                    ))
+        
+        previous = (from_member_name, from_member_id, idx)
     
     return interactions
 
 
-def _find_matching_member(last_name: str, member_name_set: set) -> str:
-    last_name_upper = last_name.upper()
-    for full_name in member_name_set:
-        # Check if this full name ends with the last name
-        if full_name.endswith(last_name_upper):
-            return full_name
-    return None
-
-
-def _find_sponsor_from_context(speaker_data: list[dict], current_idx: int, member_name_to_id: dict) -> tuple:
-    '''
-    Find the sponsor from context by looking back at recent speakers.
-    Returns (member_name, member_id) tuple or (None, None)
-    '''
-    # Look back up to 5 entries
-    for i in range(current_idx - 1, max(0, current_idx - 6), -1):
-        entry = speaker_data[i]
-        name = entry['name'].upper().strip()
-        member_id = entry.get('member_id')
+def build_threads(segments: list[Segment], interactions: list[Interaction]) -> list[Thread]:
+    """
+    Group a session's yield questions into debate threads: the question,
+    then the questioner's and the sponsor's turns that follow, until
+    another member takes the floor or the bill changes. The presiding
+    officer's turns ("Will the sponsor yield?") do not end a thread, and
+    a further question between the same two members continues it.
+    
+    Args:
+        segments: the session's segments in sequence order
+        interactions: extract_interactions over the same segments
+    
+    Returns:
+        [Thread(...), ...] in floor order, for the threads the sponsor
+        answered at least once
+    """
+    questions = {i.sequence: i for i in interactions if i.interaction_type == 'question'}
+    threads = []
+    current = None
+    
+    for segment in segments:
+        if current is not None and segment.bill_number != current.bill_number:
+            if current.answers:
+                threads.append(current)
+            current = None
         
-        # Skip acting speaker entries and non-members
-        if member_id is None:
+        question = questions.get(segment.sequence)
+        if question is not None:
+            if current is not None and (question.from_member_id, question.to_member_id) == \
+                    (current.questioner_id, current.sponsor_id):
+                current = current._replace(last_sequence=segment.sequence, questions=current.questions + 1)
+                continue
+            if current is not None and current.answers:
+                threads.append(current)
+            current = make_thread(
+                date=question.date,
+                bill_number=question.bill_number,
+                sponsor_id=question.to_member_id,
+                sponsor_name=question.to_member_name,
+                questioner_id=question.from_member_id,
+                questioner_name=question.from_member_name,
+                first_sequence=segment.sequence,
+                last_sequence=segment.sequence
+            )
+        elif current is None:
             continue
-        if 'ACTING SPEAKER' in name or 'CLERK' in name:
+        elif segment.member_id == current.sponsor_id:
+            current = current._replace(last_sequence=segment.sequence, answers=current.answers + 1)
+        elif segment.member_id == current.questioner_id:
+            current = current._replace(last_sequence=segment.sequence, questions=current.questions + 1)
+        elif segment.member_id is None or 'ACTING SPEAKER' in segment.name or 'CLERK' in segment.name:
             continue
-        
-        # Return the name and ID
-        return (name, member_id)
+        else:
+            # Another member has the floor
+            if current.answers:
+                threads.append(current)
+            current = None
     
-    return (None, None)
\ No newline at end of file
+    if current is not None and current.answers:
+        threads.append(current)
+    return threads
+
+
+def _find_matching_member(last_name: str, suffix_to_name: dict) -> str:
+    # Full name ending with the last name, if any
+    return suffix_to_name.get(last_name.upper())
+
@@ -0,0 +1,245 @@
+import hashlib
+import importlib
+import inspect
+import json
+import os
+
+import chunk_scripts
+from chunk_scripts import PATTERNS, SCAN_KINDS
+from records import Interaction, Segment
+
+try:
+    # The API's metrics module, under the name the API imports it by
+    from metrics import record_cache
+except ImportError:
+    from API.metrics import record_cache
+
+# The chunk pipeline as stages whose outputs are cached on disk:
+#
+#   raw           transcript text as scraped
+#   spans         (title, name, start, end) of each speech in the raw text
+#   segments      cleaned speech text, member IDs and bill for each span
+#   interactions  extract_interactions over the segments
+#
+# Each artifact is keyed by the code of the stage that produced it (its
+# functions, including the records and roster code shaping its output,
+# and its PATTERNS entries) and by the key of its input, so tuning
+# an interaction pattern re-runs only extract_interactions over cached
+# segments, while tuning the speaker patterns re-runs everything after raw.
+
+STAGES = {
+    'spans': {
+        'functions': ('iter_speaker_spans', '_speaker_spans'),
+        'patterns': ('speaker_boundary', 'speaker_header'),
+    },
+    'segments': {
+        'functions': ('segments_from_spans', 'clean_speech_text', 'attach_bill_context', 'BillContextScan',
+                      'records:make_segment', 'API.roster:Roster', 'API.roster:session_year_of',
+                      'API.roster:spoken_surname', 'API.roster:surname_key', 'API.roster:initials_of'),
+        'patterns': ('date_line', 'line_page_number', 'extra_newlines', 'extra_spaces', 'bill_context'),
+    },
+    'interactions': {
+        'functions': ('extract_interactions', 'scan_speech', 'build_member_index', '_find_matching_member',
+                      'records:make_interaction', 'API.roster:Roster'),
+        'patterns': ('interaction_scan',) + SCAN_KINDS,
+    },
+}
+
+_versions = {}
+
+def stage_sources(stage: str) -> list[str]:
+    """
+    Source of each function a stage runs. Names are chunk_scripts
+    attributes, or 'module:qualified.name' for code elsewhere (the
+    roster resolves member IDs and builds the member index).
+    """
+    sources = []
+    for name in STAGES[stage]['functions']:
+        module, _, qualname = name.rpartition(':')
+        obj = importlib.import_module(module) if module else chunk_scripts
+        for attribute in qualname.split('.'):
+            obj = getattr(obj, attribute)
+        sources.append(inspect.getsource(obj))
+    return sources
+
+
+def stage_version(stage: str) -> str:
+    """Hash of the code and patterns a stage runs"""
+    if stage not in _versions:
+        digest = hashlib.sha1()
+        for source in stage_sources(stage):
+            digest.update(source.encode('utf-8'))
+        for name in STAGES[stage]['patterns']:
+            pattern = PATTERNS[name]
+            digest.update(f"{name}\0{pattern.pattern}\0{pattern.flags}\0".encode('utf-8'))
+        digest.update(repr((Segment._fields, Interaction._fields)).encode('utf-8'))
+        _versions[stage] = digest.hexdigest()[:12]
+    return _versions[stage]
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class Pipeline:
+    """
+    Run the chunk stages for one transcript at a time, reusing cached
+    artifacts from cache_dir.
+
+    Args:
+        cache_dir: directory for the artifacts (created if missing)
+        roster: API/roster.py Roster for member IDs; its rows are part of
+            the segments and interactions keys
+    """
+
+    def __init__(self, cache_dir: str, roster=None):
+        self.cache_dir = cache_dir
+        self.roster = roster
+        self.roster_key = _digest(json.dumps(roster.rows)) if roster is not None else ''
+        self.member_indexes = {}
+        # stage -> [cache hits, runs]
+        self.stats = {stage: [0, 0] for stage in ('raw', *STAGES)}
+
+    # Artifact files
+
+    def _path(self, stage: str, date: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{date}.{key}.json")
+
+    def _load(self, stage: str, date: str, key: str):
+        try:
+            with open(self._path(stage, date, key), 'r') as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            record_cache(f"pipeline_{stage}", False)
+            return None
+        record_cache(f"pipeline_{stage}", True)
+        self.stats[stage][0] += 1
+        return value
+
+    def _save(self, stage: str, date: str, key: str, value):
+        path = self._path(stage, date, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Replace any artifact from an older version of the stage
+        prefix = f"{date}."
+        for name in os.listdir(os.path.dirname(path)):
+            if name.startswith(prefix) and name.endswith('.json'):
+                os.remove(os.path.join(os.path.dirname(path), name))
+        tmp = path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(value, f, separators=(',', ':'))
+        os.replace(tmp, path)
+        self.stats[stage][1] += 1
+
+    # Stages
+
+    def keys(self, raw_key: str) -> dict:
+        """Artifact key of every stage for a raw transcript key"""
+        keys = {'raw': raw_key}
+        keys['spans'] = _digest(stage_version('spans'), keys['raw'])
+        keys['segments'] = _digest(stage_version('segments'), keys['spans'], self.roster_key)
+        keys['interactions'] = _digest(stage_version('interactions'), keys['segments'])
+        return keys
+
+    def add_raw(self, date: str, text: str) -> str:
+        """Store a scraped transcript; returns its key"""
+        key = _digest(text)
+        stored = os.path.exists(self._path('raw', date, key))
+        record_cache("pipeline_raw", stored)
+        if stored:
+            self.stats['raw'][0] += 1
+        else:
+            self._save('raw', date, key, text)
+        return key
+
+    def raw(self, date: str):
+        """(text, key) of the stored transcript for date, or (None, None)"""
+        directory = os.path.join(self.cache_dir, 'raw')
+        prefix = f"{date}."
+        if os.path.isdir(directory):
+            for name in os.listdir(directory):
+                if name.startswith(prefix) and name.endswith('.json'):
+                    key = name[len(prefix):-len('.json')]
+                    return self._load('raw', date, key), key
+        return None, None
+
+    def spans(self, date: str, text: str, keys: dict) -> list:
+        spans = self._load('spans', date, keys['spans'])
+        if spans is None:
+            spans = [list(span) for span in chunk_scripts.iter_speaker_spans(text)]
+            self._save('spans', date, keys['spans'], spans)
+        return spans
+
+    def segments(self, date: str, text: str, keys: dict) -> list[Segment]:
+        rows = self._load('segments', date, keys['segments'])
+        if rows is not None:
+            return [Segment(*row) for row in rows]
+
+        spans = self.spans(date, text, keys)
+        segments = chunk_scripts.segments_from_spans(text, spans, date, self.roster)
+        segments = list(chunk_scripts.attach_bill_context(text, segments))
+        self._save('segments', date, keys['segments'], segments)
+        return segments
+
+    def interactions(self, date: str, segments: list[Segment], keys: dict) -> list[Interaction]:
+        rows = self._load('interactions', date, keys['interactions'])
+        if rows is not None:
+            return [Interaction(*row) for row in rows]
+
+        interactions = chunk_scripts.extract_interactions(segments, self._member_index(date))
+        self._save('interactions', date, keys['interactions'], interactions)
+        return interactions
+
+    def _member_index(self, date: str):
+        """Member lookups for the transcript's session, or None to build them from its segments"""
+        if self.roster is None:
+            return None
+        from API.roster import session_year_of
+        session_year = session_year_of(date)
+        if session_year not in self.member_indexes:
+            self.member_indexes[session_year] = chunk_scripts.build_member_index(self.roster.speakers(date))
+        return self.member_indexes[session_year]
+
+    def run(self, date: str, text: str = None) -> tuple[list[Segment], list[Interaction]]:
+        """
+        Segments and interactions for one transcript, running only the
+        stages whose code or input changed. Without text, the stored raw
+        transcript is used.
+        """
+        if text is None:
+            text, raw_key = self.raw(date)
+            if text is None:
+                raise KeyError(date)
+        else:
+            raw_key = self.add_raw(date, text)
+
+        keys = self.keys(raw_key)
+        segments = self.segments(date, text, keys)
+        interactions = self.interactions(date, segments, keys)
+        return segments, interactions
+
+
+if __name__ == '__main__':
+    # python pipeline.py transcipts.json .pipeline_cache [members.json]
+    #   runs every transcript and reports which stages were reused
+    import sys
+    import time
+    from API.roster import Roster
+
+    source, cache_dir = sys.argv[1:3]
+    roster = Roster.from_members_json(sys.argv[3]) if len(sys.argv) > 3 else None
+    with open(source, 'r') as f:
+        transcripts = json.load(f)
+
+    pipeline = Pipeline(cache_dir, roster)
+    started = time.perf_counter()
+    segment_count = interaction_count = 0
+    for date, text in transcripts.items():
+        segments, interactions = pipeline.run(date, text)
+        segment_count += len(segments)
+        interaction_count += len(interactions)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(transcripts)} transcripts, {segment_count} segments, "
+          f"{interaction_count} interactions in {elapsed:.2f}s")
+    for stage, (hits, runs) in pipeline.stats.items():
+        print(f"  {stage:<13} {hits} cached, {runs} run")
@@ -0,0 +1,124 @@
+from sys import intern
+from typing import NamedTuple, Optional
+
+# Read access by key, so records work wherever the old dicts were read
+# (segment['text'], interaction.get('to_member_id'), dict(record)).
+# Records are immutable; use record._replace(field=value) to change one.
+
+def _getitem(self, key):
+    if isinstance(key, str):
+        if key in self._fields:
+            return getattr(self, key)
+        raise KeyError(key)
+    return tuple.__getitem__(self, key)
+
+def _get(self, key, default=None):
+    return getattr(self, key, default) if key in self._fields else default
+
+def _keys(self):
+    return self._fields
+
+def _items(self):
+    return zip(self._fields, self)
+
+def _contains(self, key):
+    return key in self._fields
+
+
+class Segment(NamedTuple):
+    """
+    One speech, as produced by chunk_scripts.iter_segments.
+
+    start and end are the offsets of the raw speech in the transcript
+    text, so text can be dropped and rebuilt from the transcript. The
+    bill fields are the Clerk's last reading before the speech
+    (chunk_scripts.BillContextScan).
+    """
+    name: str
+    member_id: Optional[int]
+    text: str
+    date: str
+    sequence: int
+    start: Optional[int] = None
+    end: Optional[int] = None
+    bill_number: Optional[str] = None
+    calendar_number: Optional[str] = None
+    rules_report_number: Optional[str] = None
+
+    __getitem__ = _getitem
+    __contains__ = _contains
+    get = _get
+    keys = _keys
+    items = _items
+
+
+class Interaction(NamedTuple):
+    """One member-to-member interaction, as produced by chunk_scripts.extract_interactions"""
+    from_member_id: int
+    from_member_name: str
+    to_member_id: int
+    to_member_name: str
+    interaction_type: str
+    sentiment: str
+    text_snippet: str
+    date: str
+    sequence: int
+    bill_number: Optional[str] = None
+
+    __getitem__ = _getitem
+    __contains__ = _contains
+    get = _get
+    keys = _keys
+    items = _items
+
+
+class Thread(NamedTuple):
+    """
+    One debate thread, as produced by chunk_scripts.build_threads: a
+    questioner and the sponsor they asked to yield, over sequence numbers
+    first_sequence to last_sequence of the session. questions and answers
+    count the two members' turns.
+    """
+    date: str
+    bill_number: Optional[str]
+    sponsor_id: int
+    sponsor_name: str
+    questioner_id: int
+    questioner_name: str
+    first_sequence: int
+    last_sequence: int
+    questions: int = 1
+    answers: int = 0
+
+    __getitem__ = _getitem
+    __contains__ = _contains
+    get = _get
+    keys = _keys
+    items = _items
+
+
+def make_segment(name: str, member_id, text: str, date: str, sequence: int,
+                 start: int = None, end: int = None) -> Segment:
+    """Segment with the speaker name and date interned, since they repeat across a session"""
+    return Segment(intern(name), member_id, text, intern(date), sequence, start, end)
+
+
+def make_interaction(from_member_id, from_member_name, to_member_id, to_member_name,
+                     interaction_type, sentiment, text_snippet, date, sequence,
+                     bill_number: str = None) -> Interaction:
+    """Interaction with its repeated strings interned"""
+    return Interaction(
+        from_member_id, intern(from_member_name), to_member_id, intern(to_member_name),
+        interaction_type, sentiment, text_snippet, intern(date), sequence,
+        intern(bill_number) if bill_number is not None else None
+    )
+
+
+def make_thread(date, bill_number, sponsor_id, sponsor_name, questioner_id, questioner_name,
+                first_sequence, last_sequence) -> Thread:
+    """Thread opened by a question, with its repeated strings interned"""
+    return Thread(
+        intern(date), intern(bill_number) if bill_number is not None else None,
+        sponsor_id, intern(sponsor_name), questioner_id, intern(questioner_name),
+        first_sequence, last_sequence
+    )
@@ -1,6 +1,5 @@
 import requests 
 from bs4 import BeautifulSoup
-import json
 import PyPDF2
 from io import BytesIO
 import gc
@@ -71,10 +70,8 @@ def get_pdf_url_via_curl(transcript_url):
     return None
 
 
-def scrape_transcript_pdfs(transcript_dict, n=None):
-    transcript_texts = {}
-    
-    # Group by cleaned date
+def group_transcript_parts(transcript_dict):
+    """Group scraped links by cleaned date: {date: [(raw_date, url), ...]} with parts in order"""
     date_groups = {}
     for raw_date, transcript_url in transcript_dict.items():
         cleaned = clean_date(raw_date)
@@ -88,49 +85,63 @@ def scrape_transcript_pdfs(transcript_dict, n=None):
     for cleaned in date_groups:
         date_groups[cleaned].sort(key=lambda x: x[0])
     
-    count = 0
-    for cleaned, parts in date_groups.items():
-        if n and count >= n:
-            break
+    return date_groups
+
+
+def iter_transcript_pages(parts):
+    """
+    Yield a session's text one PDF page at a time, with the
+    "--- PART n ---" separators; ''.join() of the pages is the
+    combined text scrape_transcript_pdfs stores.
+    
+    Only one part is held in memory at a time. A part that fails to
+    download or parse is skipped whole, as before.
+    """
+    for idx, (raw_date, transcript_url) in enumerate(parts, 1):
+        print(f"  {raw_date}...")
         
-        combined_text = ""
+        pdf_url = get_pdf_url_via_curl(transcript_url)
         
-        print(f"Processing {cleaned} ({len(parts)} parts)")
+        if not pdf_url:
+            print(f"    Could not get PDF URL")
+            continue
         
-        for idx, (raw_date, transcript_url) in enumerate(parts, 1):
-            print(f"  {raw_date}...")
+        try:
+            pdf_response = requests.get(pdf_url, timeout=30)
+            pdf_response.raise_for_status()
             
-            pdf_url = get_pdf_url_via_curl(transcript_url)
+            pdf_bytes = BytesIO(pdf_response.content)
+            pdf_reader = PyPDF2.PdfReader(pdf_bytes)
             
-            if not pdf_url:
-                print(f"    Could not get PDF URL")
-                continue
+            pages = [page.extract_text() + "\n" for page in pdf_reader.pages]
             
-            try:
-                pdf_response = requests.get(pdf_url, timeout=30)
-                pdf_response.raise_for_status()
-                
-                pdf_bytes = BytesIO(pdf_response.content)
-                pdf_reader = PyPDF2.PdfReader(pdf_bytes)
-                
-                part_text = ""
-                for page in pdf_reader.pages:
-                    part_text += page.extract_text() + "\n"
-                
-                if len(parts) > 1:
-                    combined_text += f"\n\n--- PART {idx} ---\n\n"
-                combined_text += part_text
-                
-                pdf_bytes.close()
-                del pdf_bytes
-                del pdf_response
-                gc.collect()
-                
-                print(f"    Extracted {len(part_text)} chars")
-                
-            except Exception as e:
-                print(f"    Error: {e}")
-                continue
+            pdf_bytes.close()
+            del pdf_bytes
+            del pdf_response
+            gc.collect()
+            
+        except Exception as e:
+            print(f"    Error: {e}")
+            continue
+        
+        print(f"    Extracted {sum(len(page) for page in pages)} chars")
+        
+        if len(parts) > 1:
+            yield f"\n\n--- PART {idx} ---\n\n"
+        yield from pages
+
+
+def scrape_transcript_pdfs(transcript_dict, n=None):
+    transcript_texts = {}
+    
+    count = 0
+    for cleaned, parts in group_transcript_parts(transcript_dict).items():
+        if n and count >= n:
+            break
+        
+        print(f"Processing {cleaned} ({len(parts)} parts)")
+        
+        combined_text = "".join(iter_transcript_pages(parts))
         
         if combined_text:
             transcript_texts[cleaned] = combined_text
@@ -138,4 +149,26 @@ def scrape_transcript_pdfs(transcript_dict, n=None):
         
         count += 1
     
-    return transcript_texts
\ No newline at end of file
+    return transcript_texts
+
+
+def scrape_transcript_segments(transcript_dict, roster=None, n=None):
+    """
+    Download and segment sessions without building their full text.
+    
+    Yields (date, segment dict) as each speech completes; see
+    chunk_scripts.iter_segments.
+    """
+    from chunk_scripts import iter_segments
+    
+    count = 0
+    for cleaned, parts in group_transcript_parts(transcript_dict).items():
+        if n and count >= n:
+            break
+        
+        print(f"Processing {cleaned} ({len(parts)} parts)")
+        
+        for segment in iter_segments(iter_transcript_pages(parts), cleaned, roster):
+            yield cleaned, segment
+        
+        count += 1
@@ -0,0 +1,44 @@
+"""
+pytest setup: the modules under test are scripts, not an installed
+package. chunk_scripts, records and pipeline live at the repo root and
+the API modules in API/, imported by bare name as when the API runs from
+that directory.
+
+Run with: python -m pytest -q test
+"""
+import json
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'API')]
+
+# Working copies of the scraper and API scripts from the notebooks, not tests
+collect_ignore = ['test_chunk_scripts.py', 'test_api.py']
+
+
+@pytest.fixture(scope='session')
+def transcripts() -> dict:
+    """{date: transcript text} for the fixture sessions"""
+    with open(os.path.join(ROOT, 'test', 'test_transcipts.json'), 'r') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def debate() -> str:
+    """Two bills read over two pages; page 2 starts inside MR. SMITH's answer"""
+    header = 'NYS ASSEMBLY                                                      JUNE 11, 2025\n'
+    return (
+        header + "1THE CLERK:  Assembly No. A01234-A, Calendar No. 12, \nRules "
+        "Report No. 5, Mr. Smith.\n"
+        "ACTING SPEAKER HUNTER:  Mr. Jones.\n"
+        "MR. JONES:  Will the sponsor yield?\n"
+        "MR. SMITH:  Yes, I agree to \n"
+        + header + "2yield.\n"
+        "MR. JONES:  Thank you, Mr. Smith.\n"
+        "THE CLERK:  Senate No. S05678, Calendar No. 13.\n"
+        "MR. BROWN:  I move the bill.\n"
+        "(Applause)\n"
+    )
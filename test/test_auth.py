@@ -0,0 +1,48 @@
+"""
+API key loading: api_keys.json parsing and reloads.
+"""
+import json
+import os
+
+import pytest
+
+from auth import KeyStore, hash_key, parse_keys
+
+
+def test_parse_keys():
+    keys = parse_keys({
+        "raw": "secret",
+        "partner": {"hash": hash_key("p"), "tier": "partner"},
+        "custom": {"hash": hash_key("c"), "rate_limit": "10/minute;100/hour"},
+    })
+    assert {(info.name, info.tier, info.rate_limit) for info in keys.values()} == {
+        ("raw", "standard", None), ("partner", "partner", None), ("custom", "standard", "10/minute;100/hour"),
+    }
+    assert keys[hash_key("secret")].name == "raw"
+
+
+@pytest.mark.parametrize('data', [
+    "not an object",
+    {"bad": {"tier": "demo"}},
+    {"bad": {"hash": hash_key("x"), "tier": 3}},
+    {"bad": {"hash": hash_key("x"), "rate_limit": 60}},
+    # Parsed as no limit at all by the limiter, so never loaded
+    {"bad": {"hash": hash_key("x"), "rate_limit": "lots"}},
+    {"bad": {"hash": hash_key("x"), "rate_limit": ""}},
+])
+def test_parse_keys_rejects(data):
+    with pytest.raises(ValueError):
+        parse_keys(data)
+
+
+def test_refresh_keeps_keys_on_bad_file(tmp_path, capsys):
+    path = tmp_path / 'api_keys.json'
+    path.write_text(json.dumps({"demo": {"hash": hash_key("d"), "tier": "demo"}}))
+    store = KeyStore(str(path))
+    assert store.verify("d").tier == "demo"
+
+    path.write_text(json.dumps({"demo": {"hash": hash_key("d"), "rate_limit": "lots"}}))
+    os.utime(path, ns=(1, 1))  # a new version even where mtimes are coarse
+    store.refresh()
+    assert store.verify("d").rate_limit is None
+    assert "'lots'" in capsys.readouterr().out
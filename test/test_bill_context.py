@@ -0,0 +1,64 @@
+"""
+Bill context: the Clerk's last bill, calendar and rules report reading
+before each speech, tracked in one pass while segmenting.
+"""
+from chunk_scripts import PATTERNS, attach_bill_context, iter_segments, segment_transcript
+
+KINDS = {'bill_number': 'bill_number', 'calendar_number': 'calendar_number',
+         'rules_report': 'rules_report_number'}
+
+
+def reference_context(text: str, start: int) -> dict:
+    """Every reading before start, rescanned from the top of the transcript"""
+    readings = sorted(
+        (match.start(), kind, match.group(1).upper())
+        for kind in KINDS for match in PATTERNS[kind].finditer(text[:start])
+    )
+    context = dict.fromkeys(KINDS.values())
+    for _, kind, value in readings:
+        if kind == 'bill_number':
+            context = dict.fromkeys(KINDS.values())
+        context[KINDS[kind]] = value
+    return context
+
+
+def test_bill_context_matches_rescanning(transcripts):
+    for date, text in transcripts.items():
+        # A sample, as each rescan reads the transcript up to the segment
+        for segment in segment_transcript(text, date)[::40]:
+            assert reference_context(text, segment.start) == {
+                field: segment[field] for field in KINDS.values()
+            }
+
+
+def test_bill_context(debate):
+    segments = segment_transcript(debate, 'd')
+    context = [(s.name, s.bill_number, s.calendar_number, s.rules_report_number) for s in segments]
+    assert context == [
+        ('ACTING SPEAKER HUNTER', 'A01234-A', '12', '5'),
+        ('MR. JONES', 'A01234-A', '12', '5'),
+        ('MR. SMITH', 'A01234-A', '12', '5'),
+        ('MR. JONES', 'A01234-A', '12', '5'),
+        # A new bill clears the rules report of the previous one
+        ('MR. BROWN', 'S05678', '13', None),
+    ]
+
+
+def test_bill_context_before_first_reading():
+    text = ("MR. JONES:  Good morning.\n"
+            "THE CLERK:  Assembly No. A00002, Calendar No. 3.\n"
+            "MR. SMITH:  Hello.\n"
+            "(Applause)\n")
+    segments = segment_transcript(text, 'd')
+    assert [(s.name, s.bill_number, s.calendar_number) for s in segments] == [
+        ('MR. JONES', None, None),
+        ('MR. SMITH', 'A00002', '3'),
+    ]
+
+
+def test_attach_bill_context_matches_streaming(debate):
+    expected = segment_transcript(debate, 'd')
+    bare = [s._replace(bill_number=None, calendar_number=None, rules_report_number=None) for s in expected]
+    assert list(attach_bill_context(debate, bare)) == expected
+    assert list(iter_segments(debate.splitlines(keepends=True), 'd')) == expected
+    assert list(iter_segments(debate, 'd')) == expected  # one character per chunk
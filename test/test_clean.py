@@ -0,0 +1,48 @@
+"""
+clean_speech_text against the original five-pass version.
+"""
+import random
+import re
+
+from chunk_scripts import clean_speech_text, split_speakers
+
+# Fragments that exercise every pass and the interactions between them
+FRAGMENTS = [
+    '\n', '\n', '\n', '1', '23', '4567', '8', 'a', 'to', 'X', ' ', '  ', '   ', '\t',
+    'NYS ASSEMBLY', 'JUNE', ' 11,', ' 2025',
+]
+
+
+def reference_clean(text: str) -> str:
+    """clean_speech_text as originally written, one re.sub per step"""
+    text = re.sub(
+        r'\n?NYS ASSEMBLY\s+[A-Z]+\s+\d{1,2},\s+\d{4}\s*\n?',
+        '\n',
+        text
+    )
+    text = re.sub(r'\n\d{1,4}\n', '\n', text)
+    text = re.sub(r'\n\d{1,3}([a-z])', r'\n\1', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = re.sub(r' {2,}', ' ', text)
+    return text.strip()
+
+
+def test_clean_speech_text_random():
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 20)))
+        assert clean_speech_text(text) == reference_clean(text), text
+
+
+def test_clean_speech_text_fixture(transcripts):
+    for text in transcripts.values():
+        for _, _, content in split_speakers(text):
+            assert clean_speech_text(content) == reference_clean(content)
+
+
+def test_clean_speech_text_page_artifacts():
+    text = ("Thank you, Mr. \n"
+            "NYS ASSEMBLY                                                      JUNE 11, 2025\n"
+            "12\n"
+            "3of the bill.  I   rise\n\n\n\n\n  today.  ")
+    assert clean_speech_text(text) == reference_clean(text) == 'Thank you, Mr. \nof the bill. I rise\n\n today.'
@@ -0,0 +1,192 @@
+"""
+extract_interactions against the original implementation, which scanned
+the member set per yield question, the interaction list per match and
+the five previous speeches per "the sponsor".
+"""
+import json
+import os
+import re
+
+import pytest
+
+from chunk_scripts import PATTERNS, build_member_index, clean_speech_text, extract_interactions, split_speakers
+
+MEMBERS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'members.json')
+
+
+def reference_sentiment(text: str) -> str:
+    if PATTERNS['amendment_offer'].search(text):
+        return 'amendment_offer'
+    elif PATTERNS['disagreement'].search(text):
+        return 'disagreement'
+    elif PATTERNS['agreement'].search(text):
+        return 'agreement'
+    return 'neutral'
+
+
+def reference_sponsor(speaker_data: list[dict], current_idx: int) -> tuple:
+    """The original "the sponsor" lookup, which stops short of the first speech"""
+    for i in range(current_idx - 1, max(0, current_idx - 6), -1):
+        entry = speaker_data[i]
+        name = entry['name'].upper().strip()
+        if entry.get('member_id') is None or 'ACTING SPEAKER' in name or 'CLERK' in name:
+            continue
+        return (name, entry['member_id'])
+    return (None, None)
+
+
+def reference_extract_interactions(speaker_data: list[dict]) -> list[dict]:
+    interactions = []
+    member_name_set = set()
+    member_name_to_id = {}
+    for entry in speaker_data:
+        name = entry['name'].upper().strip()
+        if entry.get('member_id') is not None:
+            member_name_set.add(name)
+            member_name_to_id[name] = entry['member_id']
+
+    def matching_member(last_name):
+        for full_name in member_name_set:
+            if full_name.endswith(last_name):
+                return full_name
+        return None
+
+    def add(from_id, from_name, to_id, to_name, kind, sentiment, snippet, entry):
+        interactions.append({
+            'from_member_id': from_id, 'from_member_name': from_name,
+            'to_member_id': to_id, 'to_member_name': to_name,
+            'interaction_type': kind, 'sentiment': sentiment, 'text_snippet': snippet,
+            'date': entry['date'], 'sequence': entry['sequence']
+        })
+
+    def duplicate(from_id, to_id, sequence):
+        return any(
+            i['from_member_id'] == from_id and i['to_member_id'] == to_id and i['sequence'] == sequence
+            for i in interactions
+        )
+
+    for idx, entry in enumerate(speaker_data):
+        from_name = entry['name'].upper().strip()
+        from_id = entry.get('member_id')
+        text = entry['text']
+        if from_id is None or 'ACTING SPEAKER' in from_name or 'CLERK' in from_name:
+            continue
+        sentiment = reference_sentiment(text)
+
+        m = PATTERNS['yield_question'].search(text)
+        if m:
+            if m.group(1):
+                to_name = matching_member(m.group(1).upper())
+                to_id = member_name_to_id.get(to_name)
+            else:
+                to_name, to_id = reference_sponsor(speaker_data, idx)
+            if to_name and to_id and to_id != from_id:
+                add(from_id, from_name, to_id, to_name, 'question', sentiment, m.group(0), entry)
+
+        for m in PATTERNS['direct_address'].finditer(text):
+            to_name = re.sub(r'\s+', ' ', m.group(1).upper().strip())
+            to_id = member_name_to_id.get(to_name)
+            if to_name in member_name_set and to_id and to_id != from_id:
+                if not duplicate(from_id, to_id, entry['sequence']):
+                    add(from_id, from_name, to_id, to_name, 'address', sentiment, m.group(0), entry)
+                break
+
+        m = PATTERNS['thank_response'].search(text)
+        if m:
+            to_name = re.sub(r'\s+', ' ', m.group(1).upper().strip())
+            to_id = member_name_to_id.get(to_name)
+            if to_name in member_name_set and to_id and to_id != from_id:
+                if not duplicate(from_id, to_id, entry['sequence']):
+                    add(from_id, from_name, to_id, to_name, 'response', sentiment, m.group(0), entry)
+
+    return interactions
+
+
+def sessions(transcripts: dict) -> list[list[dict]]:
+    """Segment dicts per fixture session, as the ingest notebook builds them"""
+    with open(MEMBERS, 'r') as f:
+        name_to_id = {m['shortName'].split()[-1]: m['memberId'] for m in json.load(f)}
+    return [
+        [
+            {'name': f"{title} {name}", 'member_id': name_to_id.get(name),
+             'text': clean_speech_text(content), 'date': date, 'sequence': seq}
+            for seq, (title, name, content) in enumerate(split_speakers(text))
+        ]
+        for date, text in transcripts.items()
+    ]
+
+
+def dense_session(size: int, roster: int = 150) -> list[dict]:
+    """Short debate speeches that all question and thank other members"""
+    names = [''.join(chr(ord('A') + int(d)) for d in f"{i:03d}") for i in range(roster)]
+    return [
+        {
+            'name': f"MR. {names[i % roster]}",
+            'member_id': i % roster + 1,
+            'text': f"Will Mr. {names[(i + 1) % roster]} yield? Thank you, Mr. {names[(i + 2) % roster]}.",
+            'date': 'dense',
+            'sequence': i
+        }
+        for i in range(size)
+    ]
+
+
+def without_bill_number(interactions) -> list[dict]:
+    # The reference predates bill_number
+    return [{k: v for k, v in i.items() if k != 'bill_number'} for i in interactions]
+
+
+def test_extract_interactions_matches_reference(transcripts):
+    for session in sessions(transcripts):
+        assert without_bill_number(extract_interactions(session)) == reference_extract_interactions(session)
+
+
+def test_extract_interactions_dense_session():
+    session = dense_session(500)
+    assert without_bill_number(extract_interactions(session)) == reference_extract_interactions(session)
+
+
+def test_prebuilt_member_index(transcripts):
+    for session in sessions(transcripts):
+        assert extract_interactions(session, build_member_index(session)) == extract_interactions(session)
+
+
+@pytest.mark.parametrize('surnames, spoken, expected', [
+    # Exact surnames win over longer names ending the same way
+    (['SMITH', 'GOLDSMITH'], 'Smith', 'MR. SMITH'),
+    (['GOLDSMITH'], 'Smith', 'MR. GOLDSMITH'),
+    (['SMITH'], 'Jones', None),
+])
+def test_named_yield_question(surnames, spoken, expected):
+    session = [
+        {'name': f"MR. {surname}", 'member_id': i + 1, 'text': 'Thank you.', 'date': 'd', 'sequence': i}
+        for i, surname in enumerate(surnames)
+    ]
+    session.append({'name': 'MR. LEE', 'member_id': 99, 'text': f"Will Mr. {spoken} yield?",
+                    'date': 'd', 'sequence': len(session)})
+    questions = [i.to_member_name for i in extract_interactions(session) if i.interaction_type == 'question']
+    assert questions == ([expected] if expected else [])
+
+
+def _speech(sequence, name, member_id, text='Thank you.'):
+    return {'name': name, 'member_id': member_id, 'text': text, 'date': 'd', 'sequence': sequence}
+
+
+def test_sponsor_is_first_speech():
+    session = [_speech(0, 'MR. SMITH', 1, 'This bill helps.'),
+               _speech(1, 'MR. JONES', 2, 'Will the sponsor yield?')]
+    # Intended change: the original lookback stopped short of the first
+    # speech of the session and dropped this question
+    assert reference_extract_interactions(session) == []
+    assert [(i.from_member_id, i.to_member_id, i.interaction_type) for i in extract_interactions(session)] == [
+        (2, 1, 'question'),
+    ]
+
+
+@pytest.mark.parametrize('officer_turns, expected', [(4, [1]), (5, [])])
+def test_sponsor_within_five_speeches(officer_turns, expected):
+    session = [_speech(0, 'ACTING SPEAKER HUNTER', None), _speech(1, 'MR. SMITH', 1)]
+    session += [_speech(2 + i, 'ACTING SPEAKER HUNTER', None) for i in range(officer_turns)]
+    session.append(_speech(len(session), 'MR. JONES', 2, 'Will the sponsor yield?'))
+    assert [i.to_member_id for i in extract_interactions(session)] == expected
+    assert without_bill_number(extract_interactions(session)) == reference_extract_interactions(session)
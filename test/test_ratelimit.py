@@ -0,0 +1,32 @@
+"""
+Shared SQLite rate limit counters.
+"""
+from limits.storage import storage_from_string
+from slowapi import Limiter
+
+from ratelimit import SQLiteStorage, rate_limit_key
+
+
+def test_storage_created_on_first_hit(tmp_path):
+    path = tmp_path / 'ratelimit.db'
+    limiter = Limiter(key_func=rate_limit_key, storage_uri=f"sqlite:///{path}")
+    assert not path.exists()
+
+    storage = limiter._storage
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.incr('key:a', 60) == 1
+    assert path.exists()
+
+
+def test_counters_shared_between_storages(tmp_path):
+    uri = f"sqlite:///{tmp_path / 'ratelimit.db'}"
+    first, second = storage_from_string(uri), storage_from_string(uri)
+    assert first.incr('key:a', 60) == 1
+    assert second.incr('key:a', 60, amount=2) == 3
+    assert first.get('key:a') == 3
+    # An expired window starts again
+    assert first.incr('key:b', -1) == 1
+    assert first.incr('key:b', 60) == 1
+    assert first.expire() == 0
+    first.clear('key:a')
+    assert second.get('key:a') == 0
@@ -0,0 +1,122 @@
+"""
+Roster name resolution, and the member index it builds for
+extract_interactions.
+"""
+import pytest
+from prometheus_client import REGISTRY
+
+from chunk_scripts import build_member_index, extract_interactions
+from roster import Roster, spoken_surname, surname_key
+
+DATE = '6-11-25'
+
+ROWS = [
+    (1, "O'DONNELL", 69, 2025),
+    (2, 'SMITH', 1, 2025),
+    (3, 'PHEFFER AMATO', 23, 2025),
+    (4, 'DE LA ROSA', 72, 2025),
+    (5, 'DE LOS SANTOS', 71, 2025),
+    (6, 'CARROLL R', 44, 2025),
+    (7, 'CARROLL P', 57, 2025),
+    (8, "D'URSO", 16, 2023),
+]
+
+
+@pytest.fixture
+def roster() -> Roster:
+    return Roster(ROWS)
+
+
+def test_surname_forms():
+    assert spoken_surname("D'Urso") == "D'URSO"
+    assert spoken_surname('CARROLL R') == 'CARROLL'
+    assert spoken_surname('De La Rosa') == 'DE LA ROSA'
+    assert surname_key("D'URSO") == surname_key('DURSO') == 'DURSO'
+
+
+def test_resolve(roster):
+    assert roster.resolve("O'DONNELL", DATE) == 1
+    assert roster.resolve('ODONNELL', DATE) == 1
+    assert roster.resolve('De La Rosa', DATE) == 4
+    # Namesakes need a district or initials
+    assert roster.resolve('CARROLL', DATE) is None
+    assert roster.resolve('CARROLL', DATE, district=57) == 7
+    assert roster.resolve('CARROLL', DATE, initials='r') == 6
+    # Only listed under the previous session
+    assert roster.resolve("D'URSO", DATE) == 8
+    assert roster.resolve('SMITH', DATE, title='THE CLERK') is None
+
+
+def test_speakers_spelled_as_spoken(roster):
+    names = {entry['name']: entry['member_id'] for entry in roster.speakers(DATE)}
+    assert names["MR. O'DONNELL"] == 1
+    assert names["MR. D'URSO"] == names['MR. DURSO'] == 8
+    assert names['MS. PHEFFER AMATO'] == names['MS. PHEFFER'] == 3
+    assert names['MS. DE LA ROSA'] == 4
+    # Shared first word, and namesakes, are left out
+    assert 'MS. DE' not in names
+    assert 'MR. CARROLL' not in names
+
+
+def _session(roster, speeches):
+    return [
+        {'name': f"{title} {name}", 'member_id': roster.resolve(name, DATE, title=title),
+         'text': text, 'date': DATE, 'sequence': sequence}
+        for sequence, (title, name, text) in enumerate(speeches)
+    ]
+
+
+def test_interactions_with_roster_index(roster):
+    session = _session(roster, [
+        ('MR.', 'SMITH', "Will Mr. O'Donnell yield?"),
+        ('MR.', "O'DONNELL", 'Yes.'),
+        ('MR.', 'SMITH', "Thank you, Mr. D'Urso."),
+        ('MR.', 'SMITH', 'As Ms. Pheffer Amato said.'),
+        ('MR.', 'SMITH', 'Mr. Odonnell, and MR. DURSO.'),
+    ])
+    mem_table = build_member_index(roster.speakers(DATE))
+    found = [(i.sequence, i.interaction_type, i.to_member_id) for i in extract_interactions(session, mem_table)]
+    assert found == [(0, 'question', 1), (2, 'address', 8), (3, 'address', 3), (4, 'address', 1)]
+
+
+def lookups() -> tuple:
+    """(misses, hits) of the roster in /metrics"""
+    return tuple(
+        REGISTRY.get_sample_value('api_cache_lookups_total', {'cache': 'roster', 'result': result}) or 0
+        for result in ('miss', 'hit')
+    )
+
+
+def test_get_roster_reloads_from_primary_after_write(tmp_path, monkeypatch):
+    from sqlalchemy import create_engine, text
+
+    import database
+    import roster as roster_module
+
+    def engine_with(rows):
+        engine = create_engine(f"sqlite:///{tmp_path / f'{len(rows)}.db'}")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE members (member_id INTEGER, name TEXT, district INTEGER, session_year INTEGER)"))
+            conn.execute(text("INSERT INTO members VALUES (:id, :name, :district, :year)"),
+                         [dict(zip(('id', 'name', 'district', 'year'), row)) for row in rows])
+        return engine
+
+    # The replica has not caught up with the primary's new member
+    primary, replica = engine_with(ROWS), engine_with(ROWS[:2])
+    router = database.ReadRouter(primary, [replica], marker=str(tmp_path / 'write.marker'))
+    monkeypatch.setattr(database, '_engines', database.Engines(primary, [replica], router))
+    monkeypatch.setattr(database, 'DATABASE_WRITE_MARKER', router.marker)
+    monkeypatch.delenv('ROSTER_PATH', raising=False)
+    roster_module.reset_roster()
+    try:
+        with replica.connect() as db:
+            before = lookups()
+            assert len(roster_module.get_roster(db)) == 2
+            assert len(roster_module.get_roster(db)) == 2
+            # Loaded once, then served from memory
+            assert lookups() == (before[0] + 1, before[1] + 1)
+            database.mark_written()
+            assert len(roster_module.get_roster(db)) == len(ROWS)
+            assert lookups()[0] == before[0] + 2
+    finally:
+        roster_module.reset_roster()
@@ -0,0 +1,59 @@
+"""
+scan_speech against running each interaction and sentiment pattern
+separately, as extract_interactions originally did.
+"""
+import random
+
+from chunk_scripts import PATTERNS, clean_speech_text, scan_speech, split_speakers
+
+FRAGMENTS = [
+    'Will ', 'the sponsor', ' yield', 'Mr. ', 'Mrs. ', 'Ms.', ' ', '\n', 'SMITH', "O'HARA", 'Lee',
+    'Thank you', ', ', 'I agree', 'yes', 'absolutely', 'I disagree', "that's right", "that's wrong",
+    'I offer the following amendment', 'amendment to', 'respectfully disagree', 'x', '.', '?',
+]
+
+
+def reference_sentiment(text: str) -> str:
+    if PATTERNS['amendment_offer'].search(text):
+        return 'amendment_offer'
+    elif PATTERNS['disagreement'].search(text):
+        return 'disagreement'
+    elif PATTERNS['agreement'].search(text):
+        return 'agreement'
+    return 'neutral'
+
+
+def separate_scans(text: str) -> dict:
+    question = PATTERNS['yield_question'].search(text)
+    response = PATTERNS['thank_response'].search(text)
+    return {
+        'sentiment': reference_sentiment(text),
+        'question': (question.group(0), question.group(1)) if question else None,
+        'addresses': [(m.group(0), m.group(1)) for m in PATTERNS['direct_address'].finditer(text)],
+        'response': (response.group(0), response.group(1)) if response else None,
+    }
+
+
+def test_scan_speech_random():
+    rng = random.Random(0)
+    for _ in range(20000):
+        text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+        assert scan_speech(text) == separate_scans(text), text
+
+
+def test_scan_speech_fixture(transcripts):
+    for text in transcripts.values():
+        for _, _, content in split_speakers(text):
+            speech = clean_speech_text(content)
+            assert scan_speech(speech) == separate_scans(speech)
+
+
+def test_scan_speech_overlapping_matches():
+    # The address inside the question and the thank-you are found too
+    scan = scan_speech("Thank you, Mr. Lee. Will Ms. O'Hara yield? I disagree.")
+    assert scan == {
+        'sentiment': 'disagreement',
+        'question': ("Will Ms. O'Hara yield", "O'Hara"),
+        'addresses': [('Mr. Lee', 'Mr. Lee'), ("Ms. O'Hara", "Ms. O'Hara")],
+        'response': ('Thank you, Mr. Lee', 'Mr. Lee'),
+    }
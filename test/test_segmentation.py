@@ -0,0 +1,82 @@
+"""
+Speaker segmentation: split_speakers against the original speaker regex,
+iter_segments over a transcript in pieces against the whole text, and
+the segment offsets that the text is rebuilt from.
+"""
+import random
+import re
+
+from chunk_scripts import clean_speech_text, iter_segments, segment_transcript, split_speakers
+
+# PATTERNS['speaker'] as originally written, one lookahead per character
+SPEAKER = re.compile(
+    r'^(MR\.|MRS\.|MS\.|ACTING SPEAKER|THE CLERK)\s+([A-Z\-\']+):\s+(.+?)(?=^(?:MR\.|MRS\.|MS\.|ACTING SPEAKER|THE CLERK|\(|\[))',
+    re.MULTILINE | re.DOTALL
+)
+
+
+def reference_split(text: str) -> list[tuple]:
+    return [m.groups() for m in SPEAKER.finditer(text)]
+
+
+def test_split_speakers_matches_speaker_regex(transcripts):
+    for text in transcripts.values():
+        assert split_speakers(text) == reference_split(text)
+
+
+def test_split_speakers_edge_cases():
+    for text in [
+        '',
+        'MR. SMITH:  No boundary after this speech',
+        'MR. SMITH:  Hello.\n',
+        'MR. SMITH:  Hello.\nMR. JONES:  Hi.\n(Applause)\n',
+        # A header inside a speech is swallowed, as by finditer
+        'MR. SMITH:  Hello.\n[MR. JONES:  Aside.]\nMR. JONES:  Hi.\n(Applause)\n',
+        # Only a line start begins a header
+        'Preamble MR. SMITH:  not a header\nMR. JONES:  Hi.\n[Pause]',
+        # The content may be a single whitespace character
+        'MR. SMITH: \nMR. JONES:  Hi.\n(Applause)',
+        "MR. O'DONNELL:  Thank you.\nACTING SPEAKER HUNTER:  Mr. Lavine.\nMS. JOYNER:  Yes.\n(",
+    ]:
+        assert split_speakers(text) == reference_split(text), text
+
+
+def pages_of(text: str) -> list[str]:
+    """Split on the per-page date line, keeping it with its page"""
+    pieces = text.split('NYS ASSEMBLY')
+    return [pieces[0]] + ['NYS ASSEMBLY' + piece for piece in pieces[1:]]
+
+
+def test_iter_segments_pages_match_whole_text(transcripts):
+    for date, text in transcripts.items():
+        assert list(iter_segments(pages_of(text), date)) == segment_transcript(text, date)
+
+
+def test_iter_segments_random_chunks(transcripts):
+    rng = random.Random(0)
+    date, text = next(iter(transcripts.items()))
+    expected = segment_transcript(text, date)
+    for _ in range(5):
+        cuts = sorted(rng.sample(range(1, len(text)), 200))
+        chunks = [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+        assert list(iter_segments(chunks, date)) == expected
+
+
+def test_iter_segments_small_chunks():
+    text = "MR. SMITH:  Hello.\nMR. JONES:  Hi\nthere.\n(Applause)\nMS. LEE:  Last.\n[Pause]"
+    expected = segment_transcript(text, 'd')
+    assert [s.text for s in expected] == ['Hello.', 'Hi\nthere.', 'Last.']
+    for size in (1, 2, 3, 7):
+        chunks = [text[i:i + size] for i in range(0, len(text), size)]
+        assert list(iter_segments(chunks, 'd')) == expected
+    assert list(iter_segments([], 'd')) == []
+
+
+def test_segment_offsets_rebuild_text(transcripts):
+    for date, text in transcripts.items():
+        segments = segment_transcript(text, date)
+        assert [s.sequence for s in segments] == list(range(len(segments)))
+        for segment in segments:
+            assert clean_speech_text(text[segment.start:segment.end]) == segment.text
+        # Speeches do not overlap
+        assert all(a.end <= b.start for a, b in zip(segments, segments[1:]))
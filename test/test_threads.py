@@ -0,0 +1,51 @@
+"""
+Debate threads: a yield question and the questioner's and sponsor's
+turns that follow it.
+"""
+from chunk_scripts import build_threads, extract_interactions
+from records import Segment, Thread
+
+DATE = '6-11-25'
+
+
+def _segment(sequence, name, member_id, text, bill_number='A00001'):
+    return Segment(name, member_id, text, DATE, sequence, bill_number=bill_number)
+
+
+SEGMENTS = [
+    _segment(0, 'MR. SMITH', 1, 'This bill helps.'),
+    _segment(1, 'ACTING SPEAKER HUNTER', None, 'Mr. Jones.'),
+    _segment(2, 'MR. JONES', 2, 'Will the sponsor yield?'),
+    _segment(3, 'ACTING SPEAKER HUNTER', None, 'Will the sponsor yield?'),
+    _segment(4, 'MR. SMITH', 1, 'I yield.'),
+    _segment(5, 'MR. JONES', 2, 'Why now?'),
+    _segment(6, 'MR. SMITH', 1, 'Because.'),
+    _segment(7, 'MR. BROWN', 3, 'Will Mr. Smith yield?'),
+    _segment(8, 'MR. SMITH', 1, 'Yes.'),
+    _segment(9, 'MR. BROWN', 3, 'Will Mr. Smith yield?'),
+    _segment(10, 'MR. LEE', 4, 'Will the sponsor yield?', bill_number='A00002'),
+]
+
+
+def test_build_threads():
+    threads = build_threads(SEGMENTS, extract_interactions(SEGMENTS))
+    assert threads == [
+        # The presiding officer's turn does not end the thread
+        Thread(DATE, 'A00001', 1, 'MR. SMITH', 2, 'MR. JONES', 2, 6, questions=2, answers=2),
+        # MR. BROWN taking the floor ends MR. JONES's thread; his second
+        # question continues his own
+        Thread(DATE, 'A00001', 1, 'MR. SMITH', 3, 'MR. BROWN', 7, 9, questions=2, answers=1),
+        # MR. LEE's question on the next bill is never answered
+    ]
+
+
+def test_build_threads_bill_change_ends_thread():
+    segments = SEGMENTS[:5] + [_segment(5, 'MR. SMITH', 1, 'Next bill.', bill_number='A00002')]
+    threads = build_threads(segments, extract_interactions(segments))
+    assert [(t.first_sequence, t.last_sequence, t.answers) for t in threads] == [(2, 4, 1)]
+
+
+def test_build_threads_without_questions():
+    segments = [s for s in SEGMENTS if 'yield?' not in s.text]
+    assert build_threads(segments, extract_interactions(segments)) == []
+
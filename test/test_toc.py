@@ -0,0 +1,56 @@
+"""
+Per-date tables of contents: speaker turns, bill sections and pages as
+segment sequence ranges.
+"""
+import json
+import zlib
+
+from chunk_scripts import segment_transcript, table_of_contents, toc_bytes
+
+
+def test_table_of_contents(debate):
+    toc = table_of_contents(debate, segment_transcript(debate, 'd'))
+    assert toc['segments'] == 5
+    assert [(s['name'], s['fromSequence'], s['toSequence']) for s in toc['speakers']] == [
+        ('ACTING SPEAKER HUNTER', 0, 0), ('MR. JONES', 1, 1), ('MR. SMITH', 2, 2),
+        ('MR. JONES', 3, 3), ('MR. BROWN', 4, 4),
+    ]
+    assert toc['bills'] == [
+        {'billNumber': 'A01234-A', 'calendarNumber': '12', 'rulesReportNumber': '5',
+         'fromSequence': 0, 'toSequence': 3},
+        {'billNumber': 'S05678', 'calendarNumber': '13', 'rulesReportNumber': None,
+         'fromSequence': 4, 'toSequence': 4},
+    ]
+    # MR. SMITH's answer runs over the page break, so it is on both pages
+    assert toc['pages'] == [
+        {'page': 1, 'fromSequence': 0, 'toSequence': 2},
+        {'page': 2, 'fromSequence': 2, 'toSequence': 4},
+    ]
+
+
+def test_table_of_contents_speaker_runs():
+    text = "MR. SMITH:  One.\nMR. SMITH:  Two.\nMS. LEE:  Three.\nMR. SMITH:  Four.\n(Applause)\n"
+    toc = table_of_contents(text, segment_transcript(text, 'd'))
+    assert [(s['name'], s['fromSequence'], s['toSequence']) for s in toc['speakers']] == [
+        ('MR. SMITH', 0, 1), ('MS. LEE', 2, 2), ('MR. SMITH', 3, 3),
+    ]
+    # No bill was read, and there are no page headers
+    assert toc['bills'] == []
+    assert toc['pages'] == [{'page': 1, 'fromSequence': 0, 'toSequence': 3}]
+
+
+def test_table_of_contents_fixture_pages(transcripts):
+    for date, text in transcripts.items():
+        segments = segment_transcript(text, date)
+        pages = table_of_contents(text, segments)['pages']
+        assert [p['page'] for p in pages] == sorted({p['page'] for p in pages})
+        assert pages[0]['fromSequence'] == 0
+        assert pages[-1]['toSequence'] == segments[-1].sequence
+        # Consecutive pages share at most the speech running over the break
+        for previous, page in zip(pages, pages[1:]):
+            assert page['fromSequence'] in (previous['toSequence'], previous['toSequence'] + 1)
+
+
+def test_toc_bytes_round_trip(debate):
+    toc = table_of_contents(debate, segment_transcript(debate, 'd'))
+    assert json.loads(zlib.decompress(toc_bytes(toc))) == toc